@@ -0,0 +1,203 @@
+"""Record/replay snapshot archives for offline, deterministic runs.
+
+An archive is a deflate-compressed zip holding:
+
+- ``manifest.json`` - format name, version, creation time and contents
+- ``responses/<n>`` - raw API response bodies, keyed by request path in the
+  manifest, served back by :class:`ReplayTransport`
+- ``repeaters/<band>.json`` - already-validated Repeater rows, loaded directly
+  on replay when the recorded field layout matches the current model
+- ``radioid/user.csv`` - the contact list, if it was downloaded
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import shutil
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+from .extract import forget_download
+from .models import REPEATER_FIELDS, Repeater
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMAT = "codeplug-csv-archive"
+ARCHIVE_VERSION = 1
+
+_MANIFEST = "manifest.json"
+_CONTACTS = "radioid/user.csv"
+
+
+def _request_key(url: httpx.URL) -> str:
+    """Host-independent key for a recorded request."""
+    return url.raw_path.decode("ascii")
+
+
+def _repeater_fields() -> list[str]:
+    return list(REPEATER_FIELDS)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Wrap a transport and keep the decoded body of every successful GET."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, skip=None):
+        self._transport = transport
+        self._skip = skip
+        self.responses: dict[str, bytes] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._transport.handle_async_request(request)
+        if (
+            request.method != "GET"
+            or response.status_code != 200
+            or (self._skip and self._skip(request))
+        ):
+            return response
+        try:
+            raw = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+        replayed = httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            content=raw,
+            request=request,
+            extensions=response.extensions,
+        )
+        # Store the decoded body so replay does not depend on content-encoding
+        self.responses[_request_key(request.url)] = httpx.Response(
+            200, headers=response.headers, content=raw
+        ).content
+        return replayed
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Serve recorded bodies; any other request fails without touching the network."""
+
+    def __init__(self, responses: dict[str, bytes]):
+        self.responses = responses
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = self.responses.get(_request_key(request.url))
+        if body is None:
+            raise httpx.ConnectError(
+                f"{request.url} is not in the replay archive", request=request
+            )
+        return httpx.Response(200, content=body, request=request)
+
+
+def write_archive(
+    path: Path,
+    responses: dict[str, bytes],
+    repeaters: dict[str, list[Repeater]] | None = None,
+    contacts: Path | None = None,
+) -> Path:
+    """Write a snapshot archive to *path* and return it."""
+    repeaters = repeaters or {}
+    manifest = {
+        "format": ARCHIVE_FORMAT,
+        "version": ARCHIVE_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "responses": {},
+        "repeater_fields": _repeater_fields(),
+        "bands": sorted(repeaters),
+        "contacts": contacts is not None,
+    }
+    tmp = path.with_name(path.name + ".tmp")
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for i, (key, body) in enumerate(sorted(responses.items())):
+            member = f"responses/{i}"
+            manifest["responses"][key] = member
+            zf.writestr(member, body)
+        for band, rows in repeaters.items():
+            zf.writestr(
+                f"repeaters/{band}.json",
+                json.dumps([r.to_row() for r in rows], separators=(",", ":")),
+            )
+        if contacts is not None:
+            zf.write(contacts, _CONTACTS)
+        zf.writestr(_MANIFEST, json.dumps(manifest, indent=2))
+    tmp.replace(path)
+    logger.info(
+        "Recorded %d responses and %d bands to %s", len(responses), len(repeaters), path
+    )
+    return path
+
+
+class SnapshotArchive:
+    """Read access to an archive written by :func:`write_archive`."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path)
+        try:
+            self.manifest = json.loads(self._zip.read(_MANIFEST))
+        except KeyError:
+            self._zip.close()
+            raise ValueError(f"{path} is not a codeplug-csv archive") from None
+        if self.manifest.get("format") != ARCHIVE_FORMAT:
+            self._zip.close()
+            raise ValueError(f"{path} is not a codeplug-csv archive")
+        version = self.manifest.get("version")
+        if version != ARCHIVE_VERSION:
+            self._zip.close()
+            raise ValueError(
+                f"Unsupported archive version {version} (expected {ARCHIVE_VERSION})"
+            )
+
+    def __enter__(self) -> SnapshotArchive:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def transport(self) -> ReplayTransport:
+        """A transport that answers from the recorded responses."""
+        responses = {
+            key: self._zip.read(member)
+            for key, member in self.manifest["responses"].items()
+        }
+        return ReplayTransport(responses)
+
+    def load_repeaters(self, band: str) -> list[Repeater] | None:
+        """Recorded repeaters for *band*, or None if the fast path is unavailable.
+
+        Rows were validated when recorded, so they are passed straight to the
+        dataclass as long as the field layout has not changed since.
+        """
+        if band not in self.manifest.get("bands", []):
+            return None
+        if self.manifest.get("repeater_fields") != _repeater_fields():
+            return None
+        rows = json.loads(self._zip.read(f"repeaters/{band}.json"))
+        return [Repeater(**row) for row in rows]
+
+    @property
+    def has_contacts(self) -> bool:
+        return bool(self.manifest.get("contacts"))
+
+    def extract_contacts(self, dest: Path) -> Path:
+        """Copy the recorded user.csv to *dest*.
+
+        Any RadioID download state for *dest* is dropped first, so a later
+        live run downloads the current list instead of resuming into, or
+        getting a 304 for, the archived one.
+        """
+        # Not the downloader's .part file, which it may resume from
+        tmp = dest.with_name(f".{dest.name}.replay")
+        with self._zip.open(_CONTACTS) as src, open(tmp, "wb") as out:
+            shutil.copyfileobj(src, out, 1024 * 1024)
+        forget_download(dest)
+        tmp.replace(dest)
+        return dest
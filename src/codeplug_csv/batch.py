@@ -0,0 +1,231 @@
+"""Build codeplugs for several profiles from one fetch and transform.
+
+A profile is a set of the single-run filters (bands, locator, power) and an
+output directory. The repeaters are fetched and transformed once per power
+level for every band any profile wants; each profile's channels are then
+sliced out of the shared list by locator, so adding a profile costs only its
+zoning and CSV writes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+
+from .config import BANDS, BATCH_WORKERS, POWER_LEVELS
+from .load import _spawn_pool, write_channels, write_talkgroups, write_zones
+from .models import AnytoneChannel, Repeater, TalkGroup
+from .simplex import get_static_zones
+from .transform import _channel_count, filter_repeaters, transform_repeaters
+from .zones import assign_zones
+
+logger = logging.getLogger(__name__)
+
+_PROFILE_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+
+@dataclass(frozen=True, slots=True)
+class Profile:
+    """One codeplug to build: the filters of a single run and where to write it.
+
+    *output_dir* is relative to the batch output directory; it defaults to
+    the profile name.
+    """
+
+    name: str
+    bands: tuple[str, ...] = BANDS
+    locator: str | None = None
+    power: str = "High"
+    output_dir: str | None = None
+
+
+def _profile(raw: object, index: int) -> Profile:
+    """Validate one entry of a profiles file."""
+    where = f"profile {index + 1}"
+    if not isinstance(raw, dict):
+        raise ValueError(f"{where} is not an object")
+    unknown = set(raw) - {"name", "bands", "locator", "power", "output_dir"}
+    if unknown:
+        raise ValueError(f"{where} has unknown keys: {', '.join(sorted(unknown))}")
+    name = raw.get("name")
+    if not isinstance(name, str) or not _PROFILE_NAME.fullmatch(name):
+        raise ValueError(f"{where} needs a name of letters, digits, '.', '_' or '-'")
+    bands = raw.get("bands", list(BANDS))
+    if isinstance(bands, str):
+        bands = [bands]
+    if (
+        not isinstance(bands, list)
+        or not bands
+        or any(b not in BANDS for b in bands)
+        or len(set(bands)) != len(bands)
+    ):
+        raise ValueError(f"profile {name!r}: bands must be some of {', '.join(BANDS)}")
+    locator = raw.get("locator")
+    if locator is not None and (not isinstance(locator, str) or not locator.isalnum()):
+        raise ValueError(f"profile {name!r}: locator must be a grid square prefix")
+    power = raw.get("power", "High")
+    if power not in POWER_LEVELS:
+        raise ValueError(
+            f"profile {name!r}: power must be one of {', '.join(POWER_LEVELS)}"
+        )
+    output_dir = raw.get("output_dir")
+    if output_dir is not None and (
+        not isinstance(output_dir, str)
+        or not output_dir
+        or Path(output_dir).is_absolute()
+        or ".." in Path(output_dir).parts
+    ):
+        raise ValueError(f"profile {name!r}: output_dir must be a relative path")
+    return Profile(name, tuple(bands), locator or None, power, output_dir)
+
+
+def load_profiles(path: Path) -> list[Profile]:
+    """The profiles in the JSON file at *path*.
+
+    The file holds a list of objects with a ``name`` and optional ``bands``,
+    ``locator``, ``power`` and ``output_dir``. Raises ValueError if it is
+    malformed, or if two profiles share a name or output directory.
+    """
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    if not isinstance(raw, list) or not raw:
+        raise ValueError(f"{path} must hold a non-empty list of profiles")
+    profiles = [_profile(item, i) for i, item in enumerate(raw)]
+    names: set[str] = set()
+    targets: set[str] = set()
+    for profile in profiles:
+        target = Path(profile.output_dir or profile.name).as_posix()
+        if profile.name in names:
+            raise ValueError(f"more than one profile is named {profile.name!r}")
+        if target in targets:
+            raise ValueError(f"more than one profile writes to {target!r}")
+        names.add(profile.name)
+        targets.add(target)
+    return profiles
+
+
+class SharedChannels:
+    """Filtered repeaters and their channels, shared by every profile.
+
+    Each band is filtered once without a locator. Its channels are made
+    once per power level on first use, with the offset of each repeater's
+    channels, so a profile's locator picks out whole repeaters by slicing.
+    """
+
+    def __init__(
+        self,
+        by_band: Mapping[str, Sequence[Repeater]],
+        transform: Callable[..., list[AnytoneChannel]] = transform_repeaters,
+    ) -> None:
+        self._transform = transform
+        self._repeaters = {band: filter_repeaters(rs) for band, rs in by_band.items()}
+        self._locators = {
+            band: [r.locator.upper() for r in rs]
+            for band, rs in self._repeaters.items()
+        }
+        self._offsets = {
+            band: [0, *accumulate(map(_channel_count, rs))]
+            for band, rs in self._repeaters.items()
+        }
+        self._channels: dict[tuple[str, str], list[AnytoneChannel]] = {}
+        self.transforms = 0
+
+    def _band(self, band: str, power: str) -> list[AnytoneChannel]:
+        channels = self._channels.get((band, power))
+        if channels is None:
+            channels = self._transform(self._repeaters[band], power)
+            self._channels[band, power] = channels
+            self.transforms += 1
+        return channels
+
+    def channels(self, profile: Profile) -> list[AnytoneChannel]:
+        """The channels a single run with *profile*'s filters would make."""
+        result: list[AnytoneChannel] = []
+        for band in profile.bands:
+            channels = self._band(band, profile.power)
+            if not profile.locator:
+                result.extend(channels)
+                continue
+            prefix = profile.locator.upper()
+            offsets = self._offsets[band]
+            for i, locator in enumerate(self._locators[band]):
+                if locator.startswith(prefix):
+                    result.extend(channels[offsets[i] : offsets[i + 1]])
+        return result
+
+
+async def write_profile(
+    channels: list[AnytoneChannel], talkgroups: list[TalkGroup], output_dir: Path
+) -> tuple[int, int]:
+    """Zone *channels* and write the codeplug CSVs; returns channel and zone counts."""
+    zones = get_static_zones() + assign_zones(channels)
+    all_channels = [ch for zone in zones for ch in zone.channels]
+    output_dir.mkdir(parents=True, exist_ok=True)
+    await write_channels(all_channels, output_dir)
+    await write_zones(zones, output_dir)
+    await write_talkgroups(talkgroups, output_dir)
+    return len(all_channels), len(zones)
+
+
+def _write_profile_sync(
+    channels: list[AnytoneChannel], talkgroups: list[TalkGroup], output_dir: Path
+) -> tuple[int, int]:
+    """write_profile for a worker process."""
+    return asyncio.run(write_profile(channels, talkgroups, output_dir))
+
+
+async def write_profiles(
+    shared: SharedChannels,
+    profiles: Sequence[Profile],
+    talkgroups: list[TalkGroup],
+    output_dir: Path,
+    workers: int = BATCH_WORKERS,
+) -> dict[str, tuple[int, int] | None]:
+    """Write every profile under *output_dir*.
+
+    Returns each profile's channel and zone counts, or None for a profile no
+    repeater matched (nothing is written for it). With *workers* > 1 the
+    profiles are zoned and written in a process pool.
+    """
+    results: dict[str, tuple[int, int] | None] = {}
+    jobs = []
+    for profile in profiles:
+        channels = await asyncio.to_thread(shared.channels, profile)
+        if not channels:
+            logger.warning(
+                "No repeaters matched profile %s (bands=%s, locator=%s)",
+                profile.name,
+                list(profile.bands),
+                profile.locator,
+            )
+            results[profile.name] = None
+            continue
+        target = output_dir / (profile.output_dir or profile.name)
+        jobs.append((profile, channels, target))
+
+    if workers > 1 and len(jobs) > 1:
+        loop = asyncio.get_running_loop()
+        with _spawn_pool(min(workers, len(jobs))) as pool:
+            counts = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        pool, _write_profile_sync, channels, talkgroups, target
+                    )
+                    for _, channels, target in jobs
+                )
+            )
+    else:
+        counts = [
+            await write_profile(channels, talkgroups, target)
+            for _, channels, target in jobs
+        ]
+    for (profile, _, _), count in zip(jobs, counts):
+        results[profile.name] = count
+    # Report in profile order, whichever finished first
+    return {p.name: results[p.name] for p in profiles}
@@ -0,0 +1,170 @@
+"""On-disk HTTP response cache for conditional requests and API outages."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+
+from .config import BREAKER_COOLDOWN, BREAKER_THRESHOLD, CACHE_MAX_AGE
+
+logger = logging.getLogger(__name__)
+
+
+def _write_json_atomic(path: Path, obj: object, **kwargs) -> None:
+    """Write *obj* to *path* as JSON through a temporary file, then rename it.
+
+    The temporary file has a unique name in the same directory, so processes
+    sharing the directory never write to or rename each other's.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(obj, f, **kwargs)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+@dataclass
+class CacheEntry:
+    """Validators and parsed records stored for a single URL."""
+
+    url: str
+    etag: str | None = None
+    last_modified: str | None = None
+    data: list[dict] = field(default_factory=list)
+    fetched_at: float = field(default_factory=time.time)
+
+    def age(self) -> float:
+        """Seconds since the data was last confirmed by the server."""
+        return max(0.0, time.time() - self.fetched_at)
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Return If-None-Match / If-Modified-Since headers for revalidation."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Directory of JSON cache entries, one file per URL.
+
+    Entries younger than *max_age* seconds are served without contacting the
+    server. The directory also holds the :class:`CircuitBreaker` state.
+    """
+
+    def __init__(self, directory: Path, max_age: float = CACHE_MAX_AGE):
+        self.directory = Path(directory)
+        self.max_age = max_age
+        self.breaker = CircuitBreaker(self.directory / "circuit.json")
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return self.directory / f"{digest}.json"
+
+    def get(self, url: str) -> CacheEntry | None:
+        """Return the cached entry for *url*, or None if absent or unreadable."""
+        path = self._path(url)
+        try:
+            with open(path, encoding="utf-8") as f:
+                raw = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable cache entry %s: %s", path, e)
+            return None
+        if raw.get("url") != url:
+            return None
+        return CacheEntry(
+            url=url,
+            etag=raw.get("etag"),
+            last_modified=raw.get("last_modified"),
+            data=raw.get("data", []),
+            # Entries written before freshness was tracked count as stale
+            fetched_at=raw.get("fetched_at", 0.0),
+        )
+
+    def put(self, entry: CacheEntry) -> None:
+        """Atomically write *entry* to disk."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "url": entry.url,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "data": entry.data,
+            "fetched_at": entry.fetched_at,
+        }
+        _write_json_atomic(self._path(entry.url), payload, separators=(",", ":"))
+        logger.debug("Cached %d records for %s", len(entry.data), entry.url)
+
+    def touch(self, entry: CacheEntry) -> None:
+        """Record that the server has just confirmed *entry* is current."""
+        self.put(replace(entry, fetched_at=time.time()))
+
+
+class CircuitBreaker:
+    """Per-host failure counter persisted across runs.
+
+    After *threshold* consecutive failures the circuit opens and
+    :meth:`allow` refuses requests to that host for *cooldown* seconds, so
+    callers fall back to cached data instead of waiting on a dead API. Once
+    the cooldown has passed a single trial request is let through.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        threshold: int = BREAKER_THRESHOLD,
+        cooldown: float = BREAKER_COOLDOWN,
+    ):
+        self.path = Path(path)
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable circuit state %s: %s", self.path, e)
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _save(self, state: dict[str, dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        _write_json_atomic(self.path, state)
+
+    def allow(self, host: str) -> bool:
+        """Return False while the circuit for *host* is open."""
+        record = self._load().get(host)
+        if not record or record.get("failures", 0) < self.threshold:
+            return True
+        return time.time() - record.get("opened_at", 0.0) >= self.cooldown
+
+    def record_failure(self, host: str) -> None:
+        state = self._load()
+        record = state.setdefault(host, {"failures": 0})
+        record["failures"] = record.get("failures", 0) + 1
+        if record["failures"] >= self.threshold:
+            if record["failures"] == self.threshold:
+                logger.warning("Circuit opened for %s after repeated failures", host)
+            record["opened_at"] = time.time()
+        self._save(state)
+
+    def record_success(self, host: str) -> None:
+        state = self._load()
+        if state.pop(host, None) is not None:
+            logger.info("Circuit closed for %s", host)
+            self._save(state)
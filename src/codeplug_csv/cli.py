@@ -5,18 +5,64 @@ from __future__ import annotations
 import argparse
 import asyncio
 import logging
+import sqlite3
 import sys
+import zipfile
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from functools import partial
+from itertools import chain
+from typing import TypeVar
 from pathlib import Path
 
-from .config import BANDS
+import httpx
+
+from .archive import RecordingTransport, SnapshotArchive, write_archive
+from .batch import SharedChannels, load_profiles, write_profiles
+from .cache import ResponseCache
+from .contacts import ContactFilter, ContactIndex, update_contact_index
+from .config import (
+    BANDS,
+    BATCH_WORKERS,
+    CACHE_DIR,
+    CONTACT_CALLSIGN_PREFIXES,
+    CONTACT_COUNTRIES,
+    CONTACT_ID_PREFIXES,
+    CONTACT_WORKERS,
+    CONTACTS_DELTA,
+    DEDUP_CONTACTS,
+    DETAIL_CACHE_TTL,
+    ENRICH,
+    POWER_LEVELS,
+    RADIOID_CSV_URL,
+    STALE_WHILE_REVALIDATE,
+    STREAM_PIPELINE,
+)
 from .extract import BrandMeisterClient, RadioIDClient, RSGBClient
-from .load import write_channels, write_talkgroups, write_zones
+from .load import (
+    stream_codeplug,
+    write_channels,
+    write_digital_contacts,
+    write_talkgroups,
+    write_zones,
+)
+from .models import AnytoneChannel, Repeater, RepeaterDetail
+from .report import RunReport
+from .session import create_session, create_transport
 from .simplex import get_static_zones
-from .transform import filter_repeaters, transform_repeaters
+from .fast import transform_repeaters
+from .transform import (
+    filter_repeaters,
+    iter_channels,
+    iter_filtered,
+    iter_linked,
+    link_contacts,
+)
 from .zones import assign_zones
 
 logger = logging.getLogger("codeplug_csv")
 
+T = TypeVar("T")
+
 
 def _configure_logging(verbose: bool, quiet: bool) -> None:
     if verbose:
@@ -61,7 +107,7 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser.add_argument(
         "--power",
         type=str,
-        choices=["Turbo", "High", "Mid", "Low"],
+        choices=list(POWER_LEVELS),
         default="High",
         help="Transmit power level (default: High)",
     )
@@ -70,6 +116,92 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="Skip downloading the RadioID digital contact list",
     )
+    parser.add_argument(
+        "--parallel-download",
+        action="store_true",
+        help="Fetch the RadioID contact list as concurrent byte ranges",
+    )
+    parser.add_argument(
+        "--contacts-country",
+        nargs="+",
+        default=list(CONTACT_COUNTRIES),
+        metavar="COUNTRY",
+        help='Keep only contacts from these countries (e.g. "United Kingdom")',
+    )
+    parser.add_argument(
+        "--contacts-id-prefix",
+        nargs="+",
+        default=list(CONTACT_ID_PREFIXES),
+        metavar="PREFIX",
+        help="Also keep contacts whose radio ID starts with one of these",
+    )
+    parser.add_argument(
+        "--contacts-callsign-prefix",
+        nargs="+",
+        default=list(CONTACT_CALLSIGN_PREFIXES),
+        metavar="PREFIX",
+        help="Also keep contacts whose callsign starts with one of these",
+    )
+    parser.add_argument(
+        "--dedup-contacts",
+        action="store_true",
+        default=DEDUP_CONTACTS,
+        help="Keep only the first contact for each radio ID",
+    )
+    parser.add_argument(
+        "--contact-workers",
+        type=int,
+        default=CONTACT_WORKERS,
+        metavar="N",
+        help="Convert the contact list in N worker processes (default: in-process)",
+    )
+    parser.add_argument(
+        "--contacts-delta",
+        action="store_true",
+        default=CONTACTS_DELTA,
+        help="Write contacts-delta.csv listing contacts added, changed or deleted "
+        "since the last run",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=Path(CACHE_DIR) if CACHE_DIR else None,
+        help="Cache API responses here and revalidate with ETag/Last-Modified",
+    )
+    parser.add_argument(
+        "--stale-while-revalidate",
+        action="store_true",
+        default=STALE_WHILE_REVALIDATE,
+        help="Write outputs from the cache at once, then rewrite them only if "
+        "the APIs return different data (needs --cache-dir)",
+    )
+    parser.add_argument(
+        "--enrich",
+        action="store_true",
+        default=ENRICH,
+        help="Fetch per-repeater detail and use each DMR timeslot's static "
+        "talkgroup as its channel contact",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        default=STREAM_PIPELINE,
+        help="Filter, transform and zone repeaters one at a time while writing "
+        "Channel.CSV and Zone.CSV, keeping memory flat for large inputs",
+    )
+    snapshot = parser.add_mutually_exclusive_group()
+    snapshot.add_argument(
+        "--record",
+        type=Path,
+        metavar="ARCHIVE",
+        help="Save the API responses (and user.csv) to a snapshot archive",
+    )
+    snapshot.add_argument(
+        "--replay",
+        type=Path,
+        metavar="ARCHIVE",
+        help="Build from a snapshot archive without any network access",
+    )
     verbosity = parser.add_mutually_exclusive_group()
     verbosity.add_argument(
         "-v",
@@ -83,98 +215,705 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="Suppress all output except warnings and errors",
     )
-    return parser.parse_args(argv)
+    args = parser.parse_args(argv)
+    if args.parallel_download and _contact_filter(args):
+        parser.error(
+            "--parallel-download cannot be combined with a contact filter; "
+            "filtered downloads are streamed and filtered in one pass"
+        )
+    return args
+
+
+async def _iter_repeaters(
+    bands: list[str],
+    client: RSGBClient,
+    archive: SnapshotArchive | None = None,
+) -> AsyncIterator[tuple[str, list[Repeater]]]:
+    """Yield ``(band, repeaters)`` as each band becomes available.
+
+    Bands the *archive* holds pre-validated come first; the rest are fetched
+    concurrently by *client* and yielded in completion order.
+    """
+    missing = []
+    for band in bands:
+        rows = archive.load_repeaters(band) if archive else None
+        if rows is None:
+            missing.append(band)
+        else:
+            yield band, rows
+    if missing:
+        async for band, repeaters in client.iter_bands(missing):
+            yield band, repeaters
+
+
+async def _band_channels(
+    args: argparse.Namespace,
+    report: RunReport,
+    client: RSGBClient,
+    band: str,
+    repeaters: list[Repeater],
+) -> list[AnytoneChannel]:
+    """Filter, optionally enrich, and transform one band's repeaters."""
+    # CPU-bound steps run in a worker thread so the event loop keeps reading
+    filtered = await asyncio.to_thread(filter_repeaters, repeaters, args.locator)
+    details = None
+    if args.enrich:
+        details = await report.timed(f"enrich {band}", client.fetch_details(filtered))
+    return await report.timed(
+        f"transform {band}",
+        asyncio.to_thread(transform_repeaters, filtered, args.power, details),
+    )
+
 
+async def _band_source(
+    args: argparse.Namespace,
+    report: RunReport,
+    client: RSGBClient,
+    band: str,
+    repeaters: list[Repeater],
+) -> tuple[list[Repeater], dict[str, RepeaterDetail] | None]:
+    """One band's repeaters and details, left for --stream to transform lazily."""
+    details = None
+    if args.enrich:
+        filtered = await asyncio.to_thread(filter_repeaters, repeaters, args.locator)
+        details = await report.timed(f"enrich {band}", client.fetch_details(filtered))
+    return repeaters, details
 
-async def _fetch_repeaters(bands: list[str]) -> list:
-    async with RSGBClient() as client:
-        return await client.fetch_bands(bands)
 
+async def _fetch_bands(
+    args: argparse.Namespace,
+    report: RunReport,
+    cache_dir: Path | None,
+    session: httpx.AsyncClient,
+    archive: SnapshotArchive | None,
+    recorded: dict[str, list[Repeater]] | None,
+    offline: bool,
+    build: Callable[[RSGBClient, str, list[Repeater]], Awaitable[T]],
+) -> dict[str, T]:
+    """Fetch repeaters and *build* each band while others are in flight.
 
-async def _fetch_talkgroups() -> list:
-    async with BrandMeisterClient() as client:
+    With *offline* everything is read from the cache. The observed RSGB
+    concurrency limits are added to *report*.
+    """
+    built: dict[str, T] = {}
+    client = RSGBClient(
+        cache=ResponseCache(cache_dir) if cache_dir else None,
+        detail_cache=(
+            ResponseCache(cache_dir / "detail", max_age=DETAIL_CACHE_TTL)
+            if cache_dir
+            else None
+        ),
+        session=session,
+        offline=offline,
+    )
+
+    async def process(band: str, repeaters: list[Repeater]) -> None:
+        built[band] = await build(client, band, repeaters)
+
+    tasks: list[asyncio.Task] = []
+    async with client:
+        try:
+            async for band, repeaters in _iter_repeaters(args.bands, client, archive):
+                if recorded is not None:
+                    recorded[band] = repeaters
+                tasks.append(asyncio.create_task(process(band, repeaters)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if not offline:
+                report.limits["RSGB"] = client.limiter.stats()
+    return built
+
+
+async def _fetch_channels(
+    args: argparse.Namespace,
+    report: RunReport,
+    cache_dir: Path | None,
+    session: httpx.AsyncClient,
+    archive: SnapshotArchive | None,
+    recorded: dict[str, list[Repeater]] | None,
+    offline: bool = False,
+) -> dict[str, list[AnytoneChannel]]:
+    """Each band's channels, transformed as soon as the band arrives."""
+    return await _fetch_bands(
+        args,
+        report,
+        cache_dir,
+        session,
+        archive,
+        recorded,
+        offline,
+        partial(_band_channels, args, report),
+    )
+
+
+async def _fetch_stream_sources(
+    args: argparse.Namespace,
+    report: RunReport,
+    cache_dir: Path | None,
+    session: httpx.AsyncClient,
+    archive: SnapshotArchive | None,
+    recorded: dict[str, list[Repeater]] | None,
+    offline: bool = False,
+) -> dict[str, tuple[list[Repeater], dict[str, RepeaterDetail] | None]]:
+    """Each band's repeaters and details, for --stream to transform lazily."""
+    return await _fetch_bands(
+        args,
+        report,
+        cache_dir,
+        session,
+        archive,
+        recorded,
+        offline,
+        partial(_band_source, args, report),
+    )
+
+
+async def _fetch_talkgroups(
+    session: httpx.AsyncClient | None = None,
+    cache_dir: Path | None = None,
+    offline: bool = False,
+) -> list:
+    cache = ResponseCache(cache_dir) if cache_dir else None
+    async with BrandMeisterClient(session=session, cache=cache, offline=offline) as client:
         return await client.fetch_talkgroups()
 
 
-async def _download_contacts(dest: Path) -> None:
-    async with RadioIDClient() as radioid:
-        await radioid.download(dest)
+def _contact_filter(args: argparse.Namespace) -> ContactFilter:
+    return ContactFilter(
+        countries=tuple(args.contacts_country),
+        id_prefixes=tuple(args.contacts_id_prefix),
+        callsign_prefixes=tuple(args.contacts_callsign_prefix),
+    )
 
 
-async def _run(args: argparse.Namespace) -> None:
-    args.output_dir.mkdir(parents=True, exist_ok=True)
+async def _download_contacts(
+    dest: Path,
+    parallel: bool = False,
+    session: httpx.AsyncClient | None = None,
+    contact_filter: ContactFilter | None = None,
+) -> None:
+    async with RadioIDClient(session=session) as radioid:
+        if contact_filter:
+            await radioid.download_filtered(dest, contact_filter)
+        elif parallel:
+            await radioid.download_parallel(dest)
+        else:
+            await radioid.download(dest)
 
-    # Fetch data concurrently
-    tasks = [
-        asyncio.create_task(_fetch_repeaters(args.bands)),
-        asyncio.create_task(_fetch_talkgroups()),
-    ]
 
-    radioid_task = None
-    if not args.no_contacts:
-        radioid_task = asyncio.create_task(
-            _download_contacts(args.output_dir / "user.csv")
+async def _gather_sources(
+    args: argparse.Namespace,
+    report: RunReport,
+    session: httpx.AsyncClient,
+    cache_dir: Path | None,
+    archive: SnapshotArchive | None = None,
+    recorded: dict[str, list[Repeater]] | None = None,
+    offline: bool = False,
+) -> list:
+    """Channels by band and talkgroups, either of which may be an exception.
+
+    With ``--stream`` each band maps to its repeaters and details instead.
+    """
+    prefix = "cached " if offline else ""
+    if args.stream:
+        by_band = _fetch_stream_sources(
+            args, report, cache_dir, session, archive, recorded, offline
+        )
+    else:
+        by_band = _fetch_channels(
+            args, report, cache_dir, session, archive, recorded, offline
         )
+    return await asyncio.gather(
+        report.timed(f"{prefix}fetch and transform", by_band),
+        report.timed(
+            f"{prefix}fetch talkgroups",
+            _fetch_talkgroups(session, cache_dir, offline),
+        ),
+        return_exceptions=True,
+    )
+
+
+async def _build_codeplug(
+    args: argparse.Namespace,
+    report: RunReport,
+    session: httpx.AsyncClient,
+    archive: SnapshotArchive | None = None,
+    recorded: dict[str, list[Repeater]] | None = None,
+) -> bool:
+    """Fetch, transform and write Channel/Zone/TalkGroups CSVs.
 
-    # Await the mandatory fetches
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    Fetched repeaters are added to *recorded* when given. Returns False when
+    no repeaters matched the filters.
+
+    With ``--stale-while-revalidate`` the outputs are first written from the
+    cache while the APIs are queried in the background, and only rewritten
+    if the fresh data differs.
+    """
+    # Revalidation responses carry no body, so bypass the cache when recording
+    cache_dir = None if args.record or args.replay else args.cache_dir
+    fresh = asyncio.create_task(
+        _gather_sources(args, report, session, cache_dir, archive, recorded)
+    )
+    stale = None
+    try:
+        if args.stale_while_revalidate and cache_dir:
+            cached = await _gather_sources(
+                args, report, session, cache_dir, offline=True
+            )
+            if any(isinstance(r, Exception) for r in cached):
+                logger.info("Cache does not cover every source yet, waiting for the APIs")
+            else:
+                stale = cached
+                stale_matched = await _write_codeplug(
+                    args, report, *stale, milestone="cached codeplug written"
+                )
+        results = await fresh
+    except BaseException:
+        fresh.cancel()
+        await asyncio.gather(fresh, return_exceptions=True)
+        raise
 
     # Handle RSGB results
-    repeaters = results[0]
-    if isinstance(repeaters, Exception):
-        logger.exception("Failed to fetch repeater data")
+    by_band = results[0]
+    if isinstance(by_band, Exception):
+        logger.error("Failed to fetch repeater data", exc_info=by_band)
         sys.exit(1)
 
     # Handle BrandMeister results
     talkgroups = results[1]
     if isinstance(talkgroups, Exception):
-        logger.exception("Failed to fetch talkgroup data")
+        logger.error("Failed to fetch talkgroup data", exc_info=talkgroups)
         sys.exit(1)
 
-    # Handle RadioID results (optional)
-    if radioid_task:
-        try:
-            await radioid_task
-        except Exception:
-            logger.warning("Failed to download RadioID contacts", exc_info=True)
-            print(
-                "Warning: RadioID contact list download failed (continuing without it)"
-            )
+    if stale is not None and [by_band, talkgroups] == stale:
+        logger.info("Revalidated data matches the cache, outputs are current")
+        return stale_matched
+    if stale is not None:
+        logger.info("Upstream data changed, rewriting outputs")
+    return await _write_codeplug(args, report, by_band, talkgroups)
 
-    filtered = filter_repeaters(repeaters, locator_prefix=args.locator)
 
-    if not filtered:
-        logger.warning(
-            "No repeaters matched filters (bands=%s, locator=%s)",
-            args.bands,
-            args.locator,
-        )
-        print("No repeaters matched the filters.")
-        sys.exit(0)
+def _open_contact_index(path: Path) -> ContactIndex | None:
+    if not path.exists():
+        return None
+    try:
+        return ContactIndex(path)
+    except (OSError, ValueError) as e:
+        logger.warning("Cannot index %s: %s", path, e)
+        return None
 
-    channels = transform_repeaters(filtered, power=args.power)
-    repeater_zones = assign_zones(channels)
-    static_zones = get_static_zones()
-    all_zones = static_zones + repeater_zones
 
-    # Derive channel list from zone order so channel numbers align with zones
-    all_channels = [ch for zone in all_zones for ch in zone.channels]
+def _no_channels(args: argparse.Namespace) -> bool:
+    logger.warning(
+        "No repeaters matched filters (bands=%s, locator=%s)",
+        args.bands,
+        args.locator,
+    )
+    print("No repeaters matched the filters.")
+    return False
 
-    await write_channels(all_channels, args.output_dir)
-    await write_zones(all_zones, args.output_dir)
-    await write_talkgroups(talkgroups, args.output_dir)
 
-    print(f"Generated {len(all_channels)} channels in {len(all_zones)} zones")
+def _summary(args: argparse.Namespace, channels: int, zones: int) -> None:
+    print(f"Generated {channels} channels in {zones} zones")
     print(f"Output: {args.output_dir.resolve()}")
     logger.info(
         "Generated %d channels in %d zones (output=%s)",
-        len(all_channels),
-        len(all_zones),
+        channels,
+        zones,
         args.output_dir.resolve(),
     )
 
 
+async def _stream_codeplug(
+    args: argparse.Namespace,
+    report: RunReport,
+    by_band: dict[str, tuple[list[Repeater], dict[str, RepeaterDetail] | None]],
+    talkgroups: list,
+    milestone: str,
+) -> bool:
+    """_write_codeplug for --stream: no channel list is ever built.
+
+    Repeaters are filtered, transformed and linked one at a time inside
+    stream_codeplug, which writes each channel's row as it arrives.
+    """
+
+    def channels() -> Iterator[AnytoneChannel]:
+        for band in args.bands:
+            repeaters, details = by_band[band]
+            yield from iter_channels(
+                iter_filtered(repeaters, args.locator), args.power, details
+            )
+
+    contacts = None
+    if args.enrich and not args.no_contacts:
+        contacts = await asyncio.to_thread(
+            _open_contact_index, args.output_dir / "user.csv"
+        )
+    extra: list = []
+    try:
+        linked = iter_linked(channels(), talkgroups, extra, contacts)
+        first = await asyncio.to_thread(next, linked, None)
+        if first is None:
+            return _no_channels(args)
+        with report.stage("zones and write"):
+            count, zone_count = await asyncio.to_thread(
+                stream_codeplug,
+                chain([first], linked),
+                get_static_zones(),
+                args.output_dir,
+            )
+            await write_talkgroups(talkgroups + extra, args.output_dir)
+    finally:
+        if contacts is not None:
+            contacts.close()
+    report.mark(milestone)
+    _summary(args, count, zone_count)
+    return True
+
+
+async def _write_codeplug(
+    args: argparse.Namespace,
+    report: RunReport,
+    by_band: dict[str, list[AnytoneChannel]],
+    talkgroups: list,
+    milestone: str = "codeplug written",
+) -> bool:
+    """Zone the channels and write the CSVs. Returns False if there are none."""
+    if args.stream:
+        return await _stream_codeplug(args, report, by_band, talkgroups, milestone)
+    # Merge in requested band order so output does not depend on fetch timing
+    channels = [ch for band in args.bands for ch in by_band[band]]
+    # Name private-call contacts from a user.csv already on disk (a previous
+    # run or a replay); this run's download may still be in progress
+    contacts = None
+    if args.enrich and not args.no_contacts:
+        contacts = await asyncio.to_thread(
+            _open_contact_index, args.output_dir / "user.csv"
+        )
+    try:
+        channels, talkgroups = link_contacts(channels, talkgroups, contacts)
+    finally:
+        if contacts is not None:
+            contacts.close()
+    if not channels:
+        return _no_channels(args)
+
+    with report.stage("zones"):
+        repeater_zones = assign_zones(channels)
+        static_zones = get_static_zones()
+        all_zones = static_zones + repeater_zones
+
+        # Derive channel list from zone order so channel numbers align with zones
+        all_channels = [ch for zone in all_zones for ch in zone.channels]
+
+    with report.stage("write"):
+        await write_channels(all_channels, args.output_dir)
+        await write_zones(all_zones, args.output_dir)
+        await write_talkgroups(talkgroups, args.output_dir)
+    report.mark(milestone)
+    _summary(args, len(all_channels), len(all_zones))
+    return True
+
+
+async def _run(args: argparse.Namespace) -> None:
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    report = RunReport()
+    contacts_dest = args.output_dir / "user.csv"
+
+    archive = None
+    recorder = None
+    recorded: dict[str, list[Repeater]] | None = None
+    if args.replay:
+        try:
+            archive = SnapshotArchive(args.replay)
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            logger.error("Cannot open replay archive %s: %s", args.replay, e)
+            sys.exit(1)
+        transport: httpx.AsyncBaseTransport = archive.transport()
+    elif args.record:
+        radioid_url = httpx.URL(RADIOID_CSV_URL)
+        recorder = RecordingTransport(
+            create_transport(), skip=lambda request: request.url == radioid_url
+        )
+        transport = recorder
+        recorded = {}
+    else:
+        transport = None
+
+    # One pooled session serves all three APIs
+    async with create_session(transport=transport) as session:
+        # The contact list is the largest transfer and nothing else depends on
+        # it, so it streams in the background while the codeplug is built.
+        radioid_task = None
+        contacts_ok = False
+        if args.no_contacts:
+            pass
+        elif archive:
+            if archive.has_contacts:
+                with report.stage("extract contacts"):
+                    archive.extract_contacts(contacts_dest)
+                contacts_ok = True
+            else:
+                logger.info("Replay archive has no contact list, skipping user.csv")
+        else:
+            radioid_task = asyncio.create_task(
+                report.timed(
+                    "download contacts",
+                    _download_contacts(
+                        contacts_dest,
+                        args.parallel_download,
+                        session,
+                        _contact_filter(args),
+                    ),
+                )
+            )
+
+        try:
+            matched = await _build_codeplug(args, report, session, archive, recorded)
+        except BaseException:
+            if radioid_task:
+                radioid_task.cancel()
+                await asyncio.gather(radioid_task, return_exceptions=True)
+            raise
+        finally:
+            if archive:
+                archive.close()
+
+        # Handle RadioID results (optional)
+        if radioid_task:
+            try:
+                await radioid_task
+                contacts_ok = True
+            except Exception:
+                logger.warning("Failed to download RadioID contacts", exc_info=True)
+                print(
+                    "Warning: RadioID contact list download failed "
+                    "(continuing without it)"
+                )
+            report.mark("contacts written")
+
+    if contacts_ok and args.contacts_delta:
+        try:
+            await report.timed(
+                "contacts delta",
+                asyncio.to_thread(
+                    update_contact_index,
+                    contacts_dest,
+                    contacts_dest.with_name(f".{contacts_dest.name}.sqlite"),
+                    args.output_dir / "contacts-delta.csv",
+                ),
+            )
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.warning("Cannot compute the contact list delta: %s", e)
+
+    if contacts_ok:
+        try:
+            await report.timed(
+                "convert contacts",
+                write_digital_contacts(
+                    contacts_dest,
+                    args.output_dir,
+                    dedup=args.dedup_contacts,
+                    workers=args.contact_workers,
+                ),
+            )
+        except (OSError, ValueError) as e:
+            logger.warning(
+                "Cannot convert %s to Anytone contacts: %s", contacts_dest, e
+            )
+
+    if recorder is not None:
+        with report.stage("write archive"):
+            write_archive(
+                args.record,
+                recorder.responses,
+                recorded,
+                contacts_dest if contacts_ok else None,
+            )
+
+    report.log()
+    if not matched:
+        sys.exit(0)
+
+
+def parse_lookup_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="codeplug-csv lookup",
+        description="Look up DMR users in the downloaded RadioID contact list",
+    )
+    parser.add_argument(
+        "queries",
+        nargs="+",
+        metavar="ID_OR_CALLSIGN",
+        help="Radio IDs or callsigns to look up",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        default=Path("output"),
+        help="Directory holding user.csv (default: output/)",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Enable verbose (DEBUG) logging",
+    )
+    return parser.parse_args(argv)
+
+
+def _format_contact(row: dict[str, str]) -> str:
+    name = " ".join(
+        part for part in (row.get("FIRST_NAME", ""), row.get("LAST_NAME", "")) if part
+    )
+    place = ", ".join(
+        part for part in (row.get(col, "") for col in ("CITY", "STATE", "COUNTRY"))
+        if part
+    )
+    return f"{row['RADIO_ID']:>8}  {row['CALLSIGN']:<10} {name:<24} {place}".rstrip()
+
+
+def _lookup(args: argparse.Namespace) -> int:
+    """Print the contacts matching each query; 1 if any is not found."""
+    path = args.output_dir / "user.csv"
+    try:
+        index = ContactIndex(path)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read {path}: {e}", file=sys.stderr)
+        return 2
+    missing = 0
+    with index:
+        for query in args.queries:
+            if query.isdigit():
+                row = index.by_id(int(query))
+                rows = [row] if row else []
+            else:
+                rows = index.by_callsign(query)
+            if not rows:
+                print(f"{query}: not found", file=sys.stderr)
+                missing += 1
+            for row in rows:
+                print(_format_contact(row))
+    return 1 if missing else 0
+
+
+def parse_batch_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="codeplug-csv batch",
+        description="Generate one codeplug per profile from a single fetch",
+    )
+    parser.add_argument(
+        "profiles",
+        type=Path,
+        help="JSON list of profiles, each with a name and optional "
+        "bands, locator, power and output_dir",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        default=Path("output"),
+        help="Directory holding one subdirectory per profile (default: output/)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=BATCH_WORKERS,
+        metavar="N",
+        help="Write profiles in N worker processes (default: in-process)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=Path(CACHE_DIR) if CACHE_DIR else None,
+        help="Cache API responses here and revalidate with ETag/Last-Modified",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Enable verbose (DEBUG) logging",
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="Only log warnings and errors",
+    )
+    return parser.parse_args(argv)
+
+
+async def _batch(args: argparse.Namespace) -> int:
+    """Fetch every band once and write each profile; returns an exit code."""
+    try:
+        profiles = load_profiles(args.profiles)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read profiles from {args.profiles}: {e}", file=sys.stderr)
+        return 2
+    bands = [b for b in BANDS if any(b in p.bands for p in profiles)]
+    report = RunReport()
+    cache_dir = args.cache_dir
+
+    async with create_session() as session:
+        client = RSGBClient(
+            cache=ResponseCache(cache_dir) if cache_dir else None, session=session
+        )
+
+        async def fetch_repeaters() -> dict[str, list[Repeater]]:
+            async with client:
+                return {
+                    band: repeaters
+                    async for band, repeaters in _iter_repeaters(bands, client)
+                }
+
+        by_band, talkgroups = await asyncio.gather(
+            report.timed("fetch repeaters", fetch_repeaters()),
+            report.timed("fetch talkgroups", _fetch_talkgroups(session, cache_dir)),
+            return_exceptions=True,
+        )
+    if isinstance(by_band, Exception):
+        logger.error("Failed to fetch repeater data", exc_info=by_band)
+        return 1
+    if isinstance(talkgroups, Exception):
+        logger.error("Failed to fetch talkgroup data", exc_info=talkgroups)
+        return 1
+
+    shared = await report.timed(
+        "filter", asyncio.to_thread(SharedChannels, by_band, transform_repeaters)
+    )
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    results = await report.timed(
+        "transform and write",
+        write_profiles(shared, profiles, talkgroups, args.output_dir, args.workers),
+    )
+    logger.info(
+        "Built %d profiles from %d transforms", len(profiles), shared.transforms
+    )
+    for profile in profiles:
+        counts = results[profile.name]
+        if counts is None:
+            print(f"{profile.name}: no repeaters matched the filters")
+        else:
+            print(f"{profile.name}: {counts[0]} channels in {counts[1]} zones")
+    print(f"Output: {args.output_dir.resolve()}")
+    report.log()
+    return 0
+
+
 def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "lookup":
+        args = parse_lookup_args(argv[1:])
+        _configure_logging(args.verbose, not args.verbose)
+        sys.exit(_lookup(args))
+    if argv and argv[0] == "batch":
+        args = parse_batch_args(argv[1:])
+        _configure_logging(args.verbose, args.quiet)
+        sys.exit(asyncio.run(_batch(args)))
     args = parse_args(argv)
     _configure_logging(args.verbose, args.quiet)
     asyncio.run(_run(args))
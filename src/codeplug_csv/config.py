@@ -13,8 +13,38 @@ def _env_int(key: str, default: int) -> int:
         return default
 
 
+def _env_float(key: str, default: float) -> float:
+    raw = os.environ.get(key)
+    if not raw:
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+def _env_list(key: str) -> tuple[str, ...]:
+    raw = os.environ.get(key, "")
+    return tuple(item.strip() for item in raw.split(",") if item.strip())
+
+
+def _env_bool(key: str, default: bool) -> bool:
+    raw = os.environ.get(key)
+    if not raw:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
 API_BASE_URL = os.environ.get("CODEPLUG_CSV_API_BASE_URL", "https://api-beta.rsgb.online")
 BANDS = ("2m", "70cm")
+POWER_LEVELS = ("Turbo", "High", "Mid", "Low")
+
+# Per-repeater detail endpoint, relative to API_BASE_URL ({callsign} is substituted)
+RSGB_DETAIL_PATH = os.environ.get("CODEPLUG_CSV_RSGB_DETAIL_PATH", "/repeater/{callsign}")
+# Fetch per-repeater detail (keeper, networks, timeslot talkgroups) for filtered repeaters
+ENRICH = _env_bool("CODEPLUG_CSV_ENRICH", False)
+# Seconds a cached detail record is used before it is revalidated
+DETAIL_CACHE_TTL = _env_float("CODEPLUG_CSV_DETAIL_CACHE_TTL", 7 * 24 * 3600)
 
 # Repeater types to exclude (beacons, TV, packet beacons, digi beacons)
 EXCLUDED_TYPES = {"BN", "TV", "PB", "DB"}
@@ -28,6 +58,11 @@ MAX_NAME_LENGTH = 16
 # Maximum channels per zone
 MAX_ZONE_CHANNELS = 250
 
+# Stream channels from the repeater lists straight into Channel.CSV/Zone.CSV
+STREAM_PIPELINE = _env_bool("CODEPLUG_CSV_STREAM_PIPELINE", False)
+# Worker processes writing batch profiles (0 or 1 = write in-process)
+BATCH_WORKERS = _env_int("CODEPLUG_CSV_BATCH_WORKERS", 0)
+
 # ---------- Anytone Channel.CSV column definitions ----------
 
 CHANNEL_COLUMNS = [
@@ -185,11 +220,67 @@ TALKGROUP_COLUMNS = [
     "Call Alert",
 ]
 
+# ---------- DigitalContactList.CSV column definitions ----------
+
+DIGITAL_CONTACT_COLUMNS = [
+    "No.",
+    "Radio ID",
+    "Callsign",
+    "Name",
+    "City",
+    "State",
+    "Country",
+    "Remarks",
+    "Call Type",
+    "Call Alert",
+]
+
+# Drop repeated radio IDs from the contact list, keeping the first
+DEDUP_CONTACTS = _env_bool("CODEPLUG_CSV_DEDUP_CONTACTS", False)
+# Worker processes for the contact list conversion (0 or 1 = convert in-process)
+CONTACT_WORKERS = _env_int("CODEPLUG_CSV_CONTACT_WORKERS", 0)
+# Bytes of user.csv converted per chunk; bounds memory use during conversion
+CONTACT_CHUNK_BYTES = _env_int("CODEPLUG_CSV_CONTACT_CHUNK_BYTES", 4 * 1024 * 1024)
+
 # ---------- HTTP client defaults ----------
 
 HTTP_TIMEOUT = _env_int("CODEPLUG_CSV_HTTP_TIMEOUT", 30)
 RADIOID_TIMEOUT = _env_int("CODEPLUG_CSV_RADIOID_TIMEOUT", 60)
+RADIOID_ATTEMPTS = _env_int("CODEPLUG_CSV_RADIOID_ATTEMPTS", 3)
+RADIOID_SEGMENT_SIZE = _env_int("CODEPLUG_CSV_RADIOID_SEGMENT_SIZE", 4 * 1024 * 1024)
 MAX_CONCURRENT = _env_int("CODEPLUG_CSV_MAX_CONCURRENT", 5)
+# Seconds an idle pooled connection is kept open for reuse
+HTTP_KEEPALIVE_EXPIRY = _env_int("CODEPLUG_CSV_HTTP_KEEPALIVE_EXPIRY", 30)
+# Adapt the API concurrency limit (starting at MAX_CONCURRENT) to latency and errors
+ADAPTIVE_CONCURRENCY = _env_bool("CODEPLUG_CSV_ADAPTIVE_CONCURRENCY", True)
+ADAPTIVE_MAX_CONCURRENT = _env_int("CODEPLUG_CSV_ADAPTIVE_MAX_CONCURRENT", 10)
+# Back off when a response takes this many times the best recent latency
+ADAPTIVE_LATENCY_TOLERANCE = _env_float("CODEPLUG_CSV_ADAPTIVE_LATENCY_TOLERANCE", 3.0)
+
+# Parse band responses incrementally as they stream in
+STREAM_PARSE = _env_bool("CODEPLUG_CSV_STREAM_PARSE", False)
+
+# Directory for the conditional-request response cache (disabled when unset)
+CACHE_DIR = os.environ.get("CODEPLUG_CSV_CACHE_DIR") or None
+# Seconds a cached response is used without revalidating (0 = always revalidate)
+CACHE_MAX_AGE = _env_float("CODEPLUG_CSV_CACHE_MAX_AGE", 0)
+# Build from the cache first and rewrite outputs only if the APIs return new data
+STALE_WHILE_REVALIDATE = _env_bool("CODEPLUG_CSV_STALE_WHILE_REVALIDATE", False)
+# Consecutive failures before requests to a host are short-circuited, and for how long
+BREAKER_THRESHOLD = _env_int("CODEPLUG_CSV_BREAKER_THRESHOLD", 3)
+BREAKER_COOLDOWN = _env_float("CODEPLUG_CSV_BREAKER_COOLDOWN", 300)
+
+# ---------- Retries and hedging ----------
+
+# Attempts per API request (1 disables retries)
+RETRY_ATTEMPTS = _env_int("CODEPLUG_CSV_RETRY_ATTEMPTS", 3)
+# Base and cap, in seconds, of the jittered exponential backoff between attempts
+RETRY_BACKOFF = _env_float("CODEPLUG_CSV_RETRY_BACKOFF", 0.5)
+RETRY_MAX_BACKOFF = _env_float("CODEPLUG_CSV_RETRY_MAX_BACKOFF", 10.0)
+# Overall seconds allowed for one attempt, including hedges (0 = no deadline)
+REQUEST_DEADLINE = _env_float("CODEPLUG_CSV_REQUEST_DEADLINE", 0)
+# Send a second request once the first exceeds this latency percentile (0 = off)
+HEDGE_PERCENTILE = _env_float("CODEPLUG_CSV_HEDGE_PERCENTILE", 0)
 
 # ---------- BrandMeister API ----------
 
@@ -214,3 +305,10 @@ TALKGROUP_NAME_OVERRIDES: dict[int, str] = {
     9990: "BM Parrot",
     234997: "UK Parrot",
 }
+
+# Keep only user.csv rows matching any of these (comma-separated; all empty = keep all)
+CONTACT_COUNTRIES = _env_list("CODEPLUG_CSV_CONTACT_COUNTRIES")
+CONTACT_ID_PREFIXES = _env_list("CODEPLUG_CSV_CONTACT_ID_PREFIXES")
+CONTACT_CALLSIGN_PREFIXES = _env_list("CODEPLUG_CSV_CONTACT_CALLSIGN_PREFIXES")
+# Keep an indexed copy of the last contact list and report what changed since
+CONTACTS_DELTA = _env_bool("CODEPLUG_CSV_CONTACTS_DELTA", False)
@@ -0,0 +1,432 @@
+"""Filtering, change tracking and lookups for the RadioID contact list (user.csv)."""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import logging
+import mmap
+import os
+import sqlite3
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from .load import _replace_if_changed, _temp_path
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ContactFilter:
+    """Rules selecting user.csv rows; a row is kept if any rule matches.
+
+    Countries are compared case-insensitively with the COUNTRY column, ID
+    prefixes with the start of RADIO_ID and callsign prefixes with the start
+    of CALLSIGN. A filter with no rules keeps every row.
+    """
+
+    countries: tuple[str, ...] = ()
+    id_prefixes: tuple[str, ...] = ()
+    callsign_prefixes: tuple[str, ...] = ()
+
+    def __post_init__(self):
+        # Normalise once so matching is plain comparisons per row
+        object.__setattr__(
+            self, "countries", tuple(sorted({c.strip().upper() for c in self.countries}))
+        )
+        object.__setattr__(
+            self, "id_prefixes", tuple(sorted({p.strip() for p in self.id_prefixes}))
+        )
+        object.__setattr__(
+            self,
+            "callsign_prefixes",
+            tuple(sorted({p.strip().upper() for p in self.callsign_prefixes})),
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.countries or self.id_prefixes or self.callsign_prefixes)
+
+    def key(self) -> dict[str, list[str]]:
+        """JSON-serialisable identity, stored with the filtered download."""
+        return {
+            "countries": list(self.countries),
+            "id_prefixes": list(self.id_prefixes),
+            "callsign_prefixes": list(self.callsign_prefixes),
+        }
+
+
+def _column(header: list[str], name: str) -> int:
+    for i, col in enumerate(header):
+        if col.strip().upper() == name:
+            return i
+    raise ValueError(f"user.csv has no {name} column")
+
+
+class RowFilter:
+    """Incrementally filter user.csv text, keeping the header and matching rows.
+
+    Feed it bytes as they arrive; only the unfinished last line is buffered,
+    so memory stays constant however large the file is.
+    """
+
+    def __init__(self, contact_filter: ContactFilter):
+        self.filter = contact_filter
+        self.total = 0
+        self.kept = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._tail = ""
+        self._columns: tuple[int, int, int] | None = None
+
+    def feed(self, chunk: bytes) -> str:
+        """Return the complete kept lines contained in *chunk*."""
+        lines = (self._tail + self._decoder.decode(chunk)).split("\n")
+        self._tail = lines.pop()
+        return self._keep(lines)
+
+    def close(self) -> str:
+        """Return whatever kept line remains once the input has ended."""
+        rest = self._tail + self._decoder.decode(b"", final=True)
+        self._tail = ""
+        return self._keep([rest]) if rest.strip() else ""
+
+    def _keep(self, lines: list[str]) -> str:
+        out = []
+        for line in lines:
+            if self._columns is None:
+                self._read_header(line)
+                out.append(line)
+                continue
+            if not line.strip():
+                continue
+            self.total += 1
+            if self._matches(line):
+                self.kept += 1
+                out.append(line)
+        return "".join(line + "\n" for line in out)
+
+    def _read_header(self, line: str) -> None:
+        header = next(csv.reader([line.rstrip("\r")]))
+        f = self.filter
+        self._columns = (
+            _column(header, "RADIO_ID") if f.id_prefixes else -1,
+            _column(header, "CALLSIGN") if f.callsign_prefixes else -1,
+            _column(header, "COUNTRY") if f.countries else -1,
+        )
+
+    def _matches(self, line: str) -> bool:
+        line = line.rstrip("\r")
+        fields = line.split(",") if '"' not in line else next(csv.reader([line]))
+        id_col, call_col, country_col = self._columns
+        f = self.filter
+        try:
+            if f.id_prefixes and fields[id_col].strip().startswith(f.id_prefixes):
+                return True
+            if f.callsign_prefixes and fields[call_col].strip().upper().startswith(
+                f.callsign_prefixes
+            ):
+                return True
+            if f.countries and fields[country_col].strip().upper() in f.countries:
+                return True
+        except IndexError:
+            return False
+        return False
+
+
+# ---------- Contact list deltas ----------
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (radio_id INTEGER PRIMARY KEY, row TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+# One query yields the whole delta in radio ID order
+_DELTA_QUERY = """
+SELECT i.radio_id, 'added', i.row FROM incoming i
+    LEFT JOIN contacts c ON c.radio_id = i.radio_id WHERE c.radio_id IS NULL
+UNION ALL
+SELECT i.radio_id, 'changed', i.row FROM incoming i
+    JOIN contacts c ON c.radio_id = i.radio_id WHERE c.row != i.row
+UNION ALL
+SELECT c.radio_id, 'deleted', c.row FROM contacts c
+    LEFT JOIN incoming i ON i.radio_id = c.radio_id WHERE i.radio_id IS NULL
+ORDER BY 1
+"""
+
+
+@dataclass(frozen=True)
+class ContactDelta:
+    """Number of rows added, changed and deleted since the previous list."""
+
+    added: int = 0
+    changed: int = 0
+    deleted: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.deleted)
+
+
+def _source_rows(lines: Iterator[str], id_col: int) -> Iterator[tuple[int, str]]:
+    """``(radio_id, line)`` for each user.csv row in *lines*, skipping bad rows."""
+    for line in lines:
+        line = line.rstrip("\r\n")
+        fields = line.split(",") if '"' not in line else next(csv.reader([line]))
+        try:
+            yield int(fields[id_col]), line
+        except (IndexError, ValueError):
+            continue
+
+
+def update_contact_index(src: Path, index: Path, report: Path) -> ContactDelta:
+    """Compare *src* with the copy kept in *index*, then bring the index up to date.
+
+    The index is a SQLite database keyed by radio ID. *src* is read once into
+    a temporary table; added, changed and deleted rows are written to *report*
+    (the user.csv header with a leading ``CHANGE`` column) and applied to the
+    index. Unchanged contacts are never rewritten. If *src* has the same size
+    and modification time as last time, only its header is read and the
+    report is empty. *report* is written through a temporary file and left
+    alone if its content is unchanged.
+    """
+    stat = src.stat()
+    signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+    db = sqlite3.connect(index)
+    try:
+        db.executescript(_INDEX_SCHEMA)
+        meta = dict(db.execute("SELECT key, value FROM meta"))
+        if meta.get("source") == signature:
+            logger.info("Contact list unchanged since the last run")
+            with open(src, encoding="utf-8", errors="replace", newline="") as f:
+                header = f.readline().rstrip("\r\n")
+            part = _temp_path(report)
+            part.write_text(f"CHANGE,{header}\r\n", encoding="utf-8", newline="")
+            _replace_if_changed(part, report)
+            return ContactDelta()
+
+        db.execute("PRAGMA synchronous = OFF")
+        db.execute(
+            "CREATE TEMP TABLE incoming "
+            "(radio_id INTEGER PRIMARY KEY, row TEXT NOT NULL)"
+        )
+        with open(src, encoding="utf-8", errors="replace", newline="") as f:
+            header = f.readline().rstrip("\r\n")
+            id_col = _column(next(csv.reader([header])), "RADIO_ID")
+            # A repeated radio ID keeps its first row, as --dedup-contacts does
+            db.executemany(
+                "INSERT OR IGNORE INTO incoming VALUES (?, ?)", _source_rows(f, id_col)
+            )
+
+        counts = {"added": 0, "changed": 0, "deleted": 0}
+        part = _temp_path(report)
+        with open(part, "w", encoding="utf-8", newline="") as out:
+            out.write(f"CHANGE,{header}\r\n")
+            for _, change, row in db.execute(_DELTA_QUERY):
+                counts[change] += 1
+                out.write(f"{change},{row}\r\n")
+        _replace_if_changed(part, report)
+
+        with db:
+            db.execute(
+                "DELETE FROM contacts "
+                "WHERE radio_id NOT IN (SELECT radio_id FROM incoming)"
+            )
+            db.execute(
+                "INSERT OR REPLACE INTO contacts SELECT i.radio_id, i.row "
+                "FROM incoming i LEFT JOIN contacts c ON c.radio_id = i.radio_id "
+                "WHERE c.row IS NULL OR c.row != i.row"
+            )
+            db.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('source', ?)", (signature,)
+            )
+        db.execute("DROP TABLE incoming")
+    finally:
+        db.close()
+
+    delta = ContactDelta(**counts)
+    logger.info(
+        "Contacts: %d added, %d changed, %d deleted",
+        delta.added,
+        delta.changed,
+        delta.deleted,
+    )
+    return delta
+
+
+# ---------- Indexed lookups ----------
+
+# Index file: magic, source size, source mtime_ns, row count, then three
+# int64 arrays of equal length, in native byte order: radio IDs in ascending
+# order, the row offset for each, and row offsets in callsign order.
+_INDEX_HEADER = struct.Struct("=8sqqq")
+_INDEX_MAGIC = b"CPCIDX01"
+
+
+def _split(line: bytes) -> list[bytes]:
+    line = line.rstrip(b"\r")
+    if b'"' not in line:
+        return line.split(b",")
+    return [f.encode() for f in next(csv.reader([line.decode("utf-8", "replace")]))]
+
+
+class ContactIndex:
+    """Radio ID and callsign lookups over a memory-mapped user.csv.
+
+    Rows stay in the file; the index holds only sorted 64-bit radio IDs and
+    byte offsets, and lookups bisect it. The index is saved next to the file
+    (``.user.csv.idx``) and rebuilt when the file's size or mtime changes, so
+    only the first lookup after a download pays for the scan.
+    """
+
+    def __init__(self, path: Path, index_path: Path | None = None):
+        self.path = path
+        self.index_path = index_path or path.with_name(f".{path.name}.idx")
+        self._views: list[memoryview] = []
+        self._index_map: mmap.mmap | None = None
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size == 0:
+                raise ValueError(f"{path} is empty")
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._signature = (stat.st_size, stat.st_mtime_ns)
+        header_end = self._data.find(b"\n")
+        if header_end < 0:
+            header_end = len(self._data)
+        self._body = header_end + 1
+        self.header = [
+            name.decode("utf-8", "replace").strip()
+            for name in _split(self._data[:header_end])
+        ]
+        upper = [name.upper() for name in self.header]
+        self._id_col = _column(upper, "RADIO_ID")
+        self._call_col = _column(upper, "CALLSIGN")
+        if not self._load():
+            self._build()
+
+    def __enter__(self) -> ContactIndex:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def close(self) -> None:
+        # Views into the index map must go before it can be closed
+        self._ids = self._offsets = self._by_call = array("q")
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_map = None
+        self._data.close()
+
+    def by_id(self, radio_id: int) -> dict[str, str] | None:
+        """The row for *radio_id* (the first, if it is repeated), or None."""
+        i = bisect_left(self._ids, radio_id)
+        if i < len(self._ids) and self._ids[i] == radio_id:
+            return self._row(self._offsets[i])
+        return None
+
+    def by_callsign(self, callsign: str) -> list[dict[str, str]]:
+        """Every row for *callsign* (case-insensitive), in file order."""
+        key = callsign.strip().upper().encode()
+        i = bisect_left(self._by_call, key, key=self._callsign_at)
+        rows = []
+        while i < len(self._by_call) and self._callsign_at(self._by_call[i]) == key:
+            rows.append(self._row(self._by_call[i]))
+            i += 1
+        return rows
+
+    def _line(self, offset: int) -> bytes:
+        end = self._data.find(b"\n", offset)
+        return self._data[offset : end if end >= 0 else len(self._data)]
+
+    def _callsign_at(self, offset: int) -> bytes:
+        fields = _split(self._line(offset))
+        if self._call_col >= len(fields):
+            return b""
+        return fields[self._call_col].strip().upper()
+
+    def _row(self, offset: int) -> dict[str, str]:
+        fields = [f.decode("utf-8", "replace") for f in _split(self._line(offset))]
+        return dict(zip(self.header, fields))
+
+    def _load(self) -> bool:
+        """Map a saved index that matches the file; False if there is none."""
+        try:
+            with open(self.index_path, "rb") as f:
+                index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        if len(index_map) < _INDEX_HEADER.size:
+            index_map.close()
+            return False
+        magic, size, mtime_ns, rows = _INDEX_HEADER.unpack_from(index_map)
+        if (
+            magic != _INDEX_MAGIC
+            or (size, mtime_ns) != self._signature
+            or len(index_map) != _INDEX_HEADER.size + rows * 24
+        ):
+            index_map.close()
+            return False
+        self._index_map = index_map
+        values = memoryview(index_map)[_INDEX_HEADER.size :].cast("q")
+        self._views.append(values)
+        self._ids, self._offsets, self._by_call = (
+            values[i * rows : (i + 1) * rows] for i in range(3)
+        )
+        self._views.extend((self._ids, self._offsets, self._by_call))
+        return True
+
+    def _build(self) -> None:
+        ids = array("q")
+        offsets = array("q")
+        callsigns: list[bytes] = []
+        data = self._data
+        data.seek(self._body)
+        offset = self._body
+        id_col, call_col = self._id_col, self._call_col
+        width = max(id_col, call_col) + 1
+        for line in iter(data.readline, b""):
+            fields = _split(line.rstrip(b"\n"))
+            if len(fields) >= width:
+                try:
+                    radio_id = int(fields[id_col])
+                except ValueError:
+                    pass
+                else:
+                    ids.append(radio_id)
+                    offsets.append(offset)
+                    callsigns.append(fields[call_col].strip().upper())
+            offset += len(line)
+
+        # Stable sorts keep the first of any repeated ID or callsign first
+        if any(a > b for a, b in zip(ids, ids[1:])):
+            order = sorted(range(len(ids)), key=ids.__getitem__)
+            ids = array("q", (ids[i] for i in order))
+            offsets_by_id = array("q", (offsets[i] for i in order))
+        else:
+            offsets_by_id = offsets
+        call_order = sorted(range(len(callsigns)), key=callsigns.__getitem__)
+        by_call = array("q", (offsets[i] for i in call_order))
+        self._ids, self._offsets, self._by_call = ids, offsets_by_id, by_call
+        logger.debug("Indexed %d contacts in %s", len(ids), self.path)
+        self._save()
+
+    def _save(self) -> None:
+        part = self.index_path.with_name(self.index_path.name + ".part")
+        try:
+            with open(part, "wb") as f:
+                f.write(
+                    _INDEX_HEADER.pack(_INDEX_MAGIC, *self._signature, len(self._ids))
+                )
+                for values in (self._ids, self._offsets, self._by_call):
+                    values.tofile(f)
+            part.replace(self.index_path)
+        except OSError as e:
+            logger.warning("Cannot save contact index %s: %s", self.index_path, e)
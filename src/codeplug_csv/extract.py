@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import os
 import asyncio
 import aiofiles
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import asdict
 from pathlib import Path
+from typing import TypeVar
+from urllib.parse import quote
 
 import httpx
+from pydantic import TypeAdapter
 
+from .cache import CacheEntry, ResponseCache, _write_json_atomic
 from .config import (
     API_BASE_URL,
     BRANDMEISTER_API_URL,
@@ -17,51 +25,332 @@ from .config import (
     MAX_NAME_LENGTH,
     NON_UK_CURATED_IDS,
     PRIVATE_CALL_IDS,
+    RADIOID_ATTEMPTS,
     RADIOID_CSV_URL,
+    RADIOID_SEGMENT_SIZE,
     RADIOID_TIMEOUT,
+    RSGB_DETAIL_PATH,
+    STREAM_PARSE,
     TALKGROUP_NAME_OVERRIDES,
     UK_TG_PREFIX,
 )
-from .models import Repeater, TalkGroup, RepeaterModel, TalkGroupModel
+from .contacts import ContactFilter, RowFilter
+from .jsonstream import iter_array_items
+from .limiter import AdaptiveLimiter
+from .models import Repeater, RepeaterDetail, TalkGroup, TalkGroupModel
+from .retry import (
+    LatencyTracker,
+    RetryPolicy,
+    call_with_retry,
+    describe_error,
+    is_retryable,
+)
+from .session import create_session
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+_REPEATER = TypeAdapter(Repeater)
+_REPEATERS = TypeAdapter(list[Repeater])
+_DETAIL = TypeAdapter(RepeaterDetail)
+
+# Bytes of a ranged-download segment buffered between writes
+_SEGMENT_WRITE_BYTES = 256 * 1024
+
+
+def _drop_none(item: dict) -> dict:
+    """Drop null fields so the dataclass defaults apply."""
+    if None in item.values():
+        return {k: v for k, v in item.items() if v is not None}
+    return item
+
+
+async def _cached_request(
+    cache: ResponseCache | None,
+    url: str,
+    request: Callable[[CacheEntry | None], Awaitable[T]],
+    from_cache: Callable[[CacheEntry], T],
+    offline: bool = False,
+) -> T:
+    """Run *request* for *url*, falling back to *cache* when the API is failing.
+
+    A cached entry younger than the cache's ``max_age`` is returned without a
+    request; with *offline* any cached entry is, and a missing one raises
+    LookupError. When the host's circuit breaker is open, or the request
+    fails with a transient error, the last good entry is served instead.
+    """
+    cached = cache.get(url) if cache else None
+    if cached is not None and (offline or cached.age() < cache.max_age):
+        return from_cache(cached)
+    if offline:
+        raise LookupError(f"{url} is not cached")
+
+    host = httpx.URL(url).host
+    breaker = cache.breaker if cache else None
+    if breaker and not breaker.allow(host):
+        if cached is None:
+            raise httpx.ConnectError(f"Circuit open for {host} and {url} is not cached")
+        logger.warning(
+            "Circuit open for %s, using cached %s from %.0fs ago", host, url, cached.age()
+        )
+        return from_cache(cached)
+
+    try:
+        result = await request(cached)
+    except Exception as e:
+        if not is_retryable(e):
+            raise
+        if breaker:
+            breaker.record_failure(host)
+        if cached is None:
+            raise
+        logger.warning(
+            "Fetching %s failed (%s), using cached data from %.0fs ago",
+            url,
+            describe_error(e),
+            cached.age(),
+        )
+        return from_cache(cached)
+    if breaker:
+        breaker.record_success(host)
+    return result
+
 
 class RSGBClient:
-    """Client for the RSGB ETCC beta API."""
+    """Client for the RSGB ETCC beta API.
+
+    With *stream_parse* the band payload is parsed incrementally as it arrives
+    instead of being decoded whole, so memory scales with one record rather
+    than the full response. With *offline* bands are served from *cache*
+    only, and a band that is not cached raises LookupError. Requests share
+    an :class:`AdaptiveLimiter` starting at *max_concurrent*.
+
+    Per-repeater detail records come from *detail_path* and are cached per
+    callsign in *detail_cache*, whose ``max_age`` acts as their TTL.
+    """
 
     def __init__(
         self,
         base_url: str = API_BASE_URL,
         timeout: int = HTTP_TIMEOUT,
         max_concurrent: int = MAX_CONCURRENT,
+        cache: ResponseCache | None = None,
+        session: httpx.AsyncClient | None = None,
+        stream_parse: bool = STREAM_PARSE,
+        retry: RetryPolicy | None = None,
+        offline: bool = False,
+        limiter: AdaptiveLimiter | None = None,
+        detail_path: str = RSGB_DETAIL_PATH,
+        detail_cache: ResponseCache | None = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.max_concurrent = max_concurrent
+        self.limiter = limiter or AdaptiveLimiter.from_config(max_concurrent)
+        self.cache = cache
+        self.stream_parse = stream_parse
+        self.offline = offline
+        self.retry = retry or RetryPolicy()
+        self.detail_path = detail_path
+        self.detail_cache = detail_cache
+        self._latency = LatencyTracker()
+        self._detail_latency = LatencyTracker()
+        self._details: dict[str, asyncio.Future[RepeaterDetail]] = {}
+        self._session = session
         self._client: httpx.AsyncClient | None = None
 
     async def __aenter__(self) -> RSGBClient:
-        self.semaphore = asyncio.Semaphore(self.max_concurrent)
-        self._client = httpx.AsyncClient(timeout=self.timeout)
+        self._client = self._session or create_session(
+            timeout=self.timeout, max_concurrent=self.max_concurrent
+        )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self._client:
+        for task in self._details.values():
+            task.cancel()
+        await asyncio.gather(*self._details.values(), return_exceptions=True)
+        if self._client and self._client is not self._session:
             await self._client.aclose()
 
     async def fetch_band(self, band: str) -> list[Repeater]:
         """Fetch all repeaters for a given band (e.g. '2m', '70cm')."""
         url = f"{self.base_url}/band/{band}"
-        async with self.semaphore:
-            if not self._client:
-                raise RuntimeError("Client must be used as an async context manager")
-            logger.debug("Fetching %s", url)
-            resp = await self._client.get(url)
+        if not self._client:
+            raise RuntimeError("Client must be used as an async context manager")
+        return await _cached_request(
+            self.cache,
+            url,
+            lambda cached: call_with_retry(
+                lambda: self._limited(lambda: self._request_band(url, band, cached)),
+                self.retry,
+                self._latency,
+                f"GET {url}",
+            ),
+            lambda cached: self._from_cache(band, cached),
+            self.offline,
+        )
+
+    async def _limited(self, request: Callable[[], Awaitable[T]]) -> T:
+        """Run one request attempt within the adaptive concurrency limit."""
+        async with self.limiter.slot():
+            return await request()
+
+    async def _request_band(
+        self, url: str, band: str, cached: CacheEntry | None
+    ) -> list[Repeater]:
+        headers = cached.conditional_headers() if cached else {}
+        logger.debug("Fetching %s", url)
+        if self.stream_parse:
+            async with self._client.stream(
+                "GET", url, headers=headers, timeout=self.timeout
+            ) as resp:
+                if cached and resp.status_code == 304:
+                    return self._not_modified(band, cached)
+                resp.raise_for_status()
+                repeaters = [
+                    self._parse(item)
+                    async for item in iter_array_items(resp.aiter_bytes(), "data")
+                ]
+        else:
+            resp = await self._client.get(url, headers=headers, timeout=self.timeout)
+            if cached and resp.status_code == 304:
+                return self._not_modified(band, cached)
             resp.raise_for_status()
             data = resp.json().get("data", [])
-            logger.info("Got %d repeaters for %s", len(data), band)
-            return [self._parse(item) for item in data]
+            repeaters = self._parse_batch(data)
+        logger.info("Got %d repeaters for %s", len(repeaters), band)
+        if self.cache:
+            self.cache.put(
+                CacheEntry(
+                    url=url,
+                    etag=resp.headers.get("ETag"),
+                    last_modified=resp.headers.get("Last-Modified"),
+                    data=[r.to_row() for r in repeaters],
+                )
+            )
+        return repeaters
+
+    async def iter_bands(
+        self, bands: list[str]
+    ) -> AsyncIterator[tuple[str, list[Repeater]]]:
+        """Yield ``(band, repeaters)`` for each band as soon as its fetch completes."""
+
+        async def fetch(band: str) -> tuple[str, list[Repeater]]:
+            return band, await self.fetch_band(band)
+
+        tasks = [asyncio.ensure_future(fetch(band)) for band in bands]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def _from_cache(band: str, cached: CacheEntry) -> list[Repeater]:
+        logger.info("Using %d cached repeaters for %s", len(cached.data), band)
+        return [Repeater(**row) for row in cached.data]
+
+    def _not_modified(self, band: str, cached: CacheEntry) -> list[Repeater]:
+        logger.info("%s not modified", band)
+        self.cache.touch(cached)
+        return self._from_cache(band, cached)
+
+    async def fetch_detail(self, callsign: str) -> RepeaterDetail:
+        """Fetch the detail record for one repeater.
+
+        Concurrent and repeated calls for the same callsign share a single
+        request for the lifetime of the client. A failed request is
+        forgotten, so the next call tries again.
+        """
+        if not self._client:
+            raise RuntimeError("Client must be used as an async context manager")
+        task = self._details.get(callsign)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_detail(callsign))
+            self._details[callsign] = task
+            task.add_done_callback(
+                lambda done: self._forget_failed_detail(callsign, done)
+            )
+        # Shield so one cancelled caller does not cancel the others' request
+        return await asyncio.shield(task)
+
+    def _forget_failed_detail(self, callsign: str, task: asyncio.Future) -> None:
+        if (task.cancelled() or task.exception() is not None) and (
+            self._details.get(callsign) is task
+        ):
+            del self._details[callsign]
+
+    async def fetch_details(
+        self, repeaters: list[Repeater]
+    ) -> dict[str, RepeaterDetail]:
+        """Detail records for *repeaters* by callsign, skipping failed lookups."""
+        callsigns = list(dict.fromkeys(r.repeater for r in repeaters if r.repeater))
+        results = await asyncio.gather(
+            *(self.fetch_detail(callsign) for callsign in callsigns),
+            return_exceptions=True,
+        )
+        details: dict[str, RepeaterDetail] = {}
+        failed = 0
+        for callsign, result in zip(callsigns, results):
+            if isinstance(result, Exception):
+                failed += 1
+                logger.debug("No detail for %s: %s", callsign, describe_error(result))
+            else:
+                details[callsign] = result
+        if failed:
+            logger.warning(
+                "Could not fetch detail for %d of %d repeaters", failed, len(callsigns)
+            )
+        return details
+
+    async def _fetch_detail(self, callsign: str) -> RepeaterDetail:
+        path = self.detail_path.format(callsign=quote(callsign, safe=""))
+        url = f"{self.base_url}{path}"
+        return await _cached_request(
+            self.detail_cache,
+            url,
+            lambda cached: call_with_retry(
+                lambda: self._limited(
+                    lambda: self._request_detail(url, callsign, cached)
+                ),
+                self.retry,
+                self._detail_latency,
+                f"GET {url}",
+            ),
+            self._detail_from_cache,
+            self.offline,
+        )
+
+    async def _request_detail(
+        self, url: str, callsign: str, cached: CacheEntry | None
+    ) -> RepeaterDetail:
+        headers = cached.conditional_headers() if cached else {}
+        logger.debug("Fetching %s", url)
+        resp = await self._client.get(url, headers=headers, timeout=self.timeout)
+        if cached and resp.status_code == 304:
+            self.detail_cache.touch(cached)
+            return self._detail_from_cache(cached)
+        resp.raise_for_status()
+        payload = resp.json()
+        item = payload.get("data", payload) if isinstance(payload, dict) else {}
+        detail = _DETAIL.validate_python({**_drop_none(item), "callsign": callsign})
+        if self.detail_cache:
+            self.detail_cache.put(
+                CacheEntry(
+                    url=url,
+                    etag=resp.headers.get("ETag"),
+                    last_modified=resp.headers.get("Last-Modified"),
+                    data=[asdict(detail)],
+                )
+            )
+        return detail
+
+    @staticmethod
+    def _detail_from_cache(cached: CacheEntry) -> RepeaterDetail:
+        return _DETAIL.validate_python(cached.data[0])
 
     async def fetch_bands(self, bands: list[str]) -> list[Repeater]:
         """Fetch repeaters for multiple bands."""
@@ -71,27 +360,45 @@ class RSGBClient:
 
     @staticmethod
     def _parse(item: dict) -> Repeater:
-        cleaned = {k: v for k, v in item.items() if v is not None}
-        validated = RepeaterModel.model_validate(cleaned)
-        return Repeater(**validated.model_dump())
+        return _REPEATER.validate_python(_drop_none(item))
+
+    @staticmethod
+    def _parse_batch(items: list[dict]) -> list[Repeater]:
+        """Validate a whole band payload in one call."""
+        return _REPEATERS.validate_python([_drop_none(item) for item in items])
 
 
 class BrandMeisterClient:
-    """Client for the BrandMeister talkgroup API."""
+    """Client for the BrandMeister talkgroup API.
+
+    *cache* and *offline* behave as for :class:`RSGBClient`; the curated
+    talkgroup list is cached rather than the raw response.
+    """
 
     def __init__(
-        self, base_url: str = BRANDMEISTER_API_URL, timeout: int = HTTP_TIMEOUT
+        self,
+        base_url: str = BRANDMEISTER_API_URL,
+        timeout: int = HTTP_TIMEOUT,
+        session: httpx.AsyncClient | None = None,
+        retry: RetryPolicy | None = None,
+        cache: ResponseCache | None = None,
+        offline: bool = False,
     ):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self.cache = cache
+        self.offline = offline
+        self.retry = retry or RetryPolicy()
+        self._latency = LatencyTracker()
+        self._session = session
         self._client: httpx.AsyncClient | None = None
 
     async def __aenter__(self) -> BrandMeisterClient:
-        self._client = httpx.AsyncClient(timeout=self.timeout)
+        self._client = self._session or create_session(timeout=self.timeout)
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self._client:
+        if self._client and self._client is not self._session:
             await self._client.aclose()
 
     async def fetch_talkgroups(self) -> list[TalkGroup]:
@@ -99,14 +406,48 @@ class BrandMeisterClient:
         if not self._client:
             raise RuntimeError("Client must be used as an async context manager")
         url = f"{self.base_url}/talkgroup/"
+        return await _cached_request(
+            self.cache,
+            url,
+            lambda cached: call_with_retry(
+                lambda: self._request_talkgroups(url, cached),
+                self.retry,
+                self._latency,
+                f"GET {url}",
+            ),
+            self._from_cache,
+            self.offline,
+        )
+
+    async def _request_talkgroups(
+        self, url: str, cached: CacheEntry | None
+    ) -> list[TalkGroup]:
+        headers = cached.conditional_headers() if cached else {}
         logger.debug("Fetching %s", url)
-        resp = await self._client.get(url)
+        resp = await self._client.get(url, headers=headers, timeout=self.timeout)
+        if cached and resp.status_code == 304:
+            logger.info("BrandMeister talkgroups not modified")
+            self.cache.touch(cached)
+            return self._from_cache(cached)
         resp.raise_for_status()
-        data = resp.json()
-        talkgroups = self._filter_and_parse(data)
+        talkgroups = self._filter_and_parse(resp.json())
         logger.info("Fetched %d talkgroups from BrandMeister", len(talkgroups))
+        if self.cache:
+            self.cache.put(
+                CacheEntry(
+                    url=url,
+                    etag=resp.headers.get("ETag"),
+                    last_modified=resp.headers.get("Last-Modified"),
+                    data=[asdict(tg) for tg in talkgroups],
+                )
+            )
         return talkgroups
 
+    @staticmethod
+    def _from_cache(cached: CacheEntry) -> list[TalkGroup]:
+        logger.info("Using %d cached talkgroups", len(cached.data))
+        return [TalkGroup(**row) for row in cached.data]
+
     @staticmethod
     def _filter_and_parse(data: dict) -> list[TalkGroup]:
         """Filter API response to UK-prefix and curated talkgroup IDs."""
@@ -184,31 +525,408 @@ class BrandMeisterClient:
         return talkgroups
 
 
+def _read_meta(path: Path) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable download metadata %s: %s", path, e)
+        return {}
+
+
+def _write_meta(path: Path, meta: dict) -> None:
+    _write_json_atomic(path, meta)
+
+
+def _complete(meta: dict, contact_filter: ContactFilter | None = None) -> dict:
+    """Validators of the finished download, if it was made with *contact_filter*."""
+    key = contact_filter.key() if contact_filter else None
+    return meta.get("complete", {}) if meta.get("filter") == key else {}
+
+
+def _validators(headers: httpx.Headers) -> dict[str, str | None]:
+    return {
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+    }
+
+
+def _if_range(validators: dict) -> str | None:
+    """Pick a validator usable in If-Range (weak ETags are not allowed)."""
+    etag = validators.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return validators.get("last_modified")
+
+
+def _range_total(content_range: str | None) -> int | None:
+    """The complete length from a ``bytes */N`` Content-Range, if given."""
+    if not content_range:
+        return None
+    _, _, total = content_range.rpartition("/")
+    return int(total) if total.isdigit() else None
+
+
+def forget_download(dest: Path) -> None:
+    """Drop the partial download and validators RadioIDClient keeps for *dest*.
+
+    Call this before replacing *dest* by other means, so the next download
+    neither resumes into nor revalidates against a file it did not write.
+    """
+    dest.with_name(f".{dest.name}.part").unlink(missing_ok=True)
+    dest.with_name(f".{dest.name}.meta.json").unlink(missing_ok=True)
+
+
 class RadioIDClient:
-    """Client for downloading the RadioID DMR user database."""
+    """Client for downloading the RadioID DMR user database.
+
+    Downloads go to a hidden ``.<name>.part`` file next to the destination and
+    are renamed into place only once complete. The validators of the last
+    complete download and of the partial file are kept in ``.<name>.meta.json``
+    so unchanged databases are skipped with a conditional request and
+    interrupted transfers resume with a Range request.
+    """
 
-    def __init__(self, url: str = RADIOID_CSV_URL, timeout: int = RADIOID_TIMEOUT):
+    def __init__(
+        self,
+        url: str = RADIOID_CSV_URL,
+        timeout: int = RADIOID_TIMEOUT,
+        attempts: int = RADIOID_ATTEMPTS,
+        max_concurrent: int = MAX_CONCURRENT,
+        segment_size: int = RADIOID_SEGMENT_SIZE,
+        session: httpx.AsyncClient | None = None,
+        retry: RetryPolicy | None = None,
+    ):
         self.url = url
         self.timeout = timeout
+        # No deadline or hedging: a full database transfer legitimately takes long
+        self.retry = retry or RetryPolicy(attempts=attempts, deadline=0, hedge_percentile=0)
+        self.attempts = max(1, self.retry.attempts)
+        self.max_concurrent = max(1, max_concurrent)
+        self.segment_size = max(1, segment_size)
+        self._session = session
         self._client: httpx.AsyncClient | None = None
 
     async def __aenter__(self) -> RadioIDClient:
-        self._client = httpx.AsyncClient(timeout=self.timeout)
+        self._client = self._session or create_session(
+            timeout=self.timeout, max_concurrent=self.max_concurrent
+        )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self._client:
+        if self._client and self._client is not self._session:
             await self._client.aclose()
 
     async def download(self, dest: Path) -> Path:
-        """Stream the RadioID user CSV to *dest* and return the path written."""
+        """Download the RadioID user CSV to *dest* and return the path.
+
+        An existing *dest* is left untouched until the new file is complete,
+        and is kept as-is when the server reports it unchanged.
+        """
         if not self._client:
             raise RuntimeError("Client must be used as an async context manager")
+        part = dest.with_name(f".{dest.name}.part")
+        meta_path = dest.with_name(f".{dest.name}.meta.json")
+        meta = _read_meta(meta_path)
+
         logger.info("Downloading RadioID database from %s", self.url)
-        async with self._client.stream("GET", self.url) as response:
+        for attempt in range(1, self.attempts + 1):
+            try:
+                changed = await self._download_once(dest, part, meta_path, meta)
+                break
+            except httpx.HTTPError as e:
+                if attempt == self.attempts or not is_retryable(e):
+                    raise
+                offset = part.stat().st_size if part.exists() else 0
+                delay = self.retry.delay(attempt)
+                logger.warning(
+                    "RadioID download interrupted (%s), retrying from byte %d "
+                    "in %.2fs (attempt %d/%d)",
+                    describe_error(e),
+                    offset,
+                    delay,
+                    attempt + 1,
+                    self.attempts,
+                )
+                await asyncio.sleep(delay)
+
+        if not changed:
+            logger.info("RadioID database unchanged, keeping %s", dest)
+            return dest
+
+        os.replace(part, dest)
+        meta = {"complete": meta.get("partial", {})}
+        _write_meta(meta_path, meta)
+        logger.info("Wrote RadioID database to %s", dest)
+        return dest
+
+    async def download_filtered(self, dest: Path, contact_filter: ContactFilter) -> Path:
+        """Download the user CSV keeping only rows matching *contact_filter*.
+
+        Rows are filtered as chunks arrive and written straight out, so memory
+        use does not grow with the database. The transfer is requested
+        compressed; as the output is not a byte range of the source, an
+        interrupted download restarts rather than resumes.
+        """
+        if not self._client:
+            raise RuntimeError("Client must be used as an async context manager")
+        tmp = dest.with_name(f".{dest.name}.filtering")
+        meta_path = dest.with_name(f".{dest.name}.meta.json")
+        meta = _read_meta(meta_path)
+        headers = {"Accept-Encoding": "gzip, deflate"}
+        if dest.exists():
+            complete = _complete(meta, contact_filter)
+            if complete.get("etag"):
+                headers["If-None-Match"] = complete["etag"]
+            if complete.get("last_modified"):
+                headers["If-Modified-Since"] = complete["last_modified"]
+
+        logger.info("Downloading and filtering RadioID database from %s", self.url)
+        for attempt in range(1, self.attempts + 1):
+            try:
+                result = await self._filter_once(tmp, headers, contact_filter)
+                break
+            except httpx.HTTPError as e:
+                if attempt == self.attempts or not is_retryable(e):
+                    tmp.unlink(missing_ok=True)
+                    raise
+                delay = self.retry.delay(attempt)
+                logger.warning(
+                    "RadioID download interrupted (%s), restarting in %.2fs "
+                    "(attempt %d/%d)",
+                    describe_error(e),
+                    delay,
+                    attempt + 1,
+                    self.attempts,
+                )
+                await asyncio.sleep(delay)
+
+        if result is None:
+            logger.info("RadioID database unchanged, keeping %s", dest)
+            return dest
+
+        validators, row_filter = result
+        os.replace(tmp, dest)
+        _write_meta(meta_path, {"complete": validators, "filter": contact_filter.key()})
+        logger.info(
+            "Wrote %d of %d RadioID contacts to %s",
+            row_filter.kept,
+            row_filter.total,
+            dest,
+        )
+        return dest
+
+    async def _filter_once(
+        self, tmp: Path, headers: dict[str, str], contact_filter: ContactFilter
+    ) -> tuple[dict, RowFilter] | None:
+        """Stream and filter into *tmp*. Return None on 304."""
+        row_filter = RowFilter(contact_filter)
+        async with self._client.stream(
+            "GET", self.url, headers=headers, timeout=self.timeout
+        ) as response:
+            if response.status_code == 304:
+                return None
             response.raise_for_status()
-            async with aiofiles.open(dest, "wb") as fh:
+            async with aiofiles.open(tmp, "w", encoding="utf-8", newline="") as fh:
                 async for chunk in response.aiter_bytes():
-                    await fh.write(chunk)
+                    kept = row_filter.feed(chunk)
+                    if kept:
+                        await fh.write(kept)
+                await fh.write(row_filter.close())
+            return _validators(response.headers), row_filter
+
+    async def download_parallel(self, dest: Path) -> Path:
+        """Download *dest* as concurrent byte ranges written in place.
+
+        Falls back to :meth:`download` when the server does not advertise
+        byte-range support, a length and a validator for ``If-Range``.
+        """
+        if not self._client:
+            raise RuntimeError("Client must be used as an async context manager")
+        meta_path = dest.with_name(f".{dest.name}.meta.json")
+        meta = _read_meta(meta_path)
+
+        head = await self._client.head(
+            self.url, headers={"Accept-Encoding": "identity"}, timeout=self.timeout
+        )
+        head.raise_for_status()
+        validators = _validators(head.headers)
+        size = int(head.headers.get("Content-Length") or 0)
+        if_range = _if_range(validators)
+        if head.headers.get("Accept-Ranges") != "bytes" or not size or not if_range:
+            logger.info("Server does not support ranged downloads, using one stream")
+            return await self.download(dest)
+
+        if dest.exists() and _complete(meta) == validators:
+            logger.info("RadioID database unchanged, keeping %s", dest)
+            return dest
+
+        segments = [
+            (start, min(start + self.segment_size, size) - 1)
+            for start in range(0, size, self.segment_size)
+        ]
+        logger.info(
+            "Downloading RadioID database (%d bytes) in %d segments, %d at a time",
+            size,
+            len(segments),
+            self.max_concurrent,
+        )
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        tmp = dest.with_name(f".{dest.name}.segments")
+        fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            tasks = [
+                asyncio.create_task(
+                    self._fetch_segment(fd, start, end, if_range, semaphore)
+                )
+                for start, end in segments
+            ]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+        except BaseException:
+            os.close(fd)
+            tmp.unlink(missing_ok=True)
+            raise
+        os.close(fd)
+
+        os.replace(tmp, dest)
+        _write_meta(meta_path, {"complete": validators})
         logger.info("Wrote RadioID database to %s", dest)
         return dest
+
+    async def _fetch_segment(
+        self,
+        fd: int,
+        start: int,
+        end: int,
+        if_range: str,
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        """Fetch bytes *start*..*end* (inclusive) and write them at their offset.
+
+        Chunks are gathered into blocks of ``_SEGMENT_WRITE_BYTES`` so each
+        hand-off to a writer thread carries a useful amount of data.
+        """
+        pos = start
+        buffer = bytearray()
+
+        async def flush() -> None:
+            nonlocal pos
+            if buffer:
+                await asyncio.to_thread(os.pwrite, fd, buffer, pos)
+                pos += len(buffer)
+                buffer.clear()
+
+        async with semaphore:
+            for attempt in range(1, self.attempts + 1):
+                headers = {
+                    "Range": f"bytes={pos}-{end}",
+                    "If-Range": if_range,
+                    "Accept-Encoding": "identity",
+                }
+                try:
+                    async with self._client.stream(
+                        "GET", self.url, headers=headers, timeout=self.timeout
+                    ) as response:
+                        response.raise_for_status()
+                        if response.status_code != 206:
+                            raise RuntimeError(
+                                "RadioID database changed during ranged download"
+                            )
+                        async for chunk in response.aiter_bytes():
+                            buffer += chunk
+                            if len(buffer) >= _SEGMENT_WRITE_BYTES:
+                                await flush()
+                    await flush()
+                    break
+                except httpx.HTTPError as e:
+                    if attempt == self.attempts or not is_retryable(e):
+                        raise
+                    # Keep what arrived, so the retry resumes after it
+                    await flush()
+                    logger.warning(
+                        "Segment %d-%d interrupted (%s), retrying from byte %d",
+                        start,
+                        end,
+                        describe_error(e),
+                        pos,
+                    )
+                    await asyncio.sleep(self.retry.delay(attempt))
+        if pos != end + 1:
+            raise RuntimeError(
+                f"Short read for bytes {start}-{end}: got {pos - start} bytes"
+            )
+
+    async def _download_once(
+        self,
+        dest: Path,
+        part: Path,
+        meta_path: Path,
+        meta: dict,
+        conditional: bool = True,
+    ) -> bool:
+        """Fetch into *part*, resuming if possible. Return False on 304.
+
+        A resume the server cannot satisfy (416) means *part* is already
+        complete when its size matches the reported length; otherwise it is
+        discarded and the file is fetched again with an unconditional GET.
+        """
+        headers: dict[str, str] = {}
+        if conditional and dest.exists():
+            complete = _complete(meta)
+            if complete.get("etag"):
+                headers["If-None-Match"] = complete["etag"]
+            if complete.get("last_modified"):
+                headers["If-Modified-Since"] = complete["last_modified"]
+
+        offset = part.stat().st_size if part.exists() else 0
+        if_range = _if_range(meta.get("partial", {}))
+        if offset and if_range:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = if_range
+            # Byte offsets refer to the decoded file, so ask for it uncompressed
+            headers["Accept-Encoding"] = "identity"
+
+        async with self._client.stream(
+            "GET", self.url, headers=headers, timeout=self.timeout
+        ) as response:
+            if response.status_code == 304:
+                return False
+            if response.status_code == 416 and "Range" in headers:
+                total = _range_total(response.headers.get("Content-Range"))
+                if total == offset:
+                    logger.info("RadioID partial download is already complete")
+                    return True
+                logger.warning(
+                    "RadioID server cannot resume from byte %d, restarting", offset
+                )
+                part.unlink(missing_ok=True)
+                meta.pop("partial", None)
+                _write_meta(meta_path, meta)
+                restart = True
+            else:
+                restart = False
+                response.raise_for_status()
+                if response.status_code == 206:
+                    logger.info("Resuming RadioID download from byte %d", offset)
+                    mode = "ab"
+                else:
+                    mode = "wb"
+                    meta["partial"] = _validators(response.headers)
+                    _write_meta(meta_path, meta)
+                async with aiofiles.open(part, mode) as fh:
+                    async for chunk in response.aiter_bytes():
+                        await fh.write(chunk)
+        if restart:
+            return await self._download_once(
+                dest, part, meta_path, meta, conditional=False
+            )
+        return True
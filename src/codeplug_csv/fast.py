@@ -0,0 +1,183 @@
+"""NumPy-vectorised filter and transform over a RepeaterTable.
+
+Install the ``fast`` extra (pip install codeplug-csv[fast]) to enable it.
+transform_repeaters here filters with whole-column masks and then
+transforms the rows kept, matching filter_repeaters followed by the
+transform in transform.py. It falls back to those when NumPy is missing.
+The output is identical either way.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+from itertools import repeat
+from collections.abc import Mapping, Sequence
+
+from .config import EXCLUDED_TYPES, GATEWAY_TYPES, MAX_NAME_LENGTH
+from .models import AnytoneChannel, Repeater, RepeaterDetail
+from .regions import locator_to_region
+from .table import MODE_ANALOG, MODE_DMR, RepeaterTable
+from . import transform
+from .transform import (
+    _band_label,
+    _clean_callsign,
+    _ctcss_str,
+    _slot_talkgroup,
+)
+
+logger = logging.getLogger(__name__)
+
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+
+def _column(values):
+    """Zero-copy NumPy view of an ``array.array`` column."""
+    return np.frombuffer(values, dtype=values.typecode)
+
+
+def filter_rows(table: RepeaterTable, locator_prefix: str | None = None):
+    """Indices of the rows filter_repeaters would keep, as a NumPy array.
+
+    Status, type and locator rules are decided once per pool entry; each
+    becomes a mask over the row codes.
+    """
+    type_ok = np.array([t not in EXCLUDED_TYPES for t in table.types.values] or [False])
+    mask = _column(table.status) == table.statuses.code("OPERATIONAL")
+    mask &= (_column(table.modes) & (MODE_ANALOG | MODE_DMR)) != 0
+    mask &= type_ok[_column(table.type)]
+    if locator_prefix:
+        prefix = locator_prefix.upper()
+        locator_ok = np.array(
+            [loc.upper().startswith(prefix) for loc in table.locators.values]
+            or [False]
+        )
+        mask &= locator_ok[_column(table.locator)]
+    return np.flatnonzero(mask)
+
+
+def _formatted(values, formatter) -> list[str]:
+    """``formatter(v)`` for every element, calling it once per distinct value."""
+    unique, inverse = np.unique(values, return_inverse=True)
+    labels = np.array([formatter(v) for v in unique.tolist()] or [""], dtype=object)
+    return labels[inverse].tolist()
+
+
+def _lookup(pool_values: list[str], codes) -> list[str]:
+    """The pool string for each code."""
+    return np.array(pool_values or [""], dtype=object)[codes].tolist()
+
+
+def _transform_rows(
+    table: RepeaterTable,
+    rows,
+    power: str = "High",
+    details: Mapping[str, RepeaterDetail] | None = None,
+) -> list[AnytoneChannel]:
+    """The channels transform_repeaters would build for *rows* of *table*.
+
+    Every column of the output is computed as an array; the channels are then
+    built in one pass with positional arguments.
+    """
+    rows = np.asarray(rows, dtype=np.intp)
+    modes = _column(table.modes)[rows]
+    analog = (modes & MODE_ANALOG) != 0
+    dmr = (modes & MODE_DMR) != 0
+
+    # Expand each repeater into FM, TS1 and TS2 channels as present;
+    # kind is 0, 1 or 2 for FM, TS1 and TS2 (and the DMR slot number)
+    counts = analog.astype(np.intp) + 2 * dmr
+    total = int(counts.sum())
+    owner = np.repeat(np.arange(len(rows)), counts)
+    starts = np.cumsum(counts) - counts
+    kind = np.arange(total) - starts[owner] + ~analog[owner]
+    source = rows[owner]
+    fm = kind == 0
+
+    callsign_codes = _column(table.callsign)[source]
+    clean = [_clean_callsign(c) for c in table.callsigns.values]
+    names = (
+        np.array(clean or [""], dtype=object)[callsign_codes]
+        + np.array([" FM", " TS1", " TS2"], dtype=object)[kind]
+    ).tolist()
+    names = [n if len(n) <= MAX_NAME_LENGTH else n[:MAX_NAME_LENGTH] for n in names]
+
+    # API tx = repeater transmits → radio receives
+    rx_freq = _column(table.tx)[source].tolist()
+    tx_freq = _column(table.rx)[source].tolist()
+    ctcss = _formatted(np.where(fm, _column(table.ctcss)[source], 0.0), _ctcss_str)
+    bandwidth = np.where(
+        fm & (_column(table.txbw)[source] >= 25), "25K", "12.5K"
+    ).astype(object)
+    bands = _lookup(
+        [_band_label(b) for b in table.bands.values], _column(table.band)[source]
+    )
+    regions = _lookup(
+        [locator_to_region(loc) for loc in table.locators.values],
+        _column(table.locator)[source],
+    )
+    rpt_types = _lookup(
+        ["GW" if t in GATEWAY_TYPES else "RPT" for t in table.types.values],
+        _column(table.type)[source],
+    )
+    color_code = np.where(fm, 1, _column(table.color_code)[source]).tolist()
+    slot = np.where(fm, 1, kind).tolist()
+    channel_type = np.where(fm, "A-Analog", "D-Digital").astype(object).tolist()
+    mode = np.where(fm, "ANL", "DMR").astype(object).tolist()
+    contact = np.where(fm, "", "Local").astype(object).tolist()
+    contact_id = [0] * total
+    if details:
+        callsigns = table.callsigns.values
+        for j in np.flatnonzero(~fm).tolist():
+            detail = details.get(callsigns[callsign_codes[j]])
+            tg = _slot_talkgroup(detail, slot[j])
+            if tg:
+                contact[j] = (tg.name or f"TG {tg.radio_id}")[:MAX_NAME_LENGTH]
+                contact_id[j] = tg.radio_id
+
+    channels = list(
+        map(
+            AnytoneChannel,
+            names,
+            rx_freq,
+            tx_freq,
+            channel_type,
+            bandwidth.tolist(),
+            ctcss,
+            ctcss,
+            repeat(power, total),
+            color_code,
+            slot,
+            contact,
+            repeat("Group Call", total),
+            contact_id,
+            repeat("Off", total),
+            bands,
+            mode,
+            regions,
+            rpt_types,
+        )
+    )
+    logger.info("Generated %d channels", len(channels))
+    return channels
+
+
+def transform_repeaters(
+    repeaters: Sequence[Repeater],
+    power: str = "High",
+    details: Mapping[str, RepeaterDetail] | None = None,
+    locator_prefix: str | None = None,
+) -> list[AnytoneChannel]:
+    """Vectorised filter_repeaters and transform.transform_repeaters.
+
+    Repeaters the filter drops make no channels, so already-filtered input
+    is transformed unchanged.
+    """
+    if not NUMPY_AVAILABLE:
+        filtered = transform.iter_filtered(repeaters, locator_prefix)
+        return transform.transform_repeaters(filtered, power, details)
+    table = RepeaterTable.from_repeaters(repeaters)
+    return _transform_rows(table, filter_rows(table, locator_prefix), power, details)
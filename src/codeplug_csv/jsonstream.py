@@ -0,0 +1,106 @@
+"""Incremental parsing of a JSON array nested in a streamed response body."""
+
+from __future__ import annotations
+
+import codecs
+import json
+from collections.abc import AsyncIterator
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+class _Buffer:
+    """Decoded text received so far, refilled from an async byte stream."""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self) -> bool:
+        """Append the next chunk, dropping consumed text. Return False at EOF."""
+        if self.eof:
+            return False
+        self.text = self.text[self.pos :]
+        self.pos = 0
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.text += self._decoder.decode(b"", final=True)
+            self.eof = True
+            return False
+        self.text += self._decoder.decode(chunk)
+        return True
+
+    async def skip_ws(self) -> str:
+        """Skip whitespace and return the next character ('' at EOF)."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not await self.fill():
+                return ""
+
+    async def expect(self, char: str) -> None:
+        if await self.skip_ws() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of JSON stream")
+        self.pos += 1
+
+    async def value(self):
+        """Decode one complete JSON value, reading more data as needed."""
+        await self.skip_ws()
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if await self.fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.text) and not self.eof and await self.fill():
+                continue
+            self.pos = end
+            return obj
+
+
+async def iter_array_items(
+    chunks: AsyncIterator[bytes], key: str = "data"
+) -> AsyncIterator:
+    """Yield the elements of the array under top-level *key* as they arrive.
+
+    Only one element (plus any unconsumed tail of the current chunk) is held
+    in memory at a time. Yields nothing if *key* is absent or null.
+    """
+    buf = _Buffer(chunks)
+    await buf.expect("{")
+    if await buf.skip_ws() == "}":
+        return
+    while True:
+        name = await buf.value()
+        await buf.expect(":")
+        if name == key:
+            if await buf.skip_ws() != "[":
+                await buf.value()
+                return
+            buf.pos += 1
+            if await buf.skip_ws() == "]":
+                return
+            while True:
+                yield await buf.value()
+                sep = await buf.skip_ws()
+                buf.pos += 1
+                if sep == "]":
+                    return
+                if sep != ",":
+                    raise ValueError(f"Malformed JSON array under {key!r}")
+        await buf.value()
+        sep = await buf.skip_ws()
+        buf.pos += 1
+        if sep == "}":
+            return
+        if sep != ",":
+            raise ValueError("Malformed JSON object in stream")
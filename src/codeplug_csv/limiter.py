@@ -0,0 +1,125 @@
+"""Adaptive (AIMD) concurrency limit for API requests."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from .config import (
+    ADAPTIVE_CONCURRENCY,
+    ADAPTIVE_LATENCY_TOLERANCE,
+    ADAPTIVE_MAX_CONCURRENT,
+    MAX_CONCURRENT,
+)
+from .retry import is_retryable
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that grows while latency is flat and halves on overload.
+
+    Each successful request adds ``1 / limit`` (about one slot per round of
+    requests). A throttling or server error (429, 5xx, timeouts), or a
+    latency above *latency_tolerance* times the best recent latency, scales
+    the limit by *decrease*, once per congestion event: requests that
+    started before the last decrease were sent at the old limit, so their
+    failures do not cut it again. The limit stays within
+    ``[min_limit, max_limit]``; pass equal bounds for a fixed limit.
+    *max_limit* defaults to ``ADAPTIVE_MAX_CONCURRENT`` or *initial*,
+    whichever is higher.
+    """
+
+    def __init__(
+        self,
+        initial: int = MAX_CONCURRENT,
+        min_limit: int = 1,
+        max_limit: int | None = None,
+        decrease: float = 0.5,
+        latency_tolerance: float = ADAPTIVE_LATENCY_TOLERANCE,
+    ):
+        if max_limit is None:
+            max_limit = max(ADAPTIVE_MAX_CONCURRENT, initial)
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.initial = int(self.limit)
+        self.peak = self.initial
+        self.low = self.initial
+        self.decreases = 0
+        self._in_flight = 0
+        self._baseline: float | None = None
+        self._last_decrease = float("-inf")
+        self._condition = asyncio.Condition()
+
+    @classmethod
+    def from_config(cls, initial: int = MAX_CONCURRENT) -> AdaptiveLimiter:
+        """A limiter honouring ``CODEPLUG_CSV_ADAPTIVE_CONCURRENCY``."""
+        if not ADAPTIVE_CONCURRENCY:
+            return cls(initial, min_limit=initial, max_limit=initial)
+        return cls(initial)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one unit of concurrency for the enclosed request."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            if is_retryable(e):
+                self._shrink("overload", start)
+            raise
+        else:
+            self._observe(start, time.perf_counter() - start)
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def _observe(self, start: float, latency: float) -> None:
+        if self._baseline is None or latency < self._baseline:
+            self._baseline = latency
+        else:
+            # Let the baseline drift up slowly so one lucky response does not
+            # pin it below what the server can sustain
+            self._baseline += (latency - self._baseline) * 0.05
+        if latency > self.latency_tolerance * self._baseline:
+            self._shrink("rising latency", start)
+            return
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self.peak = max(self.peak, int(self.limit))
+
+    def _shrink(self, reason: str, start: float) -> None:
+        if start < self._last_decrease:
+            return
+        previous = int(self.limit)
+        self.limit = max(self.min_limit, self.limit * self.decrease)
+        self._last_decrease = time.perf_counter()
+        if int(self.limit) < previous:
+            self.decreases += 1
+            logger.debug(
+                "Concurrency limit %d -> %d (%s)", previous, int(self.limit), reason
+            )
+        self.low = min(self.low, int(self.limit))
+
+    def stats(self) -> dict[str, int]:
+        """Initial, final, highest and lowest limit, and number of decreases."""
+        return {
+            "initial": self.initial,
+            "final": int(self.limit),
+            "peak": self.peak,
+            "low": self.low,
+            "decreases": self.decreases,
+        }
@@ -3,21 +3,51 @@
 from __future__ import annotations
 
 import aiofiles
+import asyncio
 import csv
+import hashlib
+import io
+import json
 import logging
+import multiprocessing
+import os
+import tempfile
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import accumulate, chain, islice
 from pathlib import Path
 
 from .config import (
     ANALOG_DEFAULTS,
     CHANNEL_COLUMNS,
+    CONTACT_CHUNK_BYTES,
+    CONTACT_WORKERS,
+    DEDUP_CONTACTS,
+    DIGITAL_CONTACT_COLUMNS,
     DIGITAL_DEFAULTS,
     TALKGROUP_COLUMNS,
     ZONE_COLUMNS,
 )
 from .models import AnytoneChannel, AnytoneZone, TalkGroup
+from .zones import zone_key, zone_parts
 
 logger = logging.getLogger(__name__)
 
+# Rows rendered between writes, bounding the text held in memory
+_WRITE_BATCH_ROWS = 1000
+
+
+# Channels share a few hundred frequencies between them, so each is
+# formatted once
+@lru_cache(maxsize=None)
+def _hz_to_mhz(hz: int) -> str:
+    """Format a frequency in Hz as MHz to 5 decimal places, exactly."""
+    tens = (hz + 5) // 10
+    return f"{tens // 100_000}.{tens % 100_000:05d}"
+
 
 def _channel_row(number: int, ch: AnytoneChannel) -> dict[str, str]:
     """Build a full row dict with all columns for a single channel."""
@@ -28,8 +58,8 @@ def _channel_row(number: int, ch: AnytoneChannel) -> dict[str, str]:
 
     row["No."] = str(number)
     row["Channel Name"] = ch.name
-    row["Receive Frequency"] = ch.rx_freq
-    row["Transmit Frequency"] = ch.tx_freq
+    row["Receive Frequency"] = _hz_to_mhz(ch.rx_freq)
+    row["Transmit Frequency"] = _hz_to_mhz(ch.tx_freq)
     row["Channel Type"] = ch.channel_type
     row["Transmit Power"] = ch.power
     row["Band Width"] = ch.bandwidth
@@ -45,10 +75,56 @@ def _channel_row(number: int, ch: AnytoneChannel) -> dict[str, str]:
     return row
 
 
-def _rows_to_csv(fieldnames: list[str], rows: list[dict[str, str]]) -> str:
-    """Render a list of row dicts to a CSV string."""
-    import io
+def _zone_row(number: int, name: str, members: list[str]) -> dict[str, str]:
+    """Build a Zone.CSV row; the first member is selected on both VFOs."""
+    first = members[0] if members else ""
+    return {
+        "No.": str(number),
+        "Zone Name": name,
+        "Zone Channel Member": "|".join(members),
+        "A Channel": first,
+        "B Channel": first,
+    }
+
+
+def _digest(path: Path) -> bytes:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 16):
+            h.update(chunk)
+    return h.digest()
+
+
+def _temp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.tmp")
+
+
+def _replace_if_changed(tmp: Path, path: Path) -> bool:
+    """Move *tmp* over *path* unless their contents hash the same.
 
+    Leaving an unchanged file alone keeps its mtime, so tools that sync or
+    import the outputs only see the files that actually changed.
+    """
+    if (
+        path.exists()
+        and path.stat().st_size == tmp.stat().st_size
+        and _digest(path) == _digest(tmp)
+    ):
+        tmp.unlink()
+        logger.info("%s unchanged, not rewritten", path.name)
+        return False
+    os.replace(tmp, path)
+    return True
+
+
+def _signature(path: Path) -> str:
+    """Size and modification time of *path*, which change when it is rewritten."""
+    stat = path.stat()
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _rows_to_csv(fieldnames: list[str], rows: Iterable[dict[str, str]]) -> str:
+    """Render row dicts to a CSV string."""
     buf = io.StringIO()
     writer = csv.DictWriter(buf, fieldnames=fieldnames, quoting=csv.QUOTE_ALL)
     writer.writeheader()
@@ -57,47 +133,66 @@ def _rows_to_csv(fieldnames: list[str], rows: list[dict[str, str]]) -> str:
     return buf.getvalue()
 
 
-async def write_channels(channels: list[AnytoneChannel], output_dir: Path) -> Path:
+async def _write_csv(
+    path: Path, fieldnames: list[str], rows: Iterable[dict[str, str]]
+) -> int:
+    """Write *rows* to *path* as they are produced. Returns the row count.
+
+    The file is only replaced if its content changed.
+    """
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=fieldnames, quoting=csv.QUOTE_ALL)
+    writer.writeheader()
+    count = 0
+    tmp = _temp_path(path)
+    async with aiofiles.open(tmp, "w", encoding="utf-8") as f:
+        for count, row in enumerate(rows, start=1):
+            writer.writerow(row)
+            if count % _WRITE_BATCH_ROWS == 0:
+                await f.write(buf.getvalue())
+                buf.seek(0)
+                buf.truncate()
+        await f.write(buf.getvalue())
+    await asyncio.to_thread(_replace_if_changed, tmp, path)
+    return count
+
+
+async def write_channels(
+    channels: Iterable[AnytoneChannel], output_dir: Path
+) -> Path:
     """Write Channel.CSV with all required columns."""
     path = output_dir / "Channel.CSV"
-    rows = [_channel_row(i, ch) for i, ch in enumerate(channels, start=1)]
-    content = _rows_to_csv(CHANNEL_COLUMNS, rows)
-    async with aiofiles.open(path, "w", encoding="utf-8") as f:
-        await f.write(content)
-    logger.info("Wrote %d channels to %s", len(channels), path)
+    count = await _write_csv(
+        path,
+        CHANNEL_COLUMNS,
+        (_channel_row(i, ch) for i, ch in enumerate(channels, start=1)),
+    )
+    logger.info("Wrote %d channels to %s", count, path)
     return path
 
 
-async def write_zones(zones: list[AnytoneZone], output_dir: Path) -> Path:
+async def write_zones(zones: Iterable[AnytoneZone], output_dir: Path) -> Path:
     """Write Zone.CSV."""
     path = output_dir / "Zone.CSV"
-    rows: list[dict[str, str]] = []
-    for i, zone in enumerate(zones, start=1):
-        members = "|".join(ch.name for ch in zone.channels)
-        a_channel = zone.channels[0].name if zone.channels else ""
-        b_channel = zone.channels[0].name if zone.channels else ""
-        rows.append(
-            {
-                "No.": str(i),
-                "Zone Name": zone.name,
-                "Zone Channel Member": members,
-                "A Channel": a_channel,
-                "B Channel": b_channel,
-            }
-        )
-    content = _rows_to_csv(ZONE_COLUMNS, rows)
-    async with aiofiles.open(path, "w", encoding="utf-8") as f:
-        await f.write(content)
-    logger.info("Wrote %d zones to %s", len(zones), path)
+    count = await _write_csv(
+        path,
+        ZONE_COLUMNS,
+        (
+            _zone_row(i, zone.name, [ch.name for ch in zone.channels])
+            for i, zone in enumerate(zones, start=1)
+        ),
+    )
+    logger.info("Wrote %d zones to %s", count, path)
     return path
 
 
-async def write_talkgroups(talkgroups: list[TalkGroup], output_dir: Path) -> Path:
-    """Write TalkGroups.CSV from a list of TalkGroup objects."""
+async def write_talkgroups(talkgroups: Iterable[TalkGroup], output_dir: Path) -> Path:
+    """Write TalkGroups.CSV from TalkGroup objects."""
     path = output_dir / "TalkGroups.CSV"
-    rows: list[dict[str, str]] = []
-    for i, tg in enumerate(talkgroups, start=1):
-        rows.append(
+    count = await _write_csv(
+        path,
+        TALKGROUP_COLUMNS,
+        (
             {
                 "No.": str(i),
                 "Radio ID": str(tg.radio_id),
@@ -105,9 +200,347 @@ async def write_talkgroups(talkgroups: list[TalkGroup], output_dir: Path) -> Pat
                 "Call Type": tg.call_type,
                 "Call Alert": tg.call_alert,
             }
+            for i, tg in enumerate(talkgroups, start=1)
+        ),
+    )
+    logger.info("Wrote %d talkgroups to %s", count, path)
+    return path
+
+
+# ---------- Streaming Channel.CSV and Zone.CSV ----------
+
+
+class _ZoneSpool:
+    """One repeater zone group's channel rows and names, spooled to disk."""
+
+    def __init__(self) -> None:
+        # newline="" keeps the csv module's \r\n row endings intact
+        self.rows = tempfile.TemporaryFile("w+", encoding="utf-8", newline="")
+        self.names = tempfile.TemporaryFile("w+", encoding="utf-8", newline="")
+        self.writer = csv.DictWriter(
+            self.rows,
+            fieldnames=CHANNEL_COLUMNS[1:],
+            quoting=csv.QUOTE_ALL,
+            extrasaction="ignore",
+        )
+        self.count = 0
+
+    def add(self, ch: AnytoneChannel) -> None:
+        self.writer.writerow(_channel_row(0, ch))
+        self.names.write(ch.name + "\n")
+        self.count += 1
+
+    def rewind(self) -> None:
+        self.rows.seek(0)
+        self.names.seek(0)
+
+    def close(self) -> None:
+        self.rows.close()
+        self.names.close()
+
+
+def stream_codeplug(
+    channels: Iterable[AnytoneChannel],
+    static_zones: list[AnytoneZone],
+    output_dir: Path,
+) -> tuple[int, int]:
+    """Zone repeater *channels* and write Channel.CSV and Zone.CSV in one pass.
+
+    Gives the same files as assign_zones followed by write_channels and
+    write_zones, with *static_zones* first. Each channel's row is rendered
+    as it arrives and spooled to a temporary file for its zone group; the
+    groups are then copied out in zone order. Memory use does not grow with
+    the number of channels. Files whose content is unchanged are not
+    rewritten. Returns the channel and zone counts.
+    """
+    spools: dict[str, _ZoneSpool] = {}
+    channel_path = output_dir / "Channel.CSV"
+    zone_path = output_dir / "Zone.CSV"
+    try:
+        for ch in channels:
+            spool = spools.get(key := zone_key(ch))
+            if spool is None:
+                spool = spools[key] = _ZoneSpool()
+            spool.add(ch)
+
+        with (
+            open(
+                _temp_path(channel_path), "w", encoding="utf-8", newline=""
+            ) as channel_file,
+            open(_temp_path(zone_path), "w", encoding="utf-8", newline="") as zone_file,
+        ):
+            channel_file.write(_rows_to_csv(CHANNEL_COLUMNS, []))
+            channel_writer = csv.DictWriter(
+                channel_file, fieldnames=CHANNEL_COLUMNS, quoting=csv.QUOTE_ALL
+            )
+            zone_writer = csv.DictWriter(
+                zone_file, fieldnames=ZONE_COLUMNS, quoting=csv.QUOTE_ALL
+            )
+            zone_writer.writeheader()
+            count = 0
+            zone_count = 0
+            for zone in static_zones:
+                for ch in zone.channels:
+                    count += 1
+                    channel_writer.writerow(_channel_row(count, ch))
+                zone_count += 1
+                zone_writer.writerow(
+                    _zone_row(zone_count, zone.name, [ch.name for ch in zone.channels])
+                )
+            for key in sorted(spools):
+                spool = spools[key]
+                spool.rewind()
+                for name, start, end in zone_parts(key, spool.count):
+                    members = [
+                        line.rstrip("\n") for line in islice(spool.names, end - start)
+                    ]
+                    channel_file.writelines(
+                        f'"{n}",{line}'
+                        for n, line in enumerate(
+                            islice(spool.rows, end - start), start=count + 1
+                        )
+                    )
+                    count += end - start
+                    zone_count += 1
+                    zone_writer.writerow(_zone_row(zone_count, name, members))
+    finally:
+        for spool in spools.values():
+            spool.close()
+    _replace_if_changed(_temp_path(channel_path), channel_path)
+    _replace_if_changed(_temp_path(zone_path), zone_path)
+    logger.info("Wrote %d channels to %s", count, channel_path)
+    logger.info("Wrote %d zones to %s", zone_count, zone_path)
+    return count, zone_count
+
+
+# ---------- DigitalContactList.CSV ----------
+
+# RadioID user.csv columns feeding each Anytone column after "No."
+_RADIOID_COLUMNS = (
+    "RADIO_ID",
+    "CALLSIGN",
+    "FIRST_NAME",
+    "LAST_NAME",
+    "CITY",
+    "STATE",
+    "COUNTRY",
+)
+
+# DMR IDs are 24-bit, so a 2 MiB bitmap remembers every ID seen
+_ID_BITMAP_SIZE = 1 << 24
+
+# Bytes read at a time while finding chunk boundaries
+_SCAN_BLOCK_BYTES = 1 << 20
+
+
+def _contact_columns(header: str) -> tuple[int, ...]:
+    """Index of each RadioID column in *header*, or -1 when absent."""
+    names = [name.strip().upper() for name in next(csv.reader([header]))]
+    return tuple(names.index(col) if col in names else -1 for col in _RADIOID_COLUMNS)
+
+
+def _convert_contacts_chunk(
+    src: Path, start: int, end: int, columns: tuple[int, ...]
+) -> tuple[array, str, array]:
+    """Convert the user.csv rows in bytes *start*..*end* to Anytone rows.
+
+    Returns the radio IDs, the rendered rows without their "No." column or
+    line ending, concatenated, and the offset where each row ends. The
+    caller fills in the numbers so chunks can be converted independently.
+    Runs in a worker process in parallel mode, where one string and two
+    arrays pickle far faster than a list of row strings.
+    """
+    with open(src, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8", errors="replace")
+    ids = array("q")
+    rows = []
+    id_col, call_col, first_col, last_col, city_col, state_col, country_col = columns
+    width = max(columns) + 1
+    # newline="" keeps Unicode line breaks inside fields (U+2028, U+0085...)
+    for fields in csv.reader(io.StringIO(text, newline="")):
+        if len(fields) < width:
+            continue
+        try:
+            radio_id = int(fields[id_col])
+        except ValueError:
+            continue
+        name = " ".join(
+            part
+            for part in (
+                fields[first_col].strip() if first_col >= 0 else "",
+                fields[last_col].strip() if last_col >= 0 else "",
+            )
+            if part
+        )
+        rows.append(
+            (
+                radio_id,
+                fields[call_col].strip() if call_col >= 0 else "",
+                name,
+                fields[city_col].strip() if city_col >= 0 else "",
+                fields[state_col].strip() if state_col >= 0 else "",
+                fields[country_col].strip() if country_col >= 0 else "",
+                "",
+                "Private Call",
+                "None",
+            )
         )
-    content = _rows_to_csv(TALKGROUP_COLUMNS, rows)
-    async with aiofiles.open(path, "w", encoding="utf-8") as f:
-        await f.write(content)
-    logger.info("Wrote %d talkgroups to %s", len(talkgroups), path)
+        ids.append(radio_id)
+    buf = io.StringIO()
+    writer = csv.writer(buf, quoting=csv.QUOTE_ALL, lineterminator="")
+    ends = array("q", accumulate(map(writer.writerow, rows)))
+    return ids, buf.getvalue(), ends
+
+
+def _spawn_pool(workers: int) -> ProcessPoolExecutor:
+    """A pool of *workers* processes for CPU-bound steps of the async pipeline."""
+    # spawn: forking a process that runs an event loop and threads is unsafe
+    context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(workers, mp_context=context)
+
+
+def _available_cpus() -> int:
+    """CPUs this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _chunk_bounds(src: Path, start: int, chunk_bytes: int) -> list[tuple[int, int]]:
+    """Split *src* from *start* into record-aligned ranges of about *chunk_bytes*.
+
+    A newline only ends a record outside a quoted field. Quotes are counted
+    from *start* (an escaped ``""`` leaves the count's parity alone), so a
+    field with a line break in it is never split between two ranges.
+    """
+    bounds = []
+    with open(src, "rb") as f:
+        f.seek(start)
+        begin = start  # Start of the range being measured
+        pos = start  # File offset of block[0]
+        quoted = False  # Inside a quoted field at block[i]
+        while block := f.read(_SCAN_BLOCK_BYTES):
+            i = 0
+            while True:
+                nl = block.find(b"\n", max(i, begin + chunk_bytes - pos))
+                if nl < 0:
+                    break
+                quoted ^= block.count(b'"', i, nl) & 1
+                i = nl + 1
+                if not quoted:
+                    bounds.append((begin, pos + i))
+                    begin = pos + i
+            quoted ^= block.count(b'"', i) & 1
+            pos += len(block)
+    if begin < pos:
+        bounds.append((begin, pos))
+    return bounds
+
+
+async def write_digital_contacts(
+    src: Path,
+    output_dir: Path,
+    dedup: bool = DEDUP_CONTACTS,
+    workers: int = CONTACT_WORKERS,
+    chunk_bytes: int = CONTACT_CHUNK_BYTES,
+) -> Path:
+    """Convert a RadioID user.csv to DigitalContactList.CSV.
+
+    The file is converted in chunks of about *chunk_bytes* and written as
+    each finishes, so memory use is bounded by the chunk size rather than the
+    database. With *workers* > 1 chunks are converted in a process pool,
+    at most two per worker in flight; *workers* is capped at the CPUs
+    available, since extra processes only add start-up and hand-off cost.
+    With *dedup* only the first row for each radio ID is kept.
+
+    The output is written through a temporary file and only replaced if its
+    content changed. If *src* and the output are as the last conversion left
+    them, nothing is converted at all.
+    """
+    path = output_dir / "DigitalContactList.CSV"
+    stamp_path = path.with_name(f".{path.name}.source")
+    stamp = {"source": _signature(src), "dedup": dedup}
+    try:
+        previous = json.loads(stamp_path.read_text(encoding="utf-8"))
+        if previous == {**stamp, "output": _signature(path)}:
+            logger.info("%s unchanged since the last run, not converted", src.name)
+            return path
+    except (OSError, ValueError):
+        pass
+
+    with open(src, "rb") as f:
+        header = f.readline().decode("utf-8", errors="replace")
+        body_start = f.tell()
+    columns = _contact_columns(header)
+    if columns[0] < 0:
+        raise ValueError(f"{src} has no RADIO_ID column")
+    bounds = await asyncio.to_thread(
+        _chunk_bounds, src, body_start, max(1, chunk_bytes)
+    )
+    if workers > 1:
+        cpus = _available_cpus()
+        if workers > cpus:
+            logger.info("Using %d of %d contact workers, one per CPU", cpus, workers)
+            workers = cpus
+
+    seen = bytearray(_ID_BITMAP_SIZE // 8) if dedup else None
+    seen_large: set[int] = set()
+    count = 0
+    duplicates = 0
+
+    tmp = _temp_path(path)
+    async with aiofiles.open(tmp, "w", encoding="utf-8", newline="") as out:
+        await out.write(_rows_to_csv(DIGITAL_CONTACT_COLUMNS, []))
+
+        async def emit(ids: array, text: str, ends: array) -> None:
+            nonlocal count, duplicates
+            rows = []
+            for radio_id, begin, end in zip(ids, chain((0,), ends), ends):
+                if seen is not None:
+                    if 0 <= radio_id < _ID_BITMAP_SIZE:
+                        byte, bit = divmod(radio_id, 8)
+                        if seen[byte] >> bit & 1:
+                            duplicates += 1
+                            continue
+                        seen[byte] |= 1 << bit
+                    elif radio_id in seen_large:
+                        duplicates += 1
+                        continue
+                    else:
+                        seen_large.add(radio_id)
+                count += 1
+                rows.append(f'"{count}",{text[begin:end]}\r\n')
+            await out.write("".join(rows))
+
+        if workers > 1 and len(bounds) > 1:
+            loop = asyncio.get_running_loop()
+            with _spawn_pool(workers) as pool:
+                pending: deque[asyncio.Future] = deque()
+                for start, end in bounds:
+                    pending.append(
+                        loop.run_in_executor(
+                            pool, _convert_contacts_chunk, src, start, end, columns
+                        )
+                    )
+                    if len(pending) >= workers * 2:
+                        await emit(*await pending.popleft())
+                while pending:
+                    await emit(*await pending.popleft())
+        else:
+            for start, end in bounds:
+                await emit(
+                    *await asyncio.to_thread(
+                        _convert_contacts_chunk, src, start, end, columns
+                    )
+                )
+
+    await asyncio.to_thread(_replace_if_changed, tmp, path)
+    stamp_path.write_text(
+        json.dumps({**stamp, "output": _signature(path)}), encoding="utf-8"
+    )
+    if duplicates:
+        logger.info("Dropped %d duplicate radio IDs", duplicates)
+    logger.info("Wrote %d digital contacts to %s", count, path)
     return path
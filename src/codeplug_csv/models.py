@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Annotated
+
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -33,30 +37,132 @@ class TalkGroupModel(BaseModel):
     call_alert: str = "None"
 
 
-@dataclass
+def _intern_fields(obj: object, names: tuple[str, ...]) -> None:
+    """Intern the enum-like string fields *names* of a frozen dataclass.
+
+    Values such as "OPERATIONAL" or "Group Call" repeat across every record;
+    interning makes all records share one string object per distinct value.
+    """
+    for name in names:
+        value = getattr(obj, name)
+        if type(value) is str:
+            object.__setattr__(obj, name, sys.intern(value))
+
+
+# Bits of Repeater.caps, decoded once from the RSGB modeCodes
+CAP_ANALOG = 1  # "A": FM
+CAP_DMR = 2  # "M" or "M:<color code>"
+CAP_OTHER = 4  # anything else, e.g. "D" (D-STAR) or "F" (Fusion)
+
+
+def _extract_color_code(mode_codes: list[str] | tuple[str, ...]) -> int:
+    """Extract DMR color code from modeCodes.
+
+    'M:3' → 3, bare 'M' → 1 (default).
+    """
+    for mc in mode_codes:
+        if mc.startswith("M:"):
+            try:
+                return int(mc.split(":")[1])
+            except (IndexError, ValueError):
+                pass
+    return 1
+
+
+@lru_cache(maxsize=None)
+def decode_mode_codes(mode_codes: tuple[str, ...]) -> tuple[int, int]:
+    """``CAP_*`` flags and DMR color code for a repeater's modeCodes.
+
+    Only a handful of distinct mode code lists exist, so results are cached.
+    """
+    caps = 0
+    for mc in mode_codes:
+        if mc == "A":
+            caps |= CAP_ANALOG
+        elif mc == "M" or mc.startswith("M:"):
+            caps |= CAP_DMR
+        else:
+            caps |= CAP_OTHER
+    return caps, _extract_color_code(mode_codes)
+
+
+@dataclass(frozen=True, slots=True)
 class Repeater:
-    """Raw repeater record from the RSGB API."""
+    """Raw repeater record from the RSGB API.
+
+    The ``Field`` annotations mirror RepeaterModel so the API payload can be
+    validated straight into this dataclass with a pydantic TypeAdapter.
+    """
+
+    __pydantic_config__ = ConfigDict(populate_by_name=True)
 
-    repeater: str  # callsign, e.g. "GB3CD-L"
-    tx: int  # repeater TX frequency in Hz
-    rx: int  # repeater RX frequency in Hz
-    band: str  # e.g. "2M", "70CM"
-    mode_codes: list[str] = field(default_factory=list)  # e.g. ["A", "M:3"]
+    repeater: Annotated[str, Field(default="")]  # callsign, e.g. "GB3CD-L"
+    tx: Annotated[int, Field(default=0)]  # repeater TX frequency in Hz
+    rx: Annotated[int, Field(default=0)]  # repeater RX frequency in Hz
+    band: Annotated[str, Field(default="")]  # e.g. "2M", "70CM"
+    mode_codes: Annotated[list[str], Field(alias="modeCodes")] = field(
+        default_factory=list
+    )  # e.g. ["A", "M:3"]
     ctcss: float = 0.0
     txbw: float = 12.5
     town: str = ""
     status: str = ""
     type: str = ""
     locator: str = ""
+    # Decoded from mode_codes; every later stage reads these instead
+    caps: int = field(default=0, init=False, repr=False, compare=False)
+    color_code: int = field(default=1, init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        _intern_fields(self, ("band", "status", "type"))
+        object.__setattr__(
+            self, "mode_codes", [sys.intern(mc) for mc in self.mode_codes]
+        )
+        caps, color_code = decode_mode_codes(tuple(self.mode_codes))
+        object.__setattr__(self, "caps", caps)
+        object.__setattr__(self, "color_code", color_code)
 
-@dataclass
+    def to_row(self) -> dict:
+        """The constructor arguments, for caching and archives."""
+        return {name: getattr(self, name) for name in REPEATER_FIELDS}
+
+
+# Fields accepted by Repeater(); caps and color_code are derived
+REPEATER_FIELDS = tuple(f.name for f in fields(Repeater) if f.init)
+
+
+@dataclass(frozen=True, slots=True)
+class SlotTalkGroup:
+    """A static talkgroup carried on one timeslot of a DMR repeater."""
+
+    __pydantic_config__ = ConfigDict(populate_by_name=True)
+
+    radio_id: Annotated[int, Field(alias="id")]
+    slot: int = 1
+    name: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class RepeaterDetail:
+    """Per-repeater detail record from the RSGB API."""
+
+    __pydantic_config__ = ConfigDict(populate_by_name=True)
+
+    callsign: str = ""
+    keeper: str = ""
+    networks: list[str] = field(default_factory=list)  # e.g. ["BrandMeister"]
+    talkgroups: list[SlotTalkGroup] = field(default_factory=list)
+
+
+# Not frozen: frozen __init__ sets each field through object.__setattr__,
+# which triples the cost of building channel lists
+@dataclass(slots=True)
 class AnytoneChannel:
     """A single channel row for Anytone Channel.CSV."""
 
     name: str  # max 16 chars
-    rx_freq: str  # MHz, 5 decimal places (radio receives = repeater TX)
-    tx_freq: str  # MHz, 5 decimal places (radio transmits = repeater RX)
+    rx_freq: int  # Hz (radio receives = repeater TX)
+    tx_freq: int  # Hz (radio transmits = repeater RX)
     channel_type: str  # "A-Analog" or "D-Digital"
     bandwidth: str = "12.5K"
     ctcss_encode: str = "Off"
@@ -66,6 +172,7 @@ class AnytoneChannel:
     slot: int = 1
     contact: str = ""
     contact_call_type: str = "Group Call"
+    contact_id: int = 0  # DMR ID of the contact, when it came from repeater detail
     tx_prohibit: str = "Off"
     # For zone assignment
     band: str = ""  # "2m" or "70cm"
@@ -74,7 +181,7 @@ class AnytoneChannel:
     rpt_type: str = ""  # "RPT" or "GW"
 
 
-@dataclass
+@dataclass(slots=True)
 class AnytoneZone:
     """A zone for Anytone Zone.CSV."""
 
@@ -82,7 +189,7 @@ class AnytoneZone:
     channels: list[AnytoneChannel] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TalkGroup:
     """A DMR talkgroup for TalkGroups.CSV."""
 
@@ -90,3 +197,6 @@ class TalkGroup:
     radio_id: int
     call_type: str = "Group Call"
     call_alert: str = "None"
+
+    def __post_init__(self):
+        _intern_fields(self, ("call_type", "call_alert"))
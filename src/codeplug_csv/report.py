@@ -0,0 +1,61 @@
+"""Per-stage timing report for a codeplug build."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Awaitable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class RunReport:
+    """Wall-clock durations of pipeline stages and milestones since start.
+
+    ``limits`` holds the observed adaptive concurrency limits per API.
+    """
+
+    started: float = field(default_factory=time.perf_counter)
+    stages: dict[str, float] = field(default_factory=dict)
+    milestones: dict[str, float] = field(default_factory=dict)
+    limits: dict[str, dict[str, int]] = field(default_factory=dict)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block and record it under *name*."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = time.perf_counter() - start
+
+    async def timed(self, name: str, awaitable: Awaitable[T]) -> T:
+        """Await *awaitable* and record its duration under *name*."""
+        with self.stage(name):
+            return await awaitable
+
+    def mark(self, name: str) -> None:
+        """Record the elapsed time since start under *name*."""
+        self.milestones[name] = time.perf_counter() - self.started
+
+    def log(self) -> None:
+        for name, secs in self.stages.items():
+            logger.info("Stage %-18s %8.3fs", name, secs)
+        for name, secs in self.milestones.items():
+            logger.info("Reached %-16s %8.3fs", name, secs)
+        for name, limit in self.limits.items():
+            logger.info(
+                "Concurrency %-12s initial %d, final %d, range %d-%d, %d decreases",
+                name,
+                limit["initial"],
+                limit["final"],
+                limit["low"],
+                limit["peak"],
+                limit["decreases"],
+            )
@@ -0,0 +1,165 @@
+"""Retry with jittered exponential backoff, per-request deadlines and hedging."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+import httpx
+
+from .config import (
+    HEDGE_PERCENTILE,
+    REQUEST_DEADLINE,
+    RETRY_ATTEMPTS,
+    RETRY_BACKOFF,
+    RETRY_MAX_BACKOFF,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Statuses worth retrying: rate limiting and server-side failures
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often, how patiently and how aggressively to repeat a request."""
+
+    attempts: int = RETRY_ATTEMPTS
+    backoff: float = RETRY_BACKOFF
+    max_backoff: float = RETRY_MAX_BACKOFF
+    deadline: float = REQUEST_DEADLINE
+    hedge_percentile: float = HEDGE_PERCENTILE
+    hedge_min_samples: int = 5
+
+    def delay(self, attempt: int) -> float:
+        """Full-jitter backoff before retry number *attempt* (1-based)."""
+        cap = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Transport failures, timeouts, 429 and 5xx responses are transient."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRY_STATUSES
+    return isinstance(exc, (httpx.TransportError, asyncio.TimeoutError))
+
+
+class LatencyTracker:
+    """Rolling window of successful request latencies."""
+
+    def __init__(self, size: int = 100):
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float) -> float:
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
+
+
+async def _first_success(tasks: list[asyncio.Task]):
+    """Result of the first task to succeed, or the last error if all fail."""
+    pending = set(tasks)
+    error: BaseException | None = None
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is None:
+                return task.result()
+            error = task.exception()
+    raise error
+
+
+async def _hedged(
+    call: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    tracker: LatencyTracker | None,
+    description: str,
+) -> T:
+    start = time.perf_counter()
+    tasks = [asyncio.ensure_future(call())]
+    try:
+        if (
+            tracker is not None
+            and policy.hedge_percentile > 0
+            and len(tracker) >= policy.hedge_min_samples
+        ):
+            threshold = tracker.percentile(policy.hedge_percentile)
+            done, _ = await asyncio.wait(tasks, timeout=threshold)
+            if not done:
+                logger.debug(
+                    "Hedging %s after %.3fs (p%g)",
+                    description,
+                    threshold,
+                    policy.hedge_percentile,
+                )
+                tasks.append(asyncio.ensure_future(call()))
+        result = await _first_success(tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    if tracker is not None:
+        tracker.record(time.perf_counter() - start)
+    return result
+
+
+async def call_with_retry(
+    call: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    tracker: LatencyTracker | None = None,
+    description: str = "request",
+) -> T:
+    """Await ``call()``, retrying transient failures according to *policy*.
+
+    *call* must start a fresh request each time it is invoked. With a
+    *tracker* and ``hedge_percentile`` set, a duplicate request is started
+    once the first has run longer than that percentile of recent latencies,
+    and whichever succeeds first wins.
+    """
+
+    async def attempt() -> T:
+        hedged = _hedged(call, policy, tracker, description)
+        if policy.deadline > 0:
+            return await asyncio.wait_for(hedged, policy.deadline)
+        return await hedged
+
+    attempts = max(1, policy.attempts)
+    for number in range(1, attempts):
+        try:
+            return await attempt()
+        except Exception as e:
+            if not is_retryable(e):
+                raise
+            delay = policy.delay(number)
+            logger.warning(
+                "%s failed (%s), retrying in %.2fs (attempt %d/%d)",
+                description,
+                describe_error(e),
+                delay,
+                number + 1,
+                attempts,
+            )
+            await asyncio.sleep(delay)
+    return await attempt()
+
+
+def describe_error(exc: BaseException) -> str:
+    """Short label for a failed request, for log messages."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return f"HTTP {exc.response.status_code}"
+    return type(exc).__name__
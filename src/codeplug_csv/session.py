@@ -0,0 +1,51 @@
+"""Shared HTTP connection pool for the RSGB, BrandMeister and RadioID clients."""
+
+from __future__ import annotations
+
+import importlib.util
+
+import httpx
+
+from .config import HTTP_KEEPALIVE_EXPIRY, HTTP_TIMEOUT, MAX_CONCURRENT
+
+# HTTP/2 needs the optional h2 package (pip install codeplug-csv[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# One MAX_CONCURRENT share of the pool per API, so a parallel contact
+# download cannot starve the repeater fetches of connections.
+_CLIENTS_PER_SESSION = 3
+
+
+def pool_limits(max_concurrent: int = MAX_CONCURRENT) -> httpx.Limits:
+    """Connection pool limits derived from the per-client concurrency cap."""
+    connections = max(1, max_concurrent) * _CLIENTS_PER_SESSION
+    return httpx.Limits(
+        max_connections=connections,
+        max_keepalive_connections=connections,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def create_transport(max_concurrent: int = MAX_CONCURRENT) -> httpx.AsyncHTTPTransport:
+    """The network transport create_session uses, for wrapping by callers."""
+    return httpx.AsyncHTTPTransport(
+        limits=pool_limits(max_concurrent), http2=HTTP2_AVAILABLE
+    )
+
+
+def create_session(
+    timeout: float = HTTP_TIMEOUT,
+    max_concurrent: int = MAX_CONCURRENT,
+    **kwargs,
+) -> httpx.AsyncClient:
+    """Return a keep-alive AsyncClient, using HTTP/2 when h2 is installed.
+
+    Pass the result to the API clients' ``session`` argument to share one pool
+    between them; the caller is responsible for closing it.
+    """
+    return httpx.AsyncClient(
+        timeout=timeout,
+        limits=pool_limits(max_concurrent),
+        http2=HTTP2_AVAILABLE,
+        **kwargs,
+    )
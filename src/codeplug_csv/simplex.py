@@ -5,14 +5,9 @@ from __future__ import annotations
 from .models import AnytoneChannel, AnytoneZone
 
 
-def _mhz_str(freq: float) -> str:
-    """Format a frequency in MHz to 5 decimal places."""
-    return f"{freq:.5f}"
-
-
-def _name_freq(freq: float) -> str:
-    """Format a frequency for use in a channel name (compact, no trailing zeros)."""
-    return f"{freq:.4f}".rstrip("0").rstrip(".")
+def _name_freq(hz: int) -> str:
+    """Format a frequency for use in a channel name (MHz, no trailing zeros)."""
+    return f"{hz // 1_000_000}.{hz % 1_000_000:06d}".rstrip("0").rstrip(".")
 
 
 # ---------- Hotspot ----------
@@ -23,8 +18,8 @@ def hotspot_zone() -> AnytoneZone:
     channels = [
         AnytoneChannel(
             name="HS 434 SIMPLEX",
-            rx_freq=_mhz_str(434.000),
-            tx_freq=_mhz_str(434.000),
+            rx_freq=434_000_000,
+            tx_freq=434_000_000,
             channel_type="D-Digital",
             bandwidth="12.5K",
             color_code=1,
@@ -34,8 +29,8 @@ def hotspot_zone() -> AnytoneZone:
         ),
         AnytoneChannel(
             name="HS 438 SIMPLEX",
-            rx_freq=_mhz_str(438.800),
-            tx_freq=_mhz_str(438.800),
+            rx_freq=438_800_000,
+            tx_freq=438_800_000,
             channel_type="D-Digital",
             bandwidth="12.5K",
             color_code=1,
@@ -45,8 +40,8 @@ def hotspot_zone() -> AnytoneZone:
         ),
         AnytoneChannel(
             name="HS RPT TS1",
-            rx_freq=_mhz_str(434.000),
-            tx_freq=_mhz_str(438.800),
+            rx_freq=434_000_000,
+            tx_freq=438_800_000,
             channel_type="D-Digital",
             bandwidth="12.5K",
             color_code=1,
@@ -56,8 +51,8 @@ def hotspot_zone() -> AnytoneZone:
         ),
         AnytoneChannel(
             name="HS RPT TS2",
-            rx_freq=_mhz_str(434.000),
-            tx_freq=_mhz_str(438.800),
+            rx_freq=434_000_000,
+            tx_freq=438_800_000,
             channel_type="D-Digital",
             bandwidth="12.5K",
             color_code=1,
@@ -76,14 +71,13 @@ def vhf_fm_simplex_zone() -> AnytoneZone:
     """V16-V46: 145.200-145.575 MHz, 12.5K FM. V40 is the calling channel."""
     channels = []
     for i in range(16, 47):
-        freq = 145.200 + (i - 16) * 0.0125
-        freq_str = _mhz_str(freq)
+        freq = 145_200_000 + (i - 16) * 12_500
         name = f"V{i} {_name_freq(freq)} CALL" if i == 40 else f"V{i} {_name_freq(freq)}"
         channels.append(
             AnytoneChannel(
                 name=name,
-                rx_freq=freq_str,
-                tx_freq=freq_str,
+                rx_freq=freq,
+                tx_freq=freq,
                 channel_type="A-Analog",
                 bandwidth="12.5K",
             )
@@ -98,14 +92,13 @@ def uhf_fm_simplex_zone() -> AnytoneZone:
     """U272-U288: 433.400-433.600 MHz, 12.5K FM. U280 is the calling channel."""
     channels = []
     for i in range(272, 289):
-        freq = 433.400 + (i - 272) * 0.0125
-        freq_str = _mhz_str(freq)
+        freq = 433_400_000 + (i - 272) * 12_500
         name = f"U{i} {_name_freq(freq)} CALL" if i == 280 else f"U{i} {_name_freq(freq)}"
         channels.append(
             AnytoneChannel(
                 name=name,
-                rx_freq=freq_str,
-                tx_freq=freq_str,
+                rx_freq=freq,
+                tx_freq=freq,
                 channel_type="A-Analog",
                 bandwidth="12.5K",
             )
@@ -118,11 +111,11 @@ def uhf_fm_simplex_zone() -> AnytoneZone:
 
 def vhf_dv_simplex_zone() -> AnytoneZone:
     """Single channel: 144.6125 MHz, DMR CC1 TS1."""
-    freq_str = _mhz_str(144.6125)
+    freq = 144_612_500
     ch = AnytoneChannel(
         name="2M DV CALL",
-        rx_freq=freq_str,
-        tx_freq=freq_str,
+        rx_freq=freq,
+        tx_freq=freq,
         channel_type="D-Digital",
         bandwidth="12.5K",
         color_code=1,
@@ -139,14 +132,13 @@ def uhf_dv_simplex_zone() -> AnytoneZone:
     """DH1-DH8: 438.5875-438.6750 MHz, DMR CC1 TS1. DH3 is the calling channel."""
     channels = []
     for i in range(1, 9):
-        freq = 438.5875 + (i - 1) * 0.0125
-        freq_str = _mhz_str(freq)
+        freq = 438_587_500 + (i - 1) * 12_500
         name = f"DH{i} CALL" if i == 3 else f"DH{i}"
         channels.append(
             AnytoneChannel(
                 name=name,
-                rx_freq=freq_str,
-                tx_freq=freq_str,
+                rx_freq=freq,
+                tx_freq=freq,
                 channel_type="D-Digital",
                 bandwidth="12.5K",
                 color_code=1,
@@ -164,13 +156,12 @@ def pmr446_zone() -> AnytoneZone:
     """PMR 1-16: 446.00625-446.19375 MHz, 12.5K FM, TX prohibited."""
     channels = []
     for i in range(1, 17):
-        freq = 446.00625 + (i - 1) * 0.0125
-        freq_str = _mhz_str(freq)
+        freq = 446_006_250 + (i - 1) * 12_500
         channels.append(
             AnytoneChannel(
                 name=f"PMR {i}",
-                rx_freq=freq_str,
-                tx_freq=freq_str,
+                rx_freq=freq,
+                tx_freq=freq,
                 channel_type="A-Analog",
                 bandwidth="12.5K",
                 tx_prohibit="On",
@@ -185,19 +176,19 @@ def pmr446_zone() -> AnytoneZone:
 def iss_zone() -> AnytoneZone:
     """ISS channels: 5 doppler downlinks, cross-band repeater up/down."""
     doppler = [
-        ("ISS RISE", 145.8050),
-        ("ISS HIGH", 145.8025),
-        ("ISS OVER", 145.8000),
-        ("ISS LOW", 145.7975),
-        ("ISS SET", 145.7950),
+        ("ISS RISE", 145_805_000),
+        ("ISS HIGH", 145_802_500),
+        ("ISS OVER", 145_800_000),
+        ("ISS LOW", 145_797_500),
+        ("ISS SET", 145_795_000),
     ]
-    uplink = _mhz_str(145.200)
+    uplink = 145_200_000
     channels = []
     for name, dl_freq in doppler:
         channels.append(
             AnytoneChannel(
                 name=name,
-                rx_freq=_mhz_str(dl_freq),
+                rx_freq=dl_freq,
                 tx_freq=uplink,
                 channel_type="A-Analog",
                 bandwidth="25K",
@@ -205,7 +196,7 @@ def iss_zone() -> AnytoneZone:
         )
 
     # Cross-band repeater uplink (145.990, CTCSS 67.0 encode)
-    rpt_up_freq = _mhz_str(145.990)
+    rpt_up_freq = 145_990_000
     channels.append(
         AnytoneChannel(
             name="ISS RPT UP",
@@ -218,7 +209,7 @@ def iss_zone() -> AnytoneZone:
     )
 
     # Cross-band repeater downlink (437.800)
-    rpt_dn_freq = _mhz_str(437.800)
+    rpt_dn_freq = 437_800_000
     channels.append(
         AnytoneChannel(
             name="ISS RPT DN",
@@ -236,29 +227,29 @@ def iss_zone() -> AnytoneZone:
 
 # ITU Marine VHF simplex channels (ship TX = coast TX).
 # Excludes Ch 70 (DSC), 75/76 (guard bands).
-_MARINE_CHANNELS: list[tuple[int, float]] = [
-    (6, 156.300),
-    (8, 156.400),
-    (9, 156.450),
-    (10, 156.500),
-    (11, 156.550),
-    (12, 156.600),
-    (13, 156.650),
-    (14, 156.700),
-    (15, 156.750),
-    (16, 156.800),
-    (17, 156.850),
-    (27, 157.350),
-    (67, 156.375),
-    (68, 156.425),
-    (69, 156.475),
-    (71, 156.575),
-    (72, 156.625),
-    (73, 156.675),
-    (74, 156.725),
-    (77, 156.875),
-    (87, 157.375),
-    (88, 157.425),
+_MARINE_CHANNELS: list[tuple[int, int]] = [
+    (6, 156_300_000),
+    (8, 156_400_000),
+    (9, 156_450_000),
+    (10, 156_500_000),
+    (11, 156_550_000),
+    (12, 156_600_000),
+    (13, 156_650_000),
+    (14, 156_700_000),
+    (15, 156_750_000),
+    (16, 156_800_000),
+    (17, 156_850_000),
+    (27, 157_350_000),
+    (67, 156_375_000),
+    (68, 156_425_000),
+    (69, 156_475_000),
+    (71, 156_575_000),
+    (72, 156_625_000),
+    (73, 156_675_000),
+    (74, 156_725_000),
+    (77, 156_875_000),
+    (87, 157_375_000),
+    (88, 157_425_000),
 ]
 
 
@@ -266,13 +257,12 @@ def marine_vhf_zone() -> AnytoneZone:
     """22 simplex marine VHF channels, TX prohibited. Ch 16 is the calling channel."""
     channels = []
     for ch_num, freq in _MARINE_CHANNELS:
-        freq_str = _mhz_str(freq)
         name = f"MAR {ch_num} CALL" if ch_num == 16 else f"MAR {ch_num:02d}"
         channels.append(
             AnytoneChannel(
                 name=name,
-                rx_freq=freq_str,
-                tx_freq=freq_str,
+                rx_freq=freq,
+                tx_freq=freq,
                 channel_type="A-Analog",
                 bandwidth="25K",
                 tx_prohibit="On",
@@ -0,0 +1,95 @@
+"""Columnar (struct-of-arrays) repeater storage for the NumPy engine in fast.py."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+from operator import attrgetter
+
+from .models import CAP_ANALOG, CAP_DMR, Repeater
+
+# Bits of RepeaterTable.modes: the repeaters' own caps flags
+MODE_ANALOG = CAP_ANALOG
+MODE_DMR = CAP_DMR
+
+
+class StringPool:
+    """Distinct strings stored once, each addressed by a small integer code."""
+
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, code: int) -> str:
+        return self.values[code]
+
+    def add_all(self, values: list[str]) -> Iterator[int]:
+        """Codes for *values*, adding the new ones in first-seen order."""
+        new = [v for v in dict.fromkeys(values) if v not in self._codes]
+        first = len(self.values)
+        self._codes.update(zip(new, range(first, first + len(new))))
+        self.values.extend(new)
+        return map(self._codes.__getitem__, values)
+
+    def code(self, value: str) -> int:
+        """Code for *value*, or -1 if the pool does not hold it."""
+        return self._codes.get(value, -1)
+
+
+class RepeaterTable:
+    """Repeaters stored column by column.
+
+    Frequencies are integer arrays; status, type, band, callsign and locator
+    are codes into string pools; mode codes are kept as the repeaters'
+    decoded caps flags plus the DMR color code. fast.filter_rows masks the
+    status, type, mode and locator columns into an array of kept row
+    indices, and the fast transform reads the other columns at those rows.
+    """
+
+    def __init__(self) -> None:
+        self.tx = array("q")
+        self.rx = array("q")
+        self.ctcss = array("d")
+        self.txbw = array("d")
+        self.modes = array("B")
+        self.color_code = array("i")
+        self.status = array("H")
+        self.type = array("H")
+        self.band = array("H")
+        self.callsign = array("I")
+        self.locator = array("I")
+        self.statuses = StringPool()
+        self.types = StringPool()
+        self.bands = StringPool()
+        self.callsigns = StringPool()
+        self.locators = StringPool()
+
+    def __len__(self) -> int:
+        return len(self.tx)
+
+    @classmethod
+    def from_repeaters(cls, repeaters: Iterable[Repeater]) -> RepeaterTable:
+        """Build a table one column at a time."""
+        repeaters = list(repeaters)
+        table = cls()
+        for column, attr in (
+            (table.tx, "tx"),
+            (table.rx, "rx"),
+            (table.ctcss, "ctcss"),
+            (table.txbw, "txbw"),
+            (table.modes, "caps"),
+            (table.color_code, "color_code"),
+        ):
+            column.extend(map(attrgetter(attr), repeaters))
+        for column, pool, attr in (
+            (table.status, table.statuses, "status"),
+            (table.type, table.types, "type"),
+            (table.band, table.bands, "band"),
+            (table.callsign, table.callsigns, "repeater"),
+            (table.locator, table.locators, "locator"),
+        ):
+            column.extend(pool.add_all(list(map(attrgetter(attr), repeaters))))
+        return table
@@ -4,39 +4,51 @@ from __future__ import annotations
 
 import logging
 import re
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import replace
+from functools import lru_cache
 
 from .config import EXCLUDED_TYPES, GATEWAY_TYPES, MAX_NAME_LENGTH
-from .models import AnytoneChannel, Repeater
+from .contacts import ContactIndex
+from .models import (
+    CAP_ANALOG,
+    CAP_DMR,
+    AnytoneChannel,
+    Repeater,
+    RepeaterDetail,
+    SlotTalkGroup,
+    TalkGroup,
+)
 from .regions import locator_to_region
 
 logger = logging.getLogger(__name__)
 
 
-def filter_repeaters(
-    repeaters: list[Repeater],
+def iter_filtered(
+    repeaters: Iterable[Repeater],
     locator_prefix: str | None = None,
-) -> list[Repeater]:
-    """Keep only operational analog/DMR repeaters, excluding beacons etc."""
-    result = []
+) -> Iterator[Repeater]:
+    """Yield the repeaters filter_repeaters keeps, as they are reached."""
     for r in repeaters:
         if r.status != "OPERATIONAL":
             continue
         if r.type in EXCLUDED_TYPES:
             continue
-        has_analog = "A" in r.mode_codes
-        has_dmr = any(mc == "M" or mc.startswith("M:") for mc in r.mode_codes)
-        if not (has_analog or has_dmr):
+        if not r.caps & (CAP_ANALOG | CAP_DMR):
             continue
         if locator_prefix and not r.locator.upper().startswith(locator_prefix.upper()):
             continue
-        result.append(r)
-    logger.info("Filtered to %d repeaters", len(result))
-    return result
+        yield r
 
 
-def _hz_to_mhz(hz: int) -> str:
-    """Convert frequency in Hz to MHz string with 5 decimal places."""
-    return f"{hz / 1_000_000:.5f}"
+def filter_repeaters(
+    repeaters: Iterable[Repeater],
+    locator_prefix: str | None = None,
+) -> list[Repeater]:
+    """Keep only operational analog/DMR repeaters, excluding beacons etc."""
+    result = list(iter_filtered(repeaters, locator_prefix))
+    logger.info("Filtered to %d repeaters", len(result))
+    return result
 
 
 def _clean_callsign(callsign: str) -> str:
@@ -53,20 +65,6 @@ def _make_channel_name(callsign: str, suffix: str) -> str:
     return f"{clean} {suffix}"[:MAX_NAME_LENGTH]
 
 
-def _extract_color_code(mode_codes: list[str]) -> int:
-    """Extract DMR color code from modeCodes.
-
-    'M:3' → 3, bare 'M' → 1 (default).
-    """
-    for mc in mode_codes:
-        if mc.startswith("M:"):
-            try:
-                return int(mc.split(":")[1])
-            except (IndexError, ValueError):
-                pass
-    return 1
-
-
 def _bandwidth_str(txbw: float) -> str:
     """Convert txbw value to Anytone bandwidth string."""
     if txbw >= 25:
@@ -74,6 +72,8 @@ def _bandwidth_str(txbw: float) -> str:
     return "12.5K"
 
 
+# Cached so every channel with the same tone or band shares one string
+@lru_cache(maxsize=None)
 def _ctcss_str(ctcss: float) -> str:
     """Format CTCSS tone or 'Off'."""
     if ctcss > 0:
@@ -81,70 +81,149 @@ def _ctcss_str(ctcss: float) -> str:
     return "Off"
 
 
+@lru_cache(maxsize=None)
 def _band_label(band: str) -> str:
     """Normalise band string to lowercase label."""
     return band.lower().replace(" ", "")
 
 
-def transform_repeaters(
-    repeaters: list[Repeater],
+def _slot_talkgroup(
+    detail: RepeaterDetail | None, slot: int
+) -> SlotTalkGroup | None:
+    """The single static talkgroup on *slot*, if the detail names exactly one."""
+    if detail is None:
+        return None
+    on_slot = [tg for tg in detail.talkgroups if tg.slot == slot]
+    return on_slot[0] if len(on_slot) == 1 else None
+
+
+def _channel_count(r: Repeater) -> int:
+    """How many channels iter_channels makes for a filtered repeater."""
+    return (1 if r.caps & CAP_ANALOG else 0) + (2 if r.caps & CAP_DMR else 0)
+
+
+def iter_channels(
+    repeaters: Iterable[Repeater],
     power: str = "High",
-) -> list[AnytoneChannel]:
-    """Convert filtered Repeater list to AnytoneChannel list.
+    details: Mapping[str, RepeaterDetail] | None = None,
+) -> Iterator[AnytoneChannel]:
+    """Yield each filtered repeater's channels, one repeater at a time.
 
     Multimode repeaters (both A and M in modeCodes) produce two channels.
+    With *details* (keyed by callsign), a DMR timeslot carrying one static
+    talkgroup uses it as the channel contact instead of "Local".
     """
-    channels: list[AnytoneChannel] = []
+    details = details or {}
     for r in repeaters:
-        has_analog = "A" in r.mode_codes
-        has_dmr = any(mc == "M" or mc.startswith("M:") for mc in r.mode_codes)
         band = _band_label(r.band)
         region = locator_to_region(r.locator)
         rpt_type = "GW" if r.type in GATEWAY_TYPES else "RPT"
 
         # API tx = repeater transmits → radio receives
-        rx_freq = _hz_to_mhz(r.tx)
-        tx_freq = _hz_to_mhz(r.rx)
+        rx_freq, tx_freq = r.tx, r.rx
+
+        if r.caps & CAP_ANALOG:
+            yield AnytoneChannel(
+                name=_make_channel_name(r.repeater, "FM"),
+                rx_freq=rx_freq,
+                tx_freq=tx_freq,
+                channel_type="A-Analog",
+                bandwidth=_bandwidth_str(r.txbw),
+                ctcss_encode=_ctcss_str(r.ctcss),
+                ctcss_decode=_ctcss_str(r.ctcss),
+                power=power,
+                band=band,
+                mode="ANL",
+                region=region,
+                rpt_type=rpt_type,
+            )
 
-        if has_analog:
-            channels.append(
-                AnytoneChannel(
-                    name=_make_channel_name(r.repeater, "FM"),
+        if r.caps & CAP_DMR:
+            detail = details.get(r.repeater)
+            for slot, suffix in ((1, "TS1"), (2, "TS2")):
+                tg = _slot_talkgroup(detail, slot)
+                yield AnytoneChannel(
+                    name=_make_channel_name(r.repeater, suffix),
                     rx_freq=rx_freq,
                     tx_freq=tx_freq,
-                    channel_type="A-Analog",
-                    bandwidth=_bandwidth_str(r.txbw),
-                    ctcss_encode=_ctcss_str(r.ctcss),
-                    ctcss_decode=_ctcss_str(r.ctcss),
+                    channel_type="D-Digital",
+                    bandwidth="12.5K",
                     power=power,
+                    color_code=r.color_code,
+                    slot=slot,
+                    contact=(tg.name or f"TG {tg.radio_id}")[:MAX_NAME_LENGTH]
+                    if tg
+                    else "Local",
+                    contact_call_type="Group Call",
+                    contact_id=tg.radio_id if tg else 0,
                     band=band,
-                    mode="ANL",
+                    mode="DMR",
                     region=region,
                     rpt_type=rpt_type,
                 )
-            )
 
-        if has_dmr:
-            cc = _extract_color_code(r.mode_codes)
-            for slot, suffix in ((1, "TS1"), (2, "TS2")):
-                channels.append(
-                    AnytoneChannel(
-                        name=_make_channel_name(r.repeater, suffix),
-                        rx_freq=rx_freq,
-                        tx_freq=tx_freq,
-                        channel_type="D-Digital",
-                        bandwidth="12.5K",
-                        power=power,
-                        color_code=cc,
-                        slot=slot,
-                        contact="Local",
-                        contact_call_type="Group Call",
-                        band=band,
-                        mode="DMR",
-                        region=region,
-                        rpt_type=rpt_type,
-                    )
-                )
 
+def transform_repeaters(
+    repeaters: Iterable[Repeater],
+    power: str = "High",
+    details: Mapping[str, RepeaterDetail] | None = None,
+) -> list[AnytoneChannel]:
+    """Convert filtered Repeater list to AnytoneChannel list (see iter_channels)."""
+    channels = list(iter_channels(repeaters, power, details))
     logger.info("Generated %d channels", len(channels))
     return channels
+
+
+def _new_talkgroup(ch: AnytoneChannel, contacts: ContactIndex | None) -> TalkGroup:
+    if contacts is not None and ch.contact == f"TG {ch.contact_id}":
+        user = contacts.by_id(ch.contact_id)
+        if user and user.get("CALLSIGN"):
+            return TalkGroup(
+                name=user["CALLSIGN"][:MAX_NAME_LENGTH],
+                radio_id=ch.contact_id,
+                call_type="Private Call",
+            )
+    return TalkGroup(name=ch.contact, radio_id=ch.contact_id)
+
+
+def iter_linked(
+    channels: Iterable[AnytoneChannel],
+    talkgroups: list[TalkGroup],
+    extra: list[TalkGroup],
+    contacts: ContactIndex | None = None,
+) -> Iterator[AnytoneChannel]:
+    """Yield *channels* linked as link_contacts does.
+
+    Talkgroups missing from *talkgroups* are appended to *extra* as they
+    are found, so it is complete once the channels are exhausted.
+    """
+    by_id = {tg.radio_id: tg for tg in talkgroups}
+    for ch in channels:
+        if ch.contact_id:
+            tg = by_id.get(ch.contact_id)
+            if tg is None:
+                tg = _new_talkgroup(ch, contacts)
+                by_id[tg.radio_id] = tg
+                extra.append(tg)
+            if ch.contact != tg.name or ch.contact_call_type != tg.call_type:
+                ch = replace(ch, contact=tg.name, contact_call_type=tg.call_type)
+        yield ch
+
+
+def link_contacts(
+    channels: Iterable[AnytoneChannel],
+    talkgroups: list[TalkGroup],
+    contacts: ContactIndex | None = None,
+) -> tuple[list[AnytoneChannel], list[TalkGroup]]:
+    """Make every detail-derived channel contact a TalkGroups.CSV entry.
+
+    Contacts whose DMR ID is already listed take that entry's name; the
+    rest are appended to the talkgroup list. An unnamed ID found in
+    *contacts* (the RadioID user list) becomes a private call to that
+    callsign.
+    """
+    extra: list[TalkGroup] = []
+    linked = list(iter_linked(channels, talkgroups, extra, contacts))
+    if extra:
+        logger.info("Added %d talkgroups from repeater detail", len(extra))
+    return linked, talkgroups + extra
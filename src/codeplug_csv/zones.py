@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 from collections import defaultdict
+from collections.abc import Iterable
 
 from .config import MAX_NAME_LENGTH, MAX_ZONE_CHANNELS
 from .models import AnytoneChannel, AnytoneZone
@@ -11,26 +12,40 @@ from .models import AnytoneChannel, AnytoneZone
 logger = logging.getLogger(__name__)
 
 
-def assign_zones(channels: list[AnytoneChannel]) -> list[AnytoneZone]:
+def zone_key(ch: AnytoneChannel) -> str:
+    """The region + mode + type group a repeater channel is zoned under."""
+    return f"{ch.region} {ch.mode} {ch.rpt_type}"
+
+
+def zone_parts(key: str, count: int) -> list[tuple[str, int, int]]:
+    """Name, start and end of each zone for a group of *count* channels.
+
+    Groups larger than MAX_ZONE_CHANNELS are split into numbered zones.
+    """
+    if count <= MAX_ZONE_CHANNELS:
+        return [(key[:MAX_NAME_LENGTH], 0, count)]
+    return [
+        (
+            f"{key} {i // MAX_ZONE_CHANNELS + 1}"[:MAX_NAME_LENGTH],
+            i,
+            min(i + MAX_ZONE_CHANNELS, count),
+        )
+        for i in range(0, count, MAX_ZONE_CHANNELS)
+    ]
+
+
+def assign_zones(channels: Iterable[AnytoneChannel]) -> list[AnytoneZone]:
     """Group channels into zones by region + mode + type, splitting at MAX_ZONE_CHANNELS."""
     groups: dict[str, list[AnytoneChannel]] = defaultdict(list)
     for ch in channels:
-        key = f"{ch.region} {ch.mode} {ch.rpt_type}"
-        groups[key].append(ch)
+        groups[zone_key(ch)].append(ch)
 
     zones: list[AnytoneZone] = []
     for key in sorted(groups):
         members = groups[key]
-        if len(members) <= MAX_ZONE_CHANNELS:
-            zone_name = key[:MAX_NAME_LENGTH]
-            zones.append(AnytoneZone(name=zone_name, channels=members))
-        else:
-            # Split into multiple zones
-            for i in range(0, len(members), MAX_ZONE_CHANNELS):
-                chunk = members[i : i + MAX_ZONE_CHANNELS]
-                part = i // MAX_ZONE_CHANNELS + 1
-                zone_name = f"{key} {part}"[:MAX_NAME_LENGTH]
-                zones.append(AnytoneZone(name=zone_name, channels=chunk))
+        for name, start, end in zone_parts(key, len(members)):
+            chunk = members if end - start == len(members) else members[start:end]
+            zones.append(AnytoneZone(name=name, channels=chunk))
 
     logger.info("Created %d zones", len(zones))
     return zones
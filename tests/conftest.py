@@ -2,9 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
 from codeplug_csv.extract import RSGBClient
@@ -31,3 +38,243 @@ def sample_bm_data() -> dict[str, str]:
     """Raw BrandMeister API response data."""
     with open(FIXTURES / "sample_brandmeister_response.json") as f:
         return json.load(f)
+
+
+def synthetic_payload(count: int) -> list[dict]:
+    """*count* RSGB band records mixing statuses, types, mode codes and locators.
+
+    About two in five pass filter_repeaters; the rest cover each reason to drop one.
+    """
+    statuses = ["OPERATIONAL", "OPERATIONAL", "OPERATIONAL", "NOT OPERATIONAL"]
+    types = ["AV", "DV", "AG", "DG", "BN", "AU"]
+    mode_codes = [["A"], ["M:3"], ["A", "M:7"], ["M"], ["D"], ["A", "F"], []]
+    locators = ["IO91WM", "IO93FO", "IO83QL", "IO70JL", "IO85AW", "JO01AA", ""]
+    return [
+        {
+            "repeater": f"GB{i % 10}{chr(65 + i % 26)}{chr(65 + i // 26 % 26)}",
+            "tx": 145_575_000 + (i % 40) * 12_500,
+            "rx": 144_975_000 + (i % 40) * 12_500,
+            "band": ["2M", "70CM"][i % 2],
+            "modeCodes": mode_codes[i % len(mode_codes)],
+            "ctcss": [0.0, 77.0, 118.8][i % 3],
+            "txbw": [12.5, 25.0][i % 2],
+            "status": statuses[i % len(statuses)],
+            "type": types[i % len(types)],
+            "locator": locators[i % len(locators)],
+        }
+        for i in range(count)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Mocked HTTP for end-to-end runs of main()
+# ---------------------------------------------------------------------------
+
+SAMPLE_USER_CSV = b"RADIO_ID,CALLSIGN,FIRST_NAME,LAST_NAME\n2340001,M0TST,Test,User\n"
+
+
+def make_httpx_mock(
+    per_band: dict[str, list[dict]],
+    bm_data: dict,
+    user_csv: bytes = SAMPLE_USER_CSV,
+    latency: float = 0.0,
+):
+    """Return a mock that satisfies httpx.AsyncClient for all three clients:
+    1. RSGBClient: async with ... as client: await client.get(url)
+    2. BrandMeisterClient: async with ... as client: await client.get(url)
+    3. RadioIDClient: async with ... as client: client.stream(...)
+
+    Each get() takes *latency* seconds, standing in for the network.
+    """
+
+    # Use a custom mock for get to handle both sync and async scenarios correctly
+    def _get_mock(url: str, **_kwargs):
+        if "/talkgroup/" in url:
+            resp = MagicMock()
+            resp.raise_for_status = MagicMock()
+            resp.json = MagicMock(return_value=bm_data)
+            return resp
+        for band, items in per_band.items():
+            if f"/band/{band}" in url:
+                resp = MagicMock()
+                resp.raise_for_status = MagicMock()
+                resp.json = MagicMock(return_value={"data": items})
+                return resp
+        resp = MagicMock()
+        resp.raise_for_status = MagicMock()
+        resp.json = MagicMock(return_value={"data": []})
+        return resp
+
+    # Fix for the RadioIDClient: stream context manager
+    mock_dl_response = MagicMock()
+    mock_dl_response.status_code = 200
+    mock_dl_response.headers = httpx.Headers()
+    mock_dl_response.raise_for_status = MagicMock()
+
+    async def _aiter_bytes():
+        yield user_csv
+
+    mock_dl_response.aiter_bytes = MagicMock(return_value=_aiter_bytes())
+
+    mock_stream_cm = AsyncMock()
+    mock_stream_cm.__aenter__.return_value = mock_dl_response
+    mock_stream_cm.__aexit__ = AsyncMock(return_value=None)
+
+    # The client should be an AsyncMock but we must ensure its methods
+    # behave as the real httpx.AsyncClient does.
+    mock_client = AsyncMock()
+    async def _get(url: str, **kwargs):
+        await asyncio.sleep(latency)
+        return _get_mock(url, **kwargs)
+
+    mock_client.get = AsyncMock(side_effect=_get)
+    mock_client.aclose = AsyncMock()
+    mock_client.stream = MagicMock(return_value=mock_stream_cm)
+    mock_client.__aenter__.return_value = mock_client
+    mock_client.__aexit__ = AsyncMock(return_value=None)
+
+    return mock_client
+
+
+@contextmanager
+def mocked_http(
+    per_band: dict[str, list[dict]],
+    bm_data: dict,
+    user_csv: bytes = SAMPLE_USER_CSV,
+    latency: float = 0.0,
+):
+    httpx_mock = make_httpx_mock(per_band, bm_data, user_csv, latency)
+    with patch("codeplug_csv.extract.httpx.AsyncClient", return_value=httpx_mock):
+        yield
+
+
+@pytest.fixture
+def per_band_api_data(sample_api_data):
+    """Partition sample API records by band (lowercased), matching CLI arg format."""
+    out: dict[str, list[dict]] = {}
+    for item in sample_api_data:
+        band = item["band"].lower()  # "2M" -> "2m", "70CM" -> "70cm"
+        out.setdefault(band, []).append(item)
+    return out
+
+
+
+
+# ---------------------------------------------------------------------------
+# Local stand-in HTTP server for ranged downloads
+# ---------------------------------------------------------------------------
+
+_PATTERN = bytes((i * 37 + 11) % 256 for i in range(251))
+
+
+def synthetic_slice(start: int, length: int) -> bytes:
+    """Bytes *start*..*start+length* of an endless deterministic file."""
+    offset = start % len(_PATTERN)
+    reps = (offset + length) // len(_PATTERN) + 1
+    return (_PATTERN * reps)[offset : offset + length]
+
+
+class RangeServer:
+    """Threaded HTTP/1.1 server serving a synthetic file with Range support.
+
+    With *rate* (bytes per second) each response is paced to that speed, as
+    servers that cap every connection do.
+    """
+
+    ETAG = '"synthetic-v1"'
+
+    def __init__(self, size: int, ranges: bool = True, rate: float | None = None):
+        self.size = size
+        self.ranges = ranges
+        self.rate = rate
+        self.requests: list[dict[str, str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/user.csv"
+
+    def __enter__(self) -> RangeServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _span(self) -> tuple[int, int, int]:
+                rng = self.headers.get("Range")
+                if_range = self.headers.get("If-Range")
+                if server.ranges and rng and if_range in (None, server.ETAG):
+                    first, _, last = rng.removeprefix("bytes=").partition("-")
+                    end = int(last) if last else server.size - 1
+                    return 206, int(first), min(end, server.size - 1)
+                return 200, 0, server.size - 1
+
+            def _headers(self, status: int, start: int, end: int) -> None:
+                self.send_response(status)
+                self.send_header("Content-Length", str(end - start + 1))
+                self.send_header("ETag", server.ETAG)
+                if server.ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                if status == 206:
+                    self.send_header(
+                        "Content-Range", f"bytes {start}-{end}/{server.size}"
+                    )
+                self.end_headers()
+
+            def do_HEAD(self):
+                self._headers(200, 0, server.size - 1)
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append(dict(self.headers))
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    status, start, end = self._span()
+                    self._headers(status, start, end)
+                    pos = start
+                    while pos <= end:
+                        n = min(256 * 1024, end - pos + 1)
+                        self.wfile.write(synthetic_slice(pos, n))
+                        pos += n
+                        if server.rate:
+                            time.sleep(n / server.rate)
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+        return Handler
+
+
+@pytest.fixture
+def range_server():
+    """Factory for RangeServer instances, shut down after the test."""
+    servers: list[RangeServer] = []
+
+    def _start(
+        size: int, ranges: bool = True, rate: float | None = None
+    ) -> RangeServer:
+        server = RangeServer(size, ranges=ranges, rate=rate).__enter__()
+        servers.append(server)
+        return server
+
+    yield _start
+    for server in servers:
+        server.__exit__()
@@ -0,0 +1,148 @@
+"""Tests for record/replay snapshot archives."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import zipfile
+
+import httpx
+import pytest
+
+from codeplug_csv.archive import (
+    ARCHIVE_VERSION,
+    RecordingTransport,
+    SnapshotArchive,
+    write_archive,
+)
+from codeplug_csv.extract import RSGBClient
+
+
+@pytest.fixture
+def band_body(sample_api_data) -> bytes:
+    return json.dumps({"data": sample_api_data}).encode()
+
+
+class TestRecordingTransport:
+    @pytest.mark.asyncio
+    async def test_records_decoded_body_and_passes_response_through(self, band_body):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200, content=gzip.compress(band_body), headers={"Content-Encoding": "gzip"}
+            )
+
+        recorder = RecordingTransport(httpx.MockTransport(handler))
+        async with httpx.AsyncClient(transport=recorder) as client:
+            resp = await client.get("https://rsgb.test/band/2m")
+
+        assert resp.content == band_body
+        assert recorder.responses == {"/band/2m": band_body}
+
+    @pytest.mark.asyncio
+    async def test_skip_and_errors_not_recorded(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            status = 500 if request.url.path == "/fail" else 200
+            return httpx.Response(status, content=b"x")
+
+        recorder = RecordingTransport(
+            httpx.MockTransport(handler), skip=lambda r: r.url.path == "/skip"
+        )
+        async with httpx.AsyncClient(transport=recorder) as client:
+            await client.get("https://h.test/fail")
+            await client.get("https://h.test/skip")
+        assert recorder.responses == {}
+
+
+class TestSnapshotArchive:
+    def test_round_trip(self, tmp_path, band_body, sample_repeaters):
+        contacts = tmp_path / "user.csv"
+        contacts.write_bytes(b"RADIO_ID,CALLSIGN\n2340001,M0TST\n")
+        path = write_archive(
+            tmp_path / "snap.zip",
+            {"/band/2m": band_body},
+            {"2m": sample_repeaters},
+            contacts,
+        )
+
+        with SnapshotArchive(path) as archive:
+            assert archive.load_repeaters("2m") == sample_repeaters
+            assert archive.load_repeaters("70cm") is None
+            assert archive.has_contacts
+            out = archive.extract_contacts(tmp_path / "restored.csv")
+            assert out.read_bytes() == contacts.read_bytes()
+            assert archive.transport().responses == {"/band/2m": band_body}
+
+    def test_extract_contacts_drops_download_state(self, tmp_path):
+        contacts = tmp_path / "recorded.csv"
+        contacts.write_bytes(b"RADIO_ID,CALLSIGN\n2340001,M0TST\n")
+        path = write_archive(tmp_path / "snap.zip", {}, {}, contacts)
+
+        dest = tmp_path / "user.csv"
+        dest.write_bytes(b"RADIO_ID,CALLSIGN\n")
+        part = tmp_path / ".user.csv.part"
+        part.write_bytes(b"RADIO_ID,CALL")
+        meta = tmp_path / ".user.csv.meta.json"
+        meta.write_text(json.dumps({"complete": {"etag": '"v1"'}}))
+
+        with SnapshotArchive(path) as archive:
+            archive.extract_contacts(dest)
+        assert dest.read_bytes() == contacts.read_bytes()
+        assert not part.exists() and not meta.exists()
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "recorded.csv",
+            "snap.zip",
+            "user.csv",
+        ]
+
+    def test_archive_is_compressed(self, tmp_path, band_body):
+        path = write_archive(tmp_path / "snap.zip", {"/band/2m": band_body * 50})
+        with zipfile.ZipFile(path) as zf:
+            info = zf.getinfo("responses/0")
+        assert info.compress_size < info.file_size // 5
+
+    def test_fast_path_skipped_when_fields_change(self, tmp_path, sample_repeaters):
+        path = write_archive(tmp_path / "snap.zip", {}, {"2m": sample_repeaters})
+        with zipfile.ZipFile(path, "a") as zf:
+            manifest = json.loads(zf.read("manifest.json"))
+        manifest["repeater_fields"] = ["repeater"]
+        _rewrite_manifest(path, manifest)
+        with SnapshotArchive(path) as archive:
+            assert archive.load_repeaters("2m") is None
+
+    def test_rejects_other_versions(self, tmp_path):
+        path = write_archive(tmp_path / "snap.zip", {})
+        with zipfile.ZipFile(path) as zf:
+            manifest = json.loads(zf.read("manifest.json"))
+        manifest["version"] = ARCHIVE_VERSION + 1
+        _rewrite_manifest(path, manifest)
+        with pytest.raises(ValueError, match="Unsupported archive version"):
+            SnapshotArchive(path)
+
+    def test_rejects_foreign_zip(self, tmp_path):
+        path = tmp_path / "other.zip"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("hello.txt", "hi")
+        with pytest.raises(ValueError, match="not a codeplug-csv archive"):
+            SnapshotArchive(path)
+
+    @pytest.mark.asyncio
+    async def test_replay_transport_serves_recorded_and_refuses_others(
+        self, tmp_path, band_body, sample_repeaters
+    ):
+        path = write_archive(tmp_path / "snap.zip", {"/band/2m": band_body})
+        with SnapshotArchive(path) as archive:
+            session = httpx.AsyncClient(transport=archive.transport())
+        async with RSGBClient(base_url="https://elsewhere.test", session=session) as rsgb:
+            assert await rsgb.fetch_band("2m") == sample_repeaters
+            with pytest.raises(httpx.ConnectError, match="not in the replay archive"):
+                await rsgb.fetch_band("70cm")
+        await session.aclose()
+
+
+def _rewrite_manifest(path, manifest) -> None:
+    with zipfile.ZipFile(path) as zf:
+        members = {n: zf.read(n) for n in zf.namelist() if n != "manifest.json"}
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+        zf.writestr("manifest.json", json.dumps(manifest))
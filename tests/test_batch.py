@@ -0,0 +1,223 @@
+"""Tests for building several profiles from one fetch."""
+
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+from codeplug_csv import fast
+from codeplug_csv.batch import Profile, SharedChannels, load_profiles, write_profiles
+from codeplug_csv.cli import main
+from codeplug_csv.extract import RSGBClient
+from codeplug_csv.load import write_channels, write_talkgroups, write_zones
+from codeplug_csv.models import TalkGroup
+from codeplug_csv.simplex import get_static_zones
+from codeplug_csv.transform import filter_repeaters, transform_repeaters
+from codeplug_csv.zones import assign_zones
+
+from tests.conftest import mocked_http, synthetic_payload
+
+
+def _profiles_file(tmp_path, profiles):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps(profiles))
+    return path
+
+
+def _by_band(repeaters):
+    by_band = {}
+    for r in repeaters:
+        by_band.setdefault(r.band.lower(), []).append(r)
+    return by_band
+
+
+class TestLoadProfiles:
+    def test_defaults(self, tmp_path):
+        path = _profiles_file(
+            tmp_path,
+            [{"name": "all"}, {"name": "se", "bands": "2m", "locator": "IO91"}],
+        )
+        assert load_profiles(path) == [
+            Profile("all"),
+            Profile("se", bands=("2m",), locator="IO91"),
+        ]
+
+    @pytest.mark.parametrize(
+        "profiles",
+        [
+            {"name": "a"},
+            [],
+            [{"bands": ["2m"]}],
+            [{"name": "../up"}],
+            [{"name": "a", "bands": ["6m"]}],
+            [{"name": "a", "power": "Max"}],
+            [{"name": "a", "locator": "IO 91"}],
+            [{"name": "a", "output_dir": "/tmp/a"}],
+            [{"name": "a", "colour": "red"}],
+            [{"name": "a"}, {"name": "a", "output_dir": "b"}],
+            [{"name": "a"}, {"name": "b", "output_dir": "a"}],
+        ],
+    )
+    def test_invalid(self, tmp_path, profiles):
+        with pytest.raises(ValueError):
+            load_profiles(_profiles_file(tmp_path, profiles))
+
+
+class TestSharedChannels:
+    @pytest.mark.parametrize(
+        "profile",
+        [
+            Profile("all"),
+            Profile("se", locator="io91"),
+            Profile("north", bands=("70cm", "2m"), locator="IO9", power="Low"),
+            Profile("none", locator="XX"),
+        ],
+    )
+    def test_matches_single_run(self, profile):
+        repeaters = RSGBClient._parse_batch(synthetic_payload(3000))
+        by_band = _by_band(repeaters)
+        shared = SharedChannels(by_band)
+        expected = [
+            ch
+            for band in profile.bands
+            for ch in transform_repeaters(
+                filter_repeaters(by_band[band], profile.locator), profile.power
+            )
+        ]
+        assert shared.channels(profile) == expected
+
+    def test_transforms_once_per_power(self, sample_repeaters):
+        shared = SharedChannels(_by_band(sample_repeaters))
+        for profile in (
+            Profile("a"),
+            Profile("b", locator="IO91"),
+            Profile("c", bands=("2m",), locator="IO8"),
+            Profile("d", power="Low"),
+        ):
+            shared.channels(profile)
+        assert shared.transforms == 4
+
+
+class TestWriteProfiles:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("workers", [0, 2])
+    async def test_byte_identical_to_single_runs(
+        self, sample_repeaters, tmp_path, workers
+    ):
+        talkgroups = [TalkGroup(radio_id=235, name="UK Wide")]
+        by_band = _by_band(sample_repeaters)
+        profiles = [Profile("all"), Profile("se", bands=("70cm",), locator="IO91")]
+        results = await write_profiles(
+            SharedChannels(by_band, fast.transform_repeaters),
+            [*profiles, Profile("none", locator="XX")],
+            talkgroups,
+            tmp_path / "batch",
+            workers,
+        )
+        assert results["none"] is None
+        assert not (tmp_path / "batch" / "none").exists()
+
+        for profile in profiles:
+            single = tmp_path / "single" / profile.name
+            single.mkdir(parents=True)
+            channels = [
+                ch
+                for band in profile.bands
+                for ch in transform_repeaters(
+                    filter_repeaters(by_band[band], profile.locator)
+                )
+            ]
+            zones = get_static_zones() + assign_zones(channels)
+            await write_channels([ch for z in zones for ch in z.channels], single)
+            await write_zones(zones, single)
+            await write_talkgroups(talkgroups, single)
+            assert results[profile.name][1] == len(zones)
+            for path in single.iterdir():
+                batch = tmp_path / "batch" / profile.name / path.name
+                assert batch.read_bytes() == path.read_bytes()
+
+
+class TestBatchCommand:
+    def test_matches_separate_runs(
+        self, tmp_path, per_band_api_data, sample_bm_data, capsys
+    ):
+        profiles = [
+            {"name": "all"},
+            {"name": "london", "locator": "IO91", "power": "Low"},
+            {"name": "vhf", "bands": ["2m"], "output_dir": "radios/vhf"},
+        ]
+        path = _profiles_file(tmp_path, profiles)
+        with mocked_http(per_band_api_data, sample_bm_data):
+            with pytest.raises(SystemExit) as exc:
+                main(["batch", str(path), "-o", str(tmp_path / "batch"), "-q"])
+        assert exc.value.code == 0
+        assert "london:" in capsys.readouterr().out
+
+        for profile, flags in (
+            ("all", []),
+            ("london", ["--locator", "IO91", "--power", "Low"]),
+            ("radios/vhf", ["--bands", "2m"]),
+        ):
+            single = tmp_path / "single" / profile
+            with mocked_http(per_band_api_data, sample_bm_data):
+                main(["-o", str(single), "--no-contacts", "-q", *flags])
+            for csv_path in single.glob("*.CSV"):
+                batch = tmp_path / "batch" / profile / csv_path.name
+                assert batch.read_bytes() == csv_path.read_bytes()
+
+    def test_bad_profiles_file(self, tmp_path, capsys):
+        path = tmp_path / "profiles.json"
+        path.write_text("[{}]")
+        with pytest.raises(SystemExit) as exc:
+            main(["batch", str(path)])
+        assert exc.value.code == 2
+        assert "Cannot read profiles" in capsys.readouterr().err
+
+
+@pytest.mark.benchmark
+class TestBatchBenchmark:
+    N = 20_000
+    # Per request, standing in for the RSGB and BrandMeister round trips
+    LATENCY = 0.25
+
+    def test_profiles_vs_separate_runs(self, tmp_path, sample_bm_data):
+        per_band = {}
+        for item in synthetic_payload(self.N):
+            per_band.setdefault(item["band"].lower(), []).append(item)
+        locators = [None, "IO91", "IO93", "IO83", "IO7", "JO"]
+        profiles = [
+            {"name": f"p{i}", **({"locator": loc} if loc else {})}
+            for i, loc in enumerate(locators)
+        ]
+
+        def run(argv: list[str]) -> float:
+            start = time.perf_counter()
+            with mocked_http(per_band, sample_bm_data, latency=self.LATENCY):
+                try:
+                    main(argv)
+                except SystemExit:
+                    pass
+            return time.perf_counter() - start
+
+        separate = [
+            run(
+                ["-o", str(tmp_path / "single" / p["name"]), "--no-contacts", "-q"]
+                + (["--locator", p["locator"]] if "locator" in p else [])
+            )
+            for p in profiles
+        ]
+        path = _profiles_file(tmp_path, profiles)
+        batch = run(["batch", str(path), "-o", str(tmp_path / "batch"), "-q"])
+
+        for profile in profiles:
+            for csv_path in (tmp_path / "single" / profile["name"]).glob("*.CSV"):
+                batched = tmp_path / "batch" / profile["name"] / csv_path.name
+                assert batched.read_bytes() == csv_path.read_bytes()
+        print(
+            f"\n{len(profiles)} profiles over {self.N} repeaters, "
+            f"{self.LATENCY}s per request: separate runs {sum(separate):.2f}s, "
+            f"one run {separate[0]:.2f}s, batch {batch:.2f}s "
+            f"(+{(batch - separate[0]) / (len(profiles) - 1):.2f}s per extra profile)"
+        )
@@ -0,0 +1,114 @@
+"""Tests for the on-disk response cache."""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from codeplug_csv.cache import CacheEntry, CircuitBreaker, ResponseCache
+
+
+class TestCacheEntry:
+    def test_conditional_headers_both_validators(self):
+        entry = CacheEntry(url="u", etag='"abc"', last_modified="Mon, 01 Jan 2024")
+        assert entry.conditional_headers() == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Mon, 01 Jan 2024",
+        }
+
+    def test_conditional_headers_empty_without_validators(self):
+        assert CacheEntry(url="u").conditional_headers() == {}
+
+
+class TestResponseCache:
+    def test_round_trip(self, tmp_path):
+        cache = ResponseCache(tmp_path)
+        entry = CacheEntry(url="https://x/band/2m", etag='"v1"', data=[{"a": 1}])
+        cache.put(entry)
+        assert cache.get("https://x/band/2m") == entry
+
+    def test_missing_returns_none(self, tmp_path):
+        assert ResponseCache(tmp_path).get("https://x/band/2m") is None
+
+    def test_creates_directory(self, tmp_path):
+        cache = ResponseCache(tmp_path / "nested" / "cache")
+        cache.put(CacheEntry(url="u"))
+        assert cache.get("u") is not None
+
+    def test_corrupt_entry_ignored(self, tmp_path):
+        cache = ResponseCache(tmp_path)
+        cache.put(CacheEntry(url="u"))
+        cache._path("u").write_text("{not json")
+        assert cache.get("u") is None
+
+    def test_urls_do_not_collide(self, tmp_path):
+        cache = ResponseCache(tmp_path)
+        cache.put(CacheEntry(url="a", etag="1"))
+        cache.put(CacheEntry(url="b", etag="2"))
+        assert cache.get("a").etag == "1"
+        assert cache.get("b").etag == "2"
+
+    def test_fetched_at_round_trip_and_touch(self, tmp_path):
+        cache = ResponseCache(tmp_path)
+        cache.put(CacheEntry(url="u", fetched_at=100.0))
+        entry = cache.get("u")
+        assert entry.fetched_at == 100.0
+        assert entry.age() > 1000
+
+        cache.touch(entry)
+        assert cache.get("u").age() < 5
+
+    def test_entries_without_fetched_at_are_stale(self, tmp_path):
+        cache = ResponseCache(tmp_path)
+        cache._path("u").write_text('{"url": "u", "data": []}')
+        assert cache.get("u").fetched_at == 0.0
+
+
+    def test_concurrent_writers_share_a_directory(self, tmp_path):
+        # Stands in for two jobs pointed at one cache directory
+        caches = [ResponseCache(tmp_path) for _ in range(4)]
+
+        def write(cache: ResponseCache) -> None:
+            for i in range(50):
+                cache.put(CacheEntry(url="u", etag=f'"{i}"'))
+                cache.breaker.record_failure("api.test")
+
+        with ThreadPoolExecutor(len(caches)) as pool:
+            list(pool.map(write, caches))
+        assert caches[0].get("u").etag == '"49"'
+        assert not list(tmp_path.glob("*.tmp"))
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self, tmp_path):
+        breaker = CircuitBreaker(tmp_path / "circuit.json", threshold=2, cooldown=60)
+        breaker.record_failure("api.test")
+        assert breaker.allow("api.test")
+        breaker.record_failure("api.test")
+        assert not breaker.allow("api.test")
+        assert breaker.allow("other.test")
+
+    def test_state_persists_across_instances(self, tmp_path):
+        path = tmp_path / "circuit.json"
+        for _ in range(3):
+            CircuitBreaker(path, threshold=3).record_failure("api.test")
+        assert not CircuitBreaker(path, threshold=3).allow("api.test")
+
+    def test_half_open_after_cooldown(self, tmp_path):
+        breaker = CircuitBreaker(tmp_path / "circuit.json", threshold=1, cooldown=60)
+        breaker.record_failure("api.test")
+        assert not breaker.allow("api.test")
+        with patch("codeplug_csv.cache.time.time", return_value=time.time() + 61):
+            assert breaker.allow("api.test")
+
+    def test_success_closes_circuit(self, tmp_path):
+        breaker = CircuitBreaker(tmp_path / "circuit.json", threshold=1)
+        breaker.record_failure("api.test")
+        breaker.record_success("api.test")
+        assert breaker.allow("api.test")
+
+    def test_corrupt_state_ignored(self, tmp_path):
+        path = tmp_path / "circuit.json"
+        path.write_text("{not json")
+        assert CircuitBreaker(path).allow("api.test")
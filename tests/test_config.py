@@ -73,3 +73,16 @@ def test_radioid_timeout_from_env(monkeypatch):
     monkeypatch.setenv("CODEPLUG_CSV_RADIOID_TIMEOUT", "120")
     importlib.reload(config)
     assert config.RADIOID_TIMEOUT == 120
+
+
+def test_stream_parse_default_off(monkeypatch):
+    monkeypatch.delenv("CODEPLUG_CSV_STREAM_PARSE", raising=False)
+    importlib.reload(config)
+    assert config.STREAM_PARSE is False
+
+
+@pytest.mark.parametrize("raw,expected", [("1", True), ("true", True), ("no", False)])
+def test_stream_parse_from_env(monkeypatch, raw, expected):
+    monkeypatch.setenv("CODEPLUG_CSV_STREAM_PARSE", raw)
+    importlib.reload(config)
+    assert config.STREAM_PARSE is expected
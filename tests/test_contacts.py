@@ -0,0 +1,271 @@
+"""Tests for the RadioID contact list filter and delta index."""
+
+from __future__ import annotations
+
+import csv
+import os
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+from codeplug_csv.contacts import (
+    ContactDelta,
+    ContactFilter,
+    ContactIndex,
+    RowFilter,
+    update_contact_index,
+)
+
+USER_CSV = (
+    "RADIO_ID,CALLSIGN,FIRST_NAME,LAST_NAME,CITY,STATE,COUNTRY\n"
+    "2340001,M0TST,Test,User,London,England,United Kingdom\n"
+    "2350002,GM4ABC,Ann,Other,Glasgow,Scotland,United Kingdom\n"
+    "3100001,K1ABC,Bob,Smith,Boston,Massachusetts,United States\n"
+    '2620001,DL1ABC,"Müller, Hans",X,Berlin,Berlin,Germany\n'
+    "2720001,EI2ABC,Cara,Y,Dublin,Dublin,Ireland\n"
+)
+
+
+def _run(contact_filter: ContactFilter, data: bytes, chunk_size: int = 1 << 16) -> str:
+    rows = RowFilter(contact_filter)
+    out = "".join(
+        rows.feed(data[i : i + chunk_size]) for i in range(0, len(data), chunk_size)
+    )
+    return out + rows.close()
+
+
+class TestContactFilter:
+    def test_normalises_rules(self):
+        f = ContactFilter(countries=("united kingdom ",), callsign_prefixes=("m", "g"))
+        assert f.countries == ("UNITED KINGDOM",)
+        assert f.callsign_prefixes == ("G", "M")
+
+    def test_empty_filter_is_falsy(self):
+        assert not ContactFilter()
+        assert ContactFilter(id_prefixes=("234",))
+
+    def test_key_is_order_independent(self):
+        assert ContactFilter(id_prefixes=("235", "234")).key() == ContactFilter(
+            id_prefixes=("234", "235")
+        ).key()
+
+
+class TestRowFilter:
+    def test_country(self):
+        out = _run(ContactFilter(countries=("United Kingdom",)), USER_CSV.encode())
+        lines = out.splitlines()
+        assert lines[0].startswith("RADIO_ID,")
+        assert [line.split(",")[1] for line in lines[1:]] == ["M0TST", "GM4ABC"]
+
+    def test_rules_are_combined_with_or(self):
+        f = ContactFilter(id_prefixes=("262",), callsign_prefixes=("EI",))
+        rows = RowFilter(f)
+        out = rows.feed(USER_CSV.encode()) + rows.close()
+        assert "DL1ABC" in out and "EI2ABC" in out
+        assert "M0TST" not in out
+        assert (rows.kept, rows.total) == (2, 5)
+
+    def test_quoted_fields_are_kept_verbatim(self):
+        out = _run(ContactFilter(countries=("Germany",)), USER_CSV.encode())
+        assert '"Müller, Hans"' in out
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64])
+    def test_chunk_boundaries_do_not_matter(self, chunk_size):
+        f = ContactFilter(countries=("United Kingdom", "Germany"))
+        data = USER_CSV.encode()
+        assert _run(f, data, chunk_size) == _run(f, data)
+
+    def test_crlf_and_missing_final_newline(self):
+        data = USER_CSV.replace("\n", "\r\n").rstrip("\r\n").encode()
+        out = _run(ContactFilter(countries=("Ireland",)), data, 5)
+        assert out.splitlines()[-1] == "2720001,EI2ABC,Cara,Y,Dublin,Dublin,Ireland"
+
+    def test_short_rows_are_dropped(self):
+        data = (USER_CSV + "999\n").encode()
+        out = _run(ContactFilter(countries=("Ireland",)), data)
+        assert "999" not in out
+
+    def test_missing_column_raises(self):
+        data = b"RADIO_ID,CALLSIGN\n2340001,M0TST\n"
+        with pytest.raises(ValueError, match="COUNTRY"):
+            _run(ContactFilter(countries=("United Kingdom",)), data)
+
+
+def _read_report(path: Path) -> list[dict[str, str]]:
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+class TestContactIndex:
+    @pytest.fixture
+    def paths(self, tmp_path: Path) -> tuple[Path, Path, Path]:
+        return (
+            tmp_path / "user.csv",
+            tmp_path / ".user.csv.sqlite",
+            tmp_path / "contacts-delta.csv",
+        )
+
+    def test_first_run_adds_everything(self, paths):
+        src, index, report = paths
+        src.write_text(USER_CSV, encoding="utf-8")
+        delta = update_contact_index(src, index, report)
+        assert delta == ContactDelta(added=5)
+        rows = _read_report(report)
+        assert {r["CHANGE"] for r in rows} == {"added"}
+        assert [r["RADIO_ID"] for r in rows] == sorted(r["RADIO_ID"] for r in rows)
+
+    def test_reports_adds_changes_and_deletes(self, paths):
+        src, index, report = paths
+        src.write_text(USER_CSV, encoding="utf-8")
+        update_contact_index(src, index, report)
+
+        updated = (
+            USER_CSV.replace("Boston", "Cambridge")
+            .replace("2720001,EI2ABC,Cara,Y,Dublin,Dublin,Ireland\n", "")
+            + "2340002,M0NEW,New,Person,Leeds,England,United Kingdom\n"
+        )
+        src.write_text(updated, encoding="utf-8")
+        delta = update_contact_index(src, index, report)
+
+        assert delta == ContactDelta(added=1, changed=1, deleted=1)
+        rows = _read_report(report)
+        assert [(r["CHANGE"], r["CALLSIGN"]) for r in rows] == [
+            ("added", "M0NEW"),
+            ("deleted", "EI2ABC"),
+            ("changed", "K1ABC"),
+        ]
+        assert rows[2]["CITY"] == "Cambridge"
+
+        # The index now matches the updated list
+        os.utime(src, ns=(0, 0))
+        assert not update_contact_index(src, index, report)
+        assert _read_report(report) == []
+
+    def test_quoted_rows_round_trip(self, paths):
+        src, index, report = paths
+        src.write_text(USER_CSV, encoding="utf-8")
+        update_contact_index(src, index, report)
+        row = next(r for r in _read_report(report) if r["RADIO_ID"] == "2620001")
+        assert row["FIRST_NAME"] == "Müller, Hans"
+
+    def test_unchanged_file_is_not_reread(self, paths, monkeypatch):
+        src, index, report = paths
+        src.write_text(USER_CSV, encoding="utf-8")
+        update_contact_index(src, index, report)
+
+        def fail(*args):
+            raise AssertionError("rows were reread")
+
+        monkeypatch.setattr("codeplug_csv.contacts._source_rows", fail)
+        assert update_contact_index(src, index, report) == ContactDelta()
+        assert report.read_text(encoding="utf-8").startswith("CHANGE,RADIO_ID,")
+
+        # The header-only report is already there, so it is left alone
+        before = report.stat().st_mtime_ns
+        time.sleep(0.01)
+        update_contact_index(src, index, report)
+        assert report.stat().st_mtime_ns == before
+        assert not report.with_name(f".{report.name}.tmp").exists()
+
+    def test_repeated_radio_id_keeps_first_row(self, paths):
+        src, index, report = paths
+        src.write_text(
+            USER_CSV + "2340001,M0DUP,Dup,Row,York,England,United Kingdom\n",
+            encoding="utf-8",
+        )
+        update_contact_index(src, index, report)
+        callsigns = [r["CALLSIGN"] for r in _read_report(report)]
+        assert "M0TST" in callsigns and "M0DUP" not in callsigns
+
+
+class TestContactLookup:
+    @pytest.fixture
+    def user_csv(self, tmp_path: Path) -> Path:
+        # Out of ID order, with a repeated callsign, as RadioID data can be
+        path = tmp_path / "user.csv"
+        path.write_text(
+            USER_CSV + "2340000,m0tst,Test,Again,York,England,United Kingdom\n",
+            encoding="utf-8",
+        )
+        return path
+
+    def test_by_id(self, user_csv):
+        with ContactIndex(user_csv) as index:
+            assert len(index) == 6
+            row = index.by_id(3100001)
+            assert row["CALLSIGN"] == "K1ABC"
+            assert row["COUNTRY"] == "United States"
+            assert index.by_id(2340000)["LAST_NAME"] == "Again"
+            assert index.by_id(9999999) is None
+            assert index.by_id(1) is None
+
+    def test_by_callsign_is_case_insensitive(self, user_csv):
+        with ContactIndex(user_csv) as index:
+            rows = index.by_callsign("M0tst")
+            assert [r["RADIO_ID"] for r in rows] == ["2340001", "2340000"]
+            assert index.by_callsign("EI2ABC")[0]["CITY"] == "Dublin"
+            assert index.by_callsign("G0NONE") == []
+
+    def test_quoted_row(self, user_csv):
+        with ContactIndex(user_csv) as index:
+            assert index.by_id(2620001)["FIRST_NAME"] == "Müller, Hans"
+
+    def test_index_is_saved_and_reused(self, user_csv, monkeypatch):
+        ContactIndex(user_csv).close()
+        assert (user_csv.parent / ".user.csv.idx").exists()
+
+        def fail(self):
+            raise AssertionError("index was rebuilt")
+
+        monkeypatch.setattr(ContactIndex, "_build", fail)
+        with ContactIndex(user_csv) as index:
+            assert index.by_callsign("K1ABC")[0]["RADIO_ID"] == "3100001"
+
+    def test_index_is_rebuilt_when_file_changes(self, user_csv):
+        ContactIndex(user_csv).close()
+        with open(user_csv, "a", encoding="utf-8") as f:
+            f.write("2340099,M0NEW,New,User,Leeds,England,United Kingdom\n")
+        with ContactIndex(user_csv) as index:
+            assert index.by_id(2340099)["CALLSIGN"] == "M0NEW"
+
+    def test_missing_column_raises(self, tmp_path):
+        path = tmp_path / "user.csv"
+        path.write_text("RADIO_ID,NAME\n1,x\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="CALLSIGN"):
+            ContactIndex(path)
+
+
+@pytest.mark.benchmark
+class TestContactLookupBenchmark:
+    ROWS = 1_000_000
+
+    def test_lookup_latency(self, tmp_path):
+        path = tmp_path / "user.csv"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("RADIO_ID,CALLSIGN,FIRST_NAME,LAST_NAME,CITY,STATE,COUNTRY\n")
+            for i in range(self.ROWS):
+                f.write(f"{1000000 + i},X{i:06d},First,Last,Town,State,Country\n")
+
+        start = time.perf_counter()
+        ContactIndex(path).close()
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = ContactIndex(path)
+        reopen = time.perf_counter() - start
+
+        queries = random.Random(0).sample(range(self.ROWS), 1000)
+        start = time.perf_counter()
+        for i in queries:
+            assert index.by_id(1000000 + i)["CALLSIGN"] == f"X{i:06d}"
+            assert index.by_callsign(f"X{i:06d}")
+        lookup = (time.perf_counter() - start) / len(queries)
+        index.close()
+
+        print(
+            f"\n{self.ROWS} rows: build {build:.2f}s, reopen {reopen * 1e3:.2f}ms, "
+            f"lookup {lookup * 1e6:.1f}us (ID + callsign)"
+        )
+        assert lookup < 0.001
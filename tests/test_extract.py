@@ -1,16 +1,385 @@
-"""Tests for the BrandMeister talkgroup extraction and RadioID download."""
+"""Tests for the RSGB, BrandMeister and RadioID clients."""
 
 from __future__ import annotations
 
+import gzip
+import json
 import logging
+import os
+import time
 import pytest
 import asyncio
 import httpx
 import pytest_asyncio
+from pydantic import ValidationError
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from codeplug_csv.cache import CircuitBreaker, ResponseCache
 from codeplug_csv.config import NON_UK_CURATED_IDS, UK_TG_PREFIX
-from codeplug_csv.extract import BrandMeisterClient, RadioIDClient
+from codeplug_csv.contacts import ContactFilter
+from codeplug_csv.extract import BrandMeisterClient, RadioIDClient, RSGBClient
+from codeplug_csv.limiter import AdaptiveLimiter
+from codeplug_csv.models import Repeater, RepeaterDetail, RepeaterModel, SlotTalkGroup
+from codeplug_csv.retry import RetryPolicy
+from tests.conftest import synthetic_slice
+
+
+class TestRSGBParse:
+    def test_batch_matches_per_item(self, sample_api_data):
+        batch = RSGBClient._parse_batch(sample_api_data)
+        assert batch == [RSGBClient._parse(item) for item in sample_api_data]
+        assert all(type(r) is Repeater for r in batch)
+
+    def test_matches_repeater_model_round_trip(self, sample_api_data):
+        for item, parsed in zip(sample_api_data, RSGBClient._parse_batch(sample_api_data)):
+            cleaned = {k: v for k, v in item.items() if v is not None}
+            legacy = Repeater(**RepeaterModel.model_validate(cleaned).model_dump())
+            assert parsed == legacy
+
+    def test_nulls_and_missing_fields_use_defaults(self):
+        [r] = RSGBClient._parse_batch(
+            [{"repeater": "GB3XX", "tx": "145600000", "ctcss": None, "modeCodes": None}]
+        )
+        assert r.tx == 145600000
+        assert r.ctcss == 0.0
+        assert r.mode_codes == []
+        assert r.rx == 0
+        assert r.txbw == 12.5
+
+    def test_invalid_record_raises(self):
+        with pytest.raises(ValidationError):
+            RSGBClient._parse_batch([{"repeater": "GB3XX", "tx": "not a number"}])
+
+
+@pytest.mark.benchmark
+class TestParseBenchmark:
+    N = 100_000
+
+    def test_batch_vs_per_item_parse(self, sample_api_data):
+        items = [dict(item) for item in sample_api_data * (self.N // len(sample_api_data))]
+
+        def legacy(item):
+            cleaned = {k: v for k, v in item.items() if v is not None}
+            return Repeater(**RepeaterModel.model_validate(cleaned).model_dump())
+
+        start = time.perf_counter()
+        before = [legacy(item) for item in items]
+        per_item = time.perf_counter() - start
+
+        start = time.perf_counter()
+        after = RSGBClient._parse_batch(items)
+        batch = time.perf_counter() - start
+
+        assert after == before
+        n = len(items)
+        print(
+            f"\n{n} records: per-item {per_item / n * 1e6:.2f}us/record, "
+            f"batch {batch / n * 1e6:.2f}us/record"
+        )
+
+
+class TestRSGBConditionalFetch:
+    @staticmethod
+    def _transport(sample_api_data, seen_headers):
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(dict(request.headers))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                json={"data": sample_api_data},
+                headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"},
+            )
+
+        return httpx.MockTransport(handler)
+
+    async def _fetch(self, transport, cache):
+        real = httpx.AsyncClient(transport=transport)
+        with patch("codeplug_csv.extract.httpx.AsyncClient", return_value=real):
+            async with RSGBClient(base_url="https://rsgb.test", cache=cache) as client:
+                return await client.fetch_band("2m")
+
+    @pytest.mark.asyncio
+    async def test_304_reuses_cached_repeaters(self, tmp_path, sample_api_data):
+        seen: list[dict] = []
+        transport = self._transport(sample_api_data, seen)
+        cache = ResponseCache(tmp_path)
+
+        first = await self._fetch(transport, cache)
+        second = await self._fetch(transport, cache)
+
+        assert second == first
+        assert "if-none-match" not in seen[0]
+        assert seen[1]["if-none-match"] == '"v1"'
+        assert seen[1]["if-modified-since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+    @pytest.mark.asyncio
+    async def test_stream_parse_matches_buffered_parse(self, sample_api_data):
+        transport = self._transport(sample_api_data, [])
+        buffered = await self._fetch(transport, None)
+
+        real = httpx.AsyncClient(transport=transport)
+        with patch("codeplug_csv.extract.httpx.AsyncClient", return_value=real):
+            async with RSGBClient(
+                base_url="https://rsgb.test", stream_parse=True
+            ) as client:
+                streamed = await client.fetch_band("2m")
+
+        assert streamed == buffered
+
+    @pytest.mark.asyncio
+    async def test_stream_parse_304_uses_cache(self, tmp_path, sample_api_data):
+        transport = self._transport(sample_api_data, [])
+        cache = ResponseCache(tmp_path)
+        first = await self._fetch(transport, cache)
+
+        real = httpx.AsyncClient(transport=transport)
+        with patch("codeplug_csv.extract.httpx.AsyncClient", return_value=real):
+            async with RSGBClient(
+                base_url="https://rsgb.test", cache=cache, stream_parse=True
+            ) as client:
+                assert await client.fetch_band("2m") == first
+
+    @pytest.mark.asyncio
+    async def test_iter_bands_yields_in_completion_order(self, sample_api_data):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/2m"):
+                await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"data": sample_api_data[:2]})
+
+        real = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch("codeplug_csv.extract.httpx.AsyncClient", return_value=real):
+            async with RSGBClient(base_url="https://rsgb.test") as client:
+                got = [band async for band, _ in client.iter_bands(["2m", "70cm"])]
+        assert got == ["70cm", "2m"]
+
+    @pytest.mark.asyncio
+    async def test_no_cache_sends_no_validators(self, sample_api_data):
+        seen: list[dict] = []
+        repeaters = await self._fetch(self._transport(sample_api_data, seen), None)
+        assert len(repeaters) == len(sample_api_data)
+        assert "if-none-match" not in seen[0]
+
+
+class TestStaleFallback:
+    @staticmethod
+    async def _call(handler, cache, cls=RSGBClient, **kwargs):
+        base = "https://bm.test" if cls is BrandMeisterClient else "https://rsgb.test"
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as session:
+            async with cls(
+                base_url=base,
+                cache=cache,
+                session=session,
+                retry=RetryPolicy(attempts=1),
+                **kwargs,
+            ) as client:
+                if cls is BrandMeisterClient:
+                    return await client.fetch_talkgroups()
+                return await client.fetch_band("2m")
+
+    @staticmethod
+    def _down(request):
+        raise httpx.ConnectError("down", request=request)
+
+    @pytest.mark.asyncio
+    async def test_serves_cached_data_when_api_down(self, tmp_path, sample_api_data):
+        cache = ResponseCache(tmp_path)
+        good = await self._call(
+            lambda r: httpx.Response(200, json={"data": sample_api_data}), cache
+        )
+        assert await self._call(self._down, cache) == good
+        assert CircuitBreaker(tmp_path / "circuit.json").allow("rsgb.test")
+
+    @pytest.mark.asyncio
+    async def test_server_error_without_cache_raises(self, tmp_path):
+        with pytest.raises(httpx.HTTPStatusError):
+            await self._call(lambda r: httpx.Response(503), ResponseCache(tmp_path))
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_the_request(self, tmp_path, sample_api_data):
+        cache = ResponseCache(tmp_path)
+        good = await self._call(
+            lambda r: httpx.Response(200, json={"data": sample_api_data}), cache
+        )
+        for _ in range(cache.breaker.threshold):
+            await self._call(self._down, cache)
+
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"data": []})
+
+        assert await self._call(handler, cache) == good
+        assert calls == []
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_without_cache_fails_fast(self, tmp_path):
+        cache = ResponseCache(tmp_path)
+        for _ in range(cache.breaker.threshold):
+            cache.breaker.record_failure("rsgb.test")
+        with pytest.raises(httpx.ConnectError, match="Circuit open"):
+            await self._call(self._down, cache)
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_served_without_request(self, tmp_path, sample_api_data):
+        ok = lambda r: httpx.Response(200, json={"data": sample_api_data})  # noqa: E731
+        good = await self._call(ok, ResponseCache(tmp_path))
+        assert await self._call(self._down, ResponseCache(tmp_path, max_age=60)) == good
+
+    @pytest.mark.asyncio
+    async def test_offline_requires_cached_entry(self, tmp_path):
+        with pytest.raises(LookupError):
+            await self._call(self._down, ResponseCache(tmp_path), offline=True)
+
+    @pytest.mark.asyncio
+    async def test_brandmeister_falls_back_to_cached_talkgroups(
+        self, tmp_path, sample_bm_data
+    ):
+        cache = ResponseCache(tmp_path)
+
+        def fetch(handler):
+            return self._call(handler, cache, cls=BrandMeisterClient)
+
+        good = await fetch(lambda r: httpx.Response(200, json=sample_bm_data))
+        assert good
+        assert await fetch(self._down) == good
+
+
+class TestRepeaterDetail:
+    DETAIL = {
+        "data": {
+            "keeper": "M0ABC",
+            "networks": ["BrandMeister"],
+            "talkgroups": [{"id": 235, "slot": 1, "name": "UK Wide"}],
+        }
+    }
+
+    @classmethod
+    def _handler(cls, calls, delay=0.0, active=None):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.raw_path.decode())
+            if active is not None:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                if active is not None:
+                    active["now"] -= 1
+            if request.headers.get("If-None-Match") == '"d1"':
+                return httpx.Response(304)
+            if "MISSING" in request.url.path:
+                return httpx.Response(404)
+            return httpx.Response(200, json=cls.DETAIL, headers={"ETag": '"d1"'})
+
+        return handler
+
+    @staticmethod
+    async def _client(handler, **kwargs):
+        session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client = RSGBClient(base_url="https://rsgb.test", session=session, **kwargs)
+        return session, client
+
+    @pytest.mark.asyncio
+    async def test_parses_detail(self):
+        calls: list[str] = []
+        session, client = await self._client(self._handler(calls))
+        async with session, client:
+            detail = await client.fetch_detail("GB7AA")
+        assert detail == RepeaterDetail(
+            callsign="GB7AA",
+            keeper="M0ABC",
+            networks=["BrandMeister"],
+            talkgroups=[SlotTalkGroup(radio_id=235, slot=1, name="UK Wide")],
+        )
+        assert calls == ["/repeater/GB7AA"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_are_coalesced(self):
+        calls: list[str] = []
+        session, client = await self._client(self._handler(calls, delay=0.01))
+        async with session, client:
+            results = await asyncio.gather(
+                *(client.fetch_detail("GB7AA") for _ in range(10))
+            )
+            again = await client.fetch_detail("GB7AA")
+        assert calls == ["/repeater/GB7AA"]
+        assert all(r == again for r in results)
+
+    @pytest.mark.asyncio
+    async def test_fan_out_respects_limiter(self):
+        calls: list[str] = []
+        active = {"now": 0, "peak": 0}
+        repeaters = [Repeater(f"GB7{i:03d}", 0, 0, "70CM") for i in range(40)]
+        session, client = await self._client(
+            self._handler(calls, delay=0.005, active=active),
+            limiter=AdaptiveLimiter(initial=4, max_limit=4),
+        )
+        async with session, client:
+            details = await client.fetch_details(repeaters)
+        assert len(details) == 40
+        assert len(calls) == 40
+        assert active["peak"] == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_lookups_are_skipped(self):
+        repeaters = [Repeater("GB7AA", 0, 0, "70CM"), Repeater("MISSING", 0, 0, "70CM")]
+        session, client = await self._client(
+            self._handler([]), retry=RetryPolicy(attempts=1)
+        )
+        async with session, client:
+            details = await client.fetch_details(repeaters)
+        assert list(details) == ["GB7AA"]
+
+    @pytest.mark.asyncio
+    async def test_failed_lookup_is_retried_by_next_caller(self):
+        calls: list[str] = []
+        ok = self._handler(calls)
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if not calls:
+                calls.append(request.url.raw_path.decode())
+                return httpx.Response(503)
+            return await ok(request)
+
+        session, client = await self._client(handler, retry=RetryPolicy(attempts=1))
+        async with session, client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.fetch_detail("GB7AA")
+            detail = await client.fetch_detail("GB7AA")
+            again = await client.fetch_detail("GB7AA")
+        assert detail == again
+        assert detail.keeper == "M0ABC"
+        assert calls == ["/repeater/GB7AA", "/repeater/GB7AA"]
+
+    @pytest.mark.asyncio
+    async def test_per_callsign_cache_with_ttl(self, tmp_path):
+        calls: list[str] = []
+        handler = self._handler(calls)
+
+        async def fetch(max_age):
+            cache = ResponseCache(tmp_path, max_age=max_age)
+            session, client = await self._client(handler, detail_cache=cache)
+            async with session, client:
+                return await client.fetch_detail("GB7AA")
+
+        first = await fetch(3600)
+        assert await fetch(3600) == first
+        assert len(calls) == 1
+        # Past the TTL the entry is revalidated, and a 304 keeps it
+        assert await fetch(0) == first
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_custom_detail_path_quotes_callsign(self):
+        calls: list[str] = []
+        session, client = await self._client(
+            self._handler(calls), detail_path="/v2/detail/{callsign}"
+        )
+        async with session, client:
+            await client.fetch_detail("GB3CD/L")
+        assert calls == ["/v2/detail/GB3CD%2FL"]
 
 
 class TestBrandMeisterFilterAndParse:
@@ -169,6 +538,8 @@ class TestRadioIDClient:
         dest = tmp_path / "user.csv"
 
         mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = httpx.Headers()
         mock_response.raise_for_status = MagicMock()
 
         async def mock_aiter_bytes():
@@ -190,3 +561,353 @@ class TestRadioIDClient:
 
         assert dest.exists()
         assert dest.read_bytes() == sample_csv
+
+
+class _InterruptedStream(httpx.AsyncByteStream):
+    """Yield *head* then fail as if the connection stalled."""
+
+    def __init__(self, head: bytes):
+        self.head = head
+
+    async def __aiter__(self):
+        yield self.head
+        raise httpx.ReadTimeout("stalled")
+
+
+class TestRadioIDResumableDownload:
+    CONTENT = b"RADIO_ID,CALLSIGN\n" + b"".join(
+        f"{2340000 + i},M0T{i:03d}\n".encode() for i in range(500)
+    )
+
+    def _handler(self, requests: list[httpx.Request], fail_first: bool = True):
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            headers = {"ETag": '"v1"'}
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304, headers=headers)
+            rng = request.headers.get("Range")
+            if rng and request.headers.get("If-Range") == '"v1"':
+                start = int(rng.removeprefix("bytes=").rstrip("-"))
+                return httpx.Response(206, content=self.CONTENT[start:], headers=headers)
+            if fail_first and len(requests) == 1:
+                half = self.CONTENT[: len(self.CONTENT) // 2]
+                return httpx.Response(200, stream=_InterruptedStream(half), headers=headers)
+            return httpx.Response(200, content=self.CONTENT, headers=headers)
+
+        return handler
+
+    async def _download(self, handler, dest, attempts=3):
+        real = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch("codeplug_csv.extract.httpx.AsyncClient", return_value=real):
+            async with RadioIDClient(url="https://radioid.test/user.csv", attempts=attempts) as client:
+                return await client.download(dest)
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_timeout(self, tmp_path):
+        requests: list[httpx.Request] = []
+        dest = tmp_path / "user.csv"
+        await self._download(self._handler(requests), dest)
+
+        assert dest.read_bytes() == self.CONTENT
+        assert len(requests) == 2
+        half = len(self.CONTENT) // 2
+        assert requests[1].headers["Range"] == f"bytes={half}-"
+        assert not (tmp_path / ".user.csv.part").exists()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_download_skipped(self, tmp_path):
+        requests: list[httpx.Request] = []
+        dest = tmp_path / "user.csv"
+        handler = self._handler(requests, fail_first=False)
+        await self._download(handler, dest)
+        mtime = dest.stat().st_mtime_ns
+
+        await self._download(handler, dest)
+
+        assert requests[1].headers["If-None-Match"] == '"v1"'
+        assert dest.stat().st_mtime_ns == mtime
+        assert dest.read_bytes() == self.CONTENT
+
+    def _interrupted_before_rename(self, tmp_path, part_bytes: bytes) -> None:
+        (tmp_path / ".user.csv.part").write_bytes(part_bytes)
+        (tmp_path / ".user.csv.meta.json").write_text(
+            json.dumps({"partial": {"etag": '"v1"', "last_modified": None}})
+        )
+
+    def _unsatisfiable_handler(self, requests: list[httpx.Request], length: int):
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            headers = {"ETag": '"v2"'}
+            if request.headers.get("Range"):
+                return httpx.Response(
+                    416, headers={**headers, "Content-Range": f"bytes */{length}"}
+                )
+            return httpx.Response(200, content=self.CONTENT, headers=headers)
+
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_complete_part_is_renamed_on_416(self, tmp_path):
+        self._interrupted_before_rename(tmp_path, self.CONTENT)
+        requests: list[httpx.Request] = []
+        dest = tmp_path / "user.csv"
+        handler = self._unsatisfiable_handler(requests, len(self.CONTENT))
+        await self._download(handler, dest)
+
+        assert dest.read_bytes() == self.CONTENT
+        assert len(requests) == 1
+        assert not (tmp_path / ".user.csv.part").exists()
+        meta = json.loads((tmp_path / ".user.csv.meta.json").read_text())
+        assert meta == {"complete": {"etag": '"v1"', "last_modified": None}}
+
+    @pytest.mark.asyncio
+    async def test_unsatisfiable_resume_restarts(self, tmp_path):
+        self._interrupted_before_rename(tmp_path, self.CONTENT + b"stale tail\n")
+        requests: list[httpx.Request] = []
+        dest = tmp_path / "user.csv"
+        handler = self._unsatisfiable_handler(requests, len(self.CONTENT))
+        await self._download(handler, dest)
+
+        assert dest.read_bytes() == self.CONTENT
+        assert len(requests) == 2
+        assert "Range" not in requests[1].headers
+        assert "If-None-Match" not in requests[1].headers
+        assert not (tmp_path / ".user.csv.part").exists()
+        meta = json.loads((tmp_path / ".user.csv.meta.json").read_text())
+        assert meta == {"complete": {"etag": '"v2"', "last_modified": None}}
+
+    @pytest.mark.asyncio
+    async def test_existing_file_kept_when_download_fails(self, tmp_path):
+        dest = tmp_path / "user.csv"
+        dest.write_bytes(b"previous\n")
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, stream=_InterruptedStream(b"partial"))
+
+        with pytest.raises(httpx.ReadTimeout):
+            await self._download(handler, dest, attempts=2)
+        assert dest.read_bytes() == b"previous\n"
+
+
+def _matches_synthetic(path, size: int) -> bool:
+    with open(path, "rb") as f:
+        pos = 0
+        while chunk := f.read(1024 * 1024):
+            if chunk != synthetic_slice(pos, len(chunk)):
+                return False
+            pos += len(chunk)
+    return pos == size
+
+
+class TestRadioIDFilteredDownload:
+    CONTENT = b"RADIO_ID,CALLSIGN,COUNTRY\n" + b"".join(
+        f"{(2340000 if i % 4 == 0 else 3100000) + i},X{i:05d},"
+        f"{'United Kingdom' if i % 4 == 0 else 'United States'}\n".encode()
+        for i in range(2000)
+    )
+    UK = ContactFilter(countries=("United Kingdom",))
+
+    def _handler(self, requests: list[httpx.Request], fail_first: bool = False):
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            headers = {"ETag": '"v1"'}
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304, headers=headers)
+            if fail_first and len(requests) == 1:
+                half = self.CONTENT[: len(self.CONTENT) // 2]
+                return httpx.Response(200, stream=_InterruptedStream(half), headers=headers)
+            body = gzip.compress(self.CONTENT)
+            return httpx.Response(
+                200, content=body, headers={**headers, "Content-Encoding": "gzip"}
+            )
+
+        return handler
+
+    async def _download(self, handler, dest, contact_filter=None):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as session:
+            async with RadioIDClient(
+                url="https://radioid.test/user.csv",
+                session=session,
+                retry=RetryPolicy(attempts=3, backoff=0),
+            ) as client:
+                if contact_filter is None:
+                    return await client.download(dest)
+                return await client.download_filtered(dest, contact_filter)
+
+    @pytest.mark.asyncio
+    async def test_keeps_only_matching_rows(self, tmp_path):
+        requests: list[httpx.Request] = []
+        dest = tmp_path / "user.csv"
+        await self._download(self._handler(requests), dest, self.UK)
+
+        lines = dest.read_text().splitlines()
+        assert lines[0] == "RADIO_ID,CALLSIGN,COUNTRY"
+        assert len(lines) == 1 + 500
+        assert all(line.endswith("United Kingdom") for line in lines[1:])
+        assert "gzip" in requests[0].headers["Accept-Encoding"]
+        assert not (tmp_path / ".user.csv.filtering").exists()
+
+    @pytest.mark.asyncio
+    async def test_interrupted_download_restarts(self, tmp_path):
+        requests: list[httpx.Request] = []
+        dest = tmp_path / "user.csv"
+        await self._download(self._handler(requests, fail_first=True), dest, self.UK)
+        assert len(requests) == 2
+        assert "Range" not in requests[1].headers
+        assert len(dest.read_text().splitlines()) == 501
+
+    @pytest.mark.asyncio
+    async def test_unchanged_with_same_filter_skipped(self, tmp_path):
+        requests: list[httpx.Request] = []
+        dest = tmp_path / "user.csv"
+        handler = self._handler(requests)
+        await self._download(handler, dest, self.UK)
+        await self._download(handler, dest, self.UK)
+        assert requests[1].headers["If-None-Match"] == '"v1"'
+        assert len(dest.read_text().splitlines()) == 501
+
+    @pytest.mark.asyncio
+    async def test_changed_filter_or_unfiltered_refetches(self, tmp_path):
+        requests: list[httpx.Request] = []
+        dest = tmp_path / "user.csv"
+        handler = self._handler(requests)
+        await self._download(handler, dest, self.UK)
+        await self._download(handler, dest, ContactFilter(id_prefixes=("31",)))
+        assert "If-None-Match" not in requests[1].headers
+        assert len(dest.read_text().splitlines()) == 1 + 1500
+
+        await self._download(handler, dest)
+        assert "If-None-Match" not in requests[2].headers
+        assert dest.read_bytes() == self.CONTENT
+
+
+class TestRadioIDParallelDownload:
+    @pytest.mark.asyncio
+    async def test_writes_in_blocks(self, tmp_path, range_server):
+        size = 2 * 1024 * 1024
+        server = range_server(size)
+        writes = []
+        pwrite = os.pwrite
+
+        def counting_pwrite(fd, data, offset):
+            writes.append(len(data))
+            return pwrite(fd, data, offset)
+
+        with patch("codeplug_csv.extract._SEGMENT_WRITE_BYTES", 256 * 1024), patch(
+            "codeplug_csv.extract.os.pwrite", counting_pwrite
+        ):
+            async with RadioIDClient(url=server.url, segment_size=size) as client:
+                await client.download_parallel(tmp_path / "user.csv")
+        assert _matches_synthetic(tmp_path / "user.csv", size)
+        assert sum(writes) == size
+        assert len(writes) <= size // (256 * 1024) + 1
+
+    @pytest.mark.asyncio
+    async def test_reassembles_segments(self, tmp_path, range_server):
+        size = 3 * 1024 * 1024 + 123
+        server = range_server(size)
+        dest = tmp_path / "user.csv"
+        async with RadioIDClient(
+            url=server.url, max_concurrent=3, segment_size=256 * 1024
+        ) as client:
+            await client.download_parallel(dest)
+
+        assert _matches_synthetic(dest, size)
+        assert len(server.requests) == 13
+        assert all(r["Range"].startswith("bytes=") for r in server.requests)
+        assert server.max_in_flight <= 3
+        assert not (tmp_path / ".user.csv.segments").exists()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_file_skipped(self, tmp_path, range_server):
+        server = range_server(100_000)
+        dest = tmp_path / "user.csv"
+        async with RadioIDClient(url=server.url, segment_size=30_000) as client:
+            await client.download_parallel(dest)
+            count = len(server.requests)
+            await client.download_parallel(dest)
+        assert len(server.requests) == count
+
+    @pytest.mark.asyncio
+    async def test_falls_back_without_range_support(self, tmp_path, range_server):
+        size = 200_000
+        server = range_server(size, ranges=False)
+        dest = tmp_path / "user.csv"
+        async with RadioIDClient(url=server.url, segment_size=30_000) as client:
+            await client.download_parallel(dest)
+        assert _matches_synthetic(dest, size)
+        assert len(server.requests) == 1
+        assert "Range" not in server.requests[0]
+
+
+@pytest.mark.benchmark
+class TestRadioIDDownloadBenchmark:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "size, rate",
+        [
+            # Loopback: both are bound by this machine's CPU
+            (300 * 1024 * 1024, None),
+            # A server capping each connection at 50 MiB/s
+            (150 * 1024 * 1024, 50 * 1024 * 1024),
+        ],
+    )
+    async def test_parallel_vs_sequential(self, tmp_path, range_server, size, rate):
+        server = range_server(size, rate=rate)
+        timings = {}
+        async with RadioIDClient(url=server.url, timeout=300) as client:
+            for name, method in (
+                ("sequential", client.download),
+                ("parallel", client.download_parallel),
+            ):
+                dest = tmp_path / f"{name}.csv"
+                start = time.perf_counter()
+                await method(dest)
+                timings[name] = time.perf_counter() - start
+                assert _matches_synthetic(dest, size)
+        limit = f"{rate / 2**20:.0f} MiB/s per connection" if rate else "unthrottled"
+        print(
+            f"\n{size // 2**20} MiB, {limit}: "
+            f"sequential {timings['sequential']:.2f}s, "
+            f"parallel {timings['parallel']:.2f}s"
+        )
+
+
+@pytest.mark.benchmark
+class TestRadioIDFilterBenchmark:
+    ROWS = 300_000
+
+    @pytest.mark.asyncio
+    async def test_filtered_vs_raw(self, tmp_path):
+        countries = ["United Kingdom", "United States", "Germany", "Japan"]
+        header = b"RADIO_ID,CALLSIGN,FIRST_NAME,LAST_NAME,CITY,STATE,COUNTRY\n"
+        content = header + b"".join(
+            f"{1000000 + i},X{i:06d},First,Last,Town,State,{countries[i % 4]}\n".encode()
+            for i in range(self.ROWS)
+        )
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=content)
+
+        timings = {}
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as session:
+            async with RadioIDClient(
+                url="https://radioid.test/user.csv", session=session
+            ) as client:
+                for name in ("raw", "filtered"):
+                    dest = tmp_path / f"{name}.csv"
+                    start = time.perf_counter()
+                    if name == "raw":
+                        await client.download(dest)
+                    else:
+                        await client.download_filtered(
+                            dest, ContactFilter(countries=("United Kingdom",))
+                        )
+                    timings[name] = time.perf_counter() - start
+        raw_size = (tmp_path / "raw.csv").stat().st_size
+        filtered_size = (tmp_path / "filtered.csv").stat().st_size
+        print(
+            f"\n{self.ROWS} rows: raw {timings['raw']:.2f}s ({raw_size >> 10} KiB), "
+            f"filtered {timings['filtered']:.2f}s ({filtered_size >> 10} KiB)"
+        )
+        assert filtered_size < raw_size / 3
@@ -0,0 +1,132 @@
+"""Differential tests for the NumPy transform engine."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from codeplug_csv import fast, transform
+from codeplug_csv.extract import RSGBClient
+from codeplug_csv.load import write_channels
+from codeplug_csv.models import RepeaterDetail, SlotTalkGroup
+from codeplug_csv.table import RepeaterTable
+
+from tests.conftest import synthetic_payload
+
+
+def test_falls_back_without_numpy(sample_repeaters):
+    filtered = transform.filter_repeaters(sample_repeaters)
+    with patch("codeplug_csv.fast.NUMPY_AVAILABLE", False):
+        channels = fast.transform_repeaters(filtered, "Mid")
+    assert channels == transform.transform_repeaters(filtered, "Mid")
+
+
+def test_falls_back_to_python_filter(sample_repeaters):
+    with patch("codeplug_csv.fast.NUMPY_AVAILABLE", False):
+        channels = fast.transform_repeaters(sample_repeaters, locator_prefix="IO91")
+    filtered = transform.filter_repeaters(sample_repeaters, "IO91")
+    assert channels == transform.transform_repeaters(filtered)
+
+
+class TestMatchesPurePython:
+    @pytest.fixture(autouse=True)
+    def _numpy(self):
+        pytest.importorskip("numpy")
+
+    @pytest.mark.parametrize("locator", [None, "IO91", "io9", "XX"])
+    def test_filter_rows(self, locator):
+        # Mixed statuses, types, mode codes and locators, some filtered out
+        repeaters = RSGBClient._parse_batch(synthetic_payload(500))
+        rows = fast.filter_rows(RepeaterTable.from_repeaters(repeaters), locator)
+        expected = transform.filter_repeaters(repeaters, locator)
+        assert [repeaters[i] for i in rows.tolist()] == expected
+
+    def test_filter_rows_empty(self):
+        assert fast.filter_rows(RepeaterTable()).tolist() == []
+
+    @pytest.mark.parametrize("locator", [None, "IO9"])
+    def test_filters_unfiltered_input(self, locator):
+        repeaters = RSGBClient._parse_batch(synthetic_payload(2000))
+        filtered = transform.filter_repeaters(repeaters, locator)
+        expected = transform.transform_repeaters(filtered)
+        assert fast.transform_repeaters(repeaters, locator_prefix=locator) == expected
+
+    @pytest.mark.parametrize("power", ["High", "Low"])
+    def test_synthetic(self, power):
+        repeaters = transform.filter_repeaters(
+            RSGBClient._parse_batch(synthetic_payload(5000))
+        )
+        expected = transform.transform_repeaters(repeaters, power)
+        assert fast.transform_repeaters(repeaters, power) == expected
+
+    def test_details(self, sample_repeaters):
+        filtered = transform.filter_repeaters(sample_repeaters)
+        details = {
+            "GB7AA": RepeaterDetail(
+                talkgroups=[
+                    SlotTalkGroup(radio_id=235, slot=1, name="UK Wide"),
+                    SlotTalkGroup(radio_id=23526, slot=2),
+                ]
+            )
+        }
+        expected = transform.transform_repeaters(filtered, details=details)
+        assert fast.transform_repeaters(filtered, details=details) == expected
+
+    def test_empty(self):
+        assert fast.transform_repeaters([]) == []
+
+    @pytest.mark.asyncio
+    async def test_channel_csv_is_byte_identical(self, tmp_path):
+        repeaters = transform.filter_repeaters(
+            RSGBClient._parse_batch(synthetic_payload(3000))
+        )
+        outputs = []
+        for name, engine in (("python", transform), ("numpy", fast)):
+            out = tmp_path / name
+            out.mkdir()
+            path = await write_channels(engine.transform_repeaters(repeaters), out)
+            outputs.append(path.read_bytes())
+        assert outputs[0] == outputs[1]
+
+
+@pytest.mark.benchmark
+class TestFastBenchmark:
+    @pytest.mark.parametrize("count", [10_000, 100_000, 1_000_000])
+    def test_numpy_vs_python(self, count):
+        pytest.importorskip("numpy")
+        repeaters = transform.filter_repeaters(
+            RSGBClient._parse_batch(synthetic_payload(count))
+        )
+        timings = {}
+        results = {}
+        for name, engine in (("python", transform), ("numpy", fast)):
+            start = time.perf_counter()
+            results[name] = engine.transform_repeaters(repeaters)
+            timings[name] = time.perf_counter() - start
+        assert results["numpy"] == results["python"]
+        print(
+            f"\n{count} repeaters: python {timings['python']:.3f}s, "
+            f"numpy {timings['numpy']:.3f}s "
+            f"({timings['python'] / timings['numpy']:.1f}x)"
+        )
+
+    @pytest.mark.parametrize("count", [100_000, 1_000_000])
+    def test_filter_mask_vs_python(self, count):
+        pytest.importorskip("numpy")
+        repeaters = RSGBClient._parse_batch(synthetic_payload(count))
+        start = time.perf_counter()
+        table = RepeaterTable.from_repeaters(repeaters)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        rows = fast.filter_rows(table, "IO9")
+        mask = time.perf_counter() - start
+        start = time.perf_counter()
+        expected = transform.filter_repeaters(repeaters, "IO9")
+        python = time.perf_counter() - start
+        assert len(rows) == len(expected)
+        print(
+            f"\n{count} repeaters: filter_repeaters {python:.3f}s, "
+            f"filter_rows {mask:.3f}s (+{build:.3f}s to build the table)"
+        )
@@ -2,99 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
 import csv
-from contextlib import contextmanager
+import logging
+import time
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
 from codeplug_csv.cli import main
 from codeplug_csv.config import CHANNEL_COLUMNS, TALKGROUP_COLUMNS, ZONE_COLUMNS
+from codeplug_csv.load import write_channels
+from codeplug_csv.retry import RetryPolicy
 from codeplug_csv.simplex import get_static_zones
 
-
-# ---------------------------------------------------------------------------
-# Helpers
-# ---------------------------------------------------------------------------
-
-SAMPLE_USER_CSV = b"RADIO_ID,CALLSIGN,FIRST_NAME,LAST_NAME\n2340001,M0TST,Test,User\n"
-
-
-def _make_httpx_mock(
-    per_band: dict[str, list[dict]], bm_data: dict, user_csv: bytes = SAMPLE_USER_CSV
-):
-    """Return a mock that satisfies httpx.AsyncClient for all three clients:
-    1. RSGBClient: async with ... as client: await client.get(url)
-    2. BrandMeisterClient: async with ... as client: await client.get(url)
-    3. RadioIDClient: async with ... as client: client.stream(...)
-    """
-
-    # Use a custom mock for get to handle both sync and async scenarios correctly
-    def _get_mock(url: str, **_kwargs):
-        if "/talkgroup/" in url:
-            resp = MagicMock()
-            resp.raise_for_status = MagicMock()
-            resp.json = MagicMock(return_value=bm_data)
-            return resp
-        for band, items in per_band.items():
-            if f"/band/{band}" in url:
-                resp = MagicMock()
-                resp.raise_for_status = MagicMock()
-                resp.json = MagicMock(return_value={"data": items})
-                return resp
-        resp = MagicMock()
-        resp.raise_for_status = MagicMock()
-        resp.json = MagicMock(return_value={"data": []})
-        return resp
-
-    # Fix for the RadioIDClient: stream context manager
-    mock_dl_response = MagicMock()
-    mock_dl_response.raise_for_status = MagicMock()
-
-    async def _aiter_bytes():
-        yield user_csv
-
-    mock_dl_response.aiter_bytes = MagicMock(return_value=_aiter_bytes())
-
-    mock_stream_cm = AsyncMock()
-    mock_stream_cm.__aenter__.return_value = mock_dl_response
-    mock_stream_cm.__aexit__ = AsyncMock(return_value=None)
-
-    # The client should be an AsyncMock but we must ensure its methods
-    # behave as the real httpx.AsyncClient does.
-    mock_client = AsyncMock()
-    mock_client.get = AsyncMock(side_effect=_get_mock)
-    mock_client.aclose = AsyncMock()
-    mock_client.stream = MagicMock(return_value=mock_stream_cm)
-    mock_client.__aenter__.return_value = mock_client
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-
-    return mock_client
-
-
-@contextmanager
-def mocked_http(
-    per_band: dict[str, list[dict]], bm_data: dict, user_csv: bytes = SAMPLE_USER_CSV
-):
-    httpx_mock = _make_httpx_mock(per_band, bm_data, user_csv)
-    with patch("codeplug_csv.extract.httpx.AsyncClient", return_value=httpx_mock):
-        yield
-
-
-# ---------------------------------------------------------------------------
-# Fixtures
-# ---------------------------------------------------------------------------
-
-
-@pytest.fixture
-def per_band_api_data(sample_api_data):
-    """Partition sample API records by band (lowercased), matching CLI arg format."""
-    out: dict[str, list[dict]] = {}
-    for item in sample_api_data:
-        band = item["band"].lower()  # "2M" -> "2m", "70CM" -> "70cm"
-        out.setdefault(band, []).append(item)
-    return out
+from tests.conftest import SAMPLE_USER_CSV, make_httpx_mock, mocked_http
 
 
 # ---------------------------------------------------------------------------
@@ -204,6 +128,62 @@ class TestEndToEnd:
             main(["-o", str(tmp_path), "--no-contacts", "-q"])
 
         assert not (tmp_path / "user.csv").exists()
+        assert not (tmp_path / "DigitalContactList.CSV").exists()
+
+    def test_digital_contact_list(self, tmp_path, per_band_api_data, sample_bm_data):
+        with mocked_http(per_band_api_data, sample_bm_data):
+            main(["-o", str(tmp_path), "-q"])
+
+        with open(tmp_path / "DigitalContactList.CSV") as f:
+            rows = list(csv.DictReader(f))
+        assert [r["No."] for r in rows] == [str(i + 1) for i in range(len(rows))]
+        assert rows[0]["Radio ID"] == "2340001"
+        assert rows[0]["Call Type"] == "Private Call"
+
+    def test_contacts_delta(self, tmp_path, per_band_api_data, sample_bm_data):
+        with mocked_http(per_band_api_data, sample_bm_data):
+            main(["-o", str(tmp_path), "--contacts-delta", "-q"])
+        with open(tmp_path / "contacts-delta.csv") as f:
+            assert [r["CHANGE"] for r in csv.DictReader(f)] == ["added"]
+
+        user_csv = SAMPLE_USER_CSV + b"2340002,M0NEW,New,User\n"
+        with mocked_http(per_band_api_data, sample_bm_data, user_csv):
+            main(["-o", str(tmp_path), "--contacts-delta", "-q"])
+        with open(tmp_path / "contacts-delta.csv") as f:
+            rows = list(csv.DictReader(f))
+        assert [(r["CHANGE"], r["CALLSIGN"]) for r in rows] == [("added", "M0NEW")]
+
+    def test_lookup_subcommand(
+        self, tmp_path, per_band_api_data, sample_bm_data, capsys
+    ):
+        with mocked_http(per_band_api_data, sample_bm_data):
+            main(["-o", str(tmp_path), "-q"])
+        capsys.readouterr()
+
+        with pytest.raises(SystemExit) as exc:
+            main(["lookup", "-o", str(tmp_path), "2340001", "m0tst"])
+        assert exc.value.code == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 2
+        assert all("M0TST" in line and "Test User" in line for line in lines)
+
+        with pytest.raises(SystemExit) as exc:
+            main(["lookup", "-o", str(tmp_path), "9999999"])
+        assert exc.value.code == 1
+        assert "not found" in capsys.readouterr().err
+
+    def test_contacts_filter(self, tmp_path, per_band_api_data, sample_bm_data):
+        user_csv = SAMPLE_USER_CSV + b"3100001,K1ABC,Bob,Smith\n"
+        with mocked_http(per_band_api_data, sample_bm_data, user_csv):
+            main(["-o", str(tmp_path), "--contacts-id-prefix", "234", "-q"])
+
+        assert (tmp_path / "user.csv").read_bytes() == SAMPLE_USER_CSV
+
+    def test_parallel_download_rejects_contacts_filter(self, tmp_path, capsys):
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--parallel-download", "--contacts-id-prefix", "234"])
+        assert exc_info.value.code == 2
+        assert "--parallel-download" in capsys.readouterr().err
 
     def test_locator_filter(self, tmp_path, per_band_api_data, sample_bm_data):
         with mocked_http(per_band_api_data, sample_bm_data):
@@ -243,3 +223,302 @@ class TestEndToEnd:
             with pytest.raises(SystemExit) as exc_info:
                 main(["-o", str(tmp_path), "-q"])
         assert exc_info.value.code == 1
+
+
+class TestSharedSession:
+    def test_one_client_for_all_apis(self, tmp_path, per_band_api_data, sample_bm_data):
+        httpx_mock = make_httpx_mock(per_band_api_data, sample_bm_data)
+        with patch(
+            "codeplug_csv.extract.httpx.AsyncClient", return_value=httpx_mock
+        ) as client_cls:
+            main(["-o", str(tmp_path), "-q"])
+
+        assert client_cls.call_count == 1
+        httpx_mock.__aexit__.assert_awaited_once()
+
+
+class TestOverlappedPipeline:
+    def test_codeplug_written_while_contacts_stream(
+        self, tmp_path, per_band_api_data, sample_bm_data
+    ):
+        """Channel/Zone CSVs must not wait on the RadioID download."""
+        seen_before_done: list[bool] = []
+
+        async def _slow_aiter_bytes():
+            for _ in range(200):
+                if (tmp_path / "Zone.CSV").exists():
+                    break
+                await asyncio.sleep(0.01)
+            seen_before_done.append((tmp_path / "Channel.CSV").exists())
+            yield SAMPLE_USER_CSV
+
+        httpx_mock = make_httpx_mock(per_band_api_data, sample_bm_data)
+        dl_response = httpx_mock.stream.return_value.__aenter__.return_value
+        dl_response.aiter_bytes = MagicMock(return_value=_slow_aiter_bytes())
+
+        with patch("codeplug_csv.extract.httpx.AsyncClient", return_value=httpx_mock):
+            main(["-o", str(tmp_path), "-q"])
+
+        assert seen_before_done == [True]
+        assert (tmp_path / "user.csv").read_bytes() == SAMPLE_USER_CSV
+
+
+class TestRecordReplay:
+    @staticmethod
+    def _network(per_band, bm_data):
+        def handler(request: httpx.Request) -> httpx.Response:
+            path = request.url.path
+            if path.startswith("/band/"):
+                return httpx.Response(200, json={"data": per_band.get(path[6:], [])})
+            if "/talkgroup/" in path:
+                return httpx.Response(200, json=bm_data)
+            if path.endswith(".csv"):
+                return httpx.Response(200, content=SAMPLE_USER_CSV)
+            return httpx.Response(404)
+
+        return httpx.MockTransport(handler)
+
+    def test_replay_reproduces_recorded_run_offline(
+        self, tmp_path, per_band_api_data, sample_bm_data
+    ):
+        archive = tmp_path / "snapshot.zip"
+        live = tmp_path / "live"
+        offline = tmp_path / "offline"
+        network = self._network(per_band_api_data, sample_bm_data)
+
+        with patch("codeplug_csv.cli.create_transport", return_value=network):
+            main(["-o", str(live), "--record", str(archive), "-q"])
+
+        def _no_network(*_args, **_kwargs):
+            raise AssertionError("replay must not touch the network")
+
+        with patch.object(
+            httpx.AsyncHTTPTransport, "handle_async_request", _no_network
+        ):
+            main(["-o", str(offline), "--replay", str(archive), "-q"])
+
+        for name in ("Channel.CSV", "Zone.CSV", "TalkGroups.CSV", "user.csv"):
+            assert (offline / name).read_bytes() == (live / name).read_bytes(), name
+
+    def test_replay_missing_archive_exits_one(self, tmp_path):
+        with pytest.raises(SystemExit) as exc_info:
+            main(["-o", str(tmp_path), "--replay", str(tmp_path / "nope.zip"), "-q"])
+        assert exc_info.value.code == 1
+
+    def test_record_and_replay_are_exclusive(self, tmp_path):
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--record", "a.zip", "--replay", "b.zip"])
+        assert exc_info.value.code == 2
+
+
+class TestPerBandPipeline:
+    def test_output_independent_of_band_completion_order(
+        self, tmp_path, per_band_api_data, sample_bm_data
+    ):
+        def run(slow_band: str, out):
+            async def handler(request: httpx.Request) -> httpx.Response:
+                path = request.url.path
+                if path.startswith("/band/"):
+                    band = path[6:]
+                    if band == slow_band:
+                        await asyncio.sleep(0.05)
+                    return httpx.Response(200, json={"data": per_band_api_data[band]})
+                return httpx.Response(200, json=sample_bm_data)
+
+            real = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with patch("codeplug_csv.extract.httpx.AsyncClient", return_value=real):
+                main(["-o", str(out), "--no-contacts", "-q"])
+            return (out / "Channel.CSV").read_bytes(), (out / "Zone.CSV").read_bytes()
+
+        assert run("2m", tmp_path / "a") == run("70cm", tmp_path / "b")
+
+
+class TestStaleWhileRevalidate:
+    @staticmethod
+    def _run(handler, out, cache_dir, *extra):
+        real = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with (
+            patch("codeplug_csv.extract.httpx.AsyncClient", return_value=real),
+            patch("codeplug_csv.cli.write_channels", wraps=write_channels) as writes,
+        ):
+            main(
+                ["-o", str(out), "--no-contacts", "--cache-dir", str(cache_dir), "-q"]
+                + list(extra)
+            )
+        return writes.call_count
+
+    @staticmethod
+    def _api(per_band, bm_data):
+        def handler(request: httpx.Request) -> httpx.Response:
+            path = request.url.path
+            if path.startswith("/band/"):
+                return httpx.Response(200, json={"data": per_band.get(path[6:], [])})
+            return httpx.Response(200, json=bm_data)
+
+        return handler
+
+    @staticmethod
+    def _down(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("down", request=request)
+
+    def test_builds_from_cache_when_apis_down(
+        self, tmp_path, per_band_api_data, sample_bm_data
+    ):
+        cache_dir = tmp_path / "cache"
+        self._run(self._api(per_band_api_data, sample_bm_data), tmp_path / "a", cache_dir)
+        with patch.object(RetryPolicy, "delay", return_value=0):
+            self._run(self._down, tmp_path / "b", cache_dir)
+
+        for name in ("Channel.CSV", "Zone.CSV", "TalkGroups.CSV"):
+            assert (tmp_path / "b" / name).read_bytes() == (
+                tmp_path / "a" / name
+            ).read_bytes()
+
+    def test_unchanged_data_is_written_once(
+        self, tmp_path, per_band_api_data, sample_bm_data
+    ):
+        cache_dir = tmp_path / "cache"
+        api = self._api(per_band_api_data, sample_bm_data)
+        self._run(api, tmp_path, cache_dir)
+        assert self._run(api, tmp_path, cache_dir, "--stale-while-revalidate") == 1
+
+    def test_changed_data_rewrites_outputs(
+        self, tmp_path, per_band_api_data, sample_bm_data
+    ):
+        cache_dir = tmp_path / "cache"
+        self._run(self._api(per_band_api_data, sample_bm_data), tmp_path, cache_dir)
+        before = (tmp_path / "Channel.CSV").read_text()
+
+        fewer = {band: rows[:1] for band, rows in per_band_api_data.items()}
+        writes = self._run(
+            self._api(fewer, sample_bm_data), tmp_path, cache_dir, "--stale-while-revalidate"
+        )
+
+        assert writes == 2
+        assert (tmp_path / "Channel.CSV").read_text() != before
+
+    def test_empty_cache_waits_for_apis(
+        self, tmp_path, per_band_api_data, sample_bm_data
+    ):
+        api = self._api(per_band_api_data, sample_bm_data)
+        writes = self._run(api, tmp_path, tmp_path / "cache", "--stale-while-revalidate")
+        assert writes == 1
+        assert (tmp_path / "Channel.CSV").exists()
+
+
+class TestConcurrencyReport:
+    def test_rsgb_limits_logged(self, tmp_path, caplog, per_band_api_data, sample_bm_data):
+        with (
+            mocked_http(per_band_api_data, sample_bm_data),
+            caplog.at_level(logging.INFO, logger="codeplug_csv"),
+        ):
+            main(["-o", str(tmp_path), "--no-contacts"])
+        assert "Concurrency RSGB" in caplog.text
+
+
+class TestEnrichment:
+    def test_detail_talkgroup_becomes_contact(
+        self, tmp_path, per_band_api_data, sample_bm_data
+    ):
+        detail_requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            path = request.url.path
+            if path.startswith("/band/"):
+                return httpx.Response(200, json={"data": per_band_api_data[path[6:]]})
+            if path.startswith("/repeater/"):
+                detail_requests.append(path)
+                if path == "/repeater/GB7AA":
+                    tg = {"id": 2359999, "slot": 1, "name": "Detail TG"}
+                    return httpx.Response(200, json={"data": {"talkgroups": [tg]}})
+                return httpx.Response(404)
+            return httpx.Response(200, json=sample_bm_data)
+
+        real = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch("codeplug_csv.extract.httpx.AsyncClient", return_value=real):
+            main(["-o", str(tmp_path), "--no-contacts", "--enrich", "-q"])
+
+        with open(tmp_path / "Channel.CSV", newline="") as f:
+            contacts = {row["Channel Name"]: row["Contact"] for row in csv.DictReader(f)}
+        with open(tmp_path / "TalkGroups.CSV", newline="") as f:
+            talkgroups = {row["Radio ID"]: row["Name"] for row in csv.DictReader(f)}
+
+        assert contacts["GB7AA TS1"] == "Detail TG"
+        assert contacts["GB7AA TS2"] == "Local"
+        assert talkgroups["2359999"] == "Detail TG"
+        assert "/repeater/GB7AA" in detail_requests
+        assert len(detail_requests) == len(set(detail_requests))
+
+
+class TestStreamPipeline:
+    @staticmethod
+    def _outputs(out: Path) -> list[bytes]:
+        names = ("Channel.CSV", "Zone.CSV", "TalkGroups.CSV")
+        return [(out / name).read_bytes() for name in names]
+
+    @pytest.mark.parametrize("extra", [[], ["--enrich"], ["--locator", "IO91"]])
+    def test_matches_list_pipeline(
+        self, tmp_path, per_band_api_data, sample_bm_data, extra
+    ):
+        def handler(request: httpx.Request) -> httpx.Response:
+            path = request.url.path
+            if path.startswith("/band/"):
+                return httpx.Response(200, json={"data": per_band_api_data[path[6:]]})
+            if path == "/repeater/GB7AA":
+                tg = {"id": 2359999, "slot": 1, "name": "Detail TG"}
+                return httpx.Response(200, json={"data": {"talkgroups": [tg]}})
+            if path.startswith("/repeater/"):
+                return httpx.Response(404)
+            return httpx.Response(200, json=sample_bm_data)
+
+        def run(out: Path, *flags: str) -> list[bytes]:
+            real = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            with patch("codeplug_csv.extract.httpx.AsyncClient", return_value=real):
+                main(["-o", str(out), "--no-contacts", "-q", *extra, *flags])
+            return self._outputs(out)
+
+        assert run(tmp_path / "stream", "--stream") == run(tmp_path / "lists")
+
+    def test_exits_zero_when_no_repeaters_match(
+        self, tmp_path, per_band_api_data, sample_bm_data
+    ):
+        with mocked_http(per_band_api_data, sample_bm_data):
+            with pytest.raises(SystemExit) as exc_info:
+                main(["-o", str(tmp_path), "--stream", "--locator", "ZZ99", "-q"])
+        assert exc_info.value.code == 0
+        assert not (tmp_path / "Channel.CSV").exists()
+
+
+class TestUnchangedOutputs:
+    def test_second_run_keeps_unchanged_files(
+        self, tmp_path, per_band_api_data, sample_bm_data
+    ):
+        def run() -> None:
+            with mocked_http(per_band_api_data, sample_bm_data):
+                main(["-o", str(tmp_path), "--no-contacts", "-q"])
+
+        run()
+        outputs = {p.name: p.read_bytes() for p in tmp_path.glob("*.CSV")}
+        mtimes = {p.name: p.stat().st_mtime_ns for p in tmp_path.glob("*.CSV")}
+
+        run()
+        assert {p.name: p.read_bytes() for p in tmp_path.glob("*.CSV")} == outputs
+        assert {p.name: p.stat().st_mtime_ns for p in tmp_path.glob("*.CSV")} == mtimes
+
+    def test_contact_outputs_are_kept(
+        self, tmp_path, per_band_api_data, sample_bm_data
+    ):
+        def run() -> dict[str, int]:
+            with mocked_http(per_band_api_data, sample_bm_data):
+                main(["-o", str(tmp_path), "--contacts-delta", "-q"])
+            return {
+                name: (tmp_path / name).stat().st_mtime_ns
+                for name in ("DigitalContactList.CSV", "contacts-delta.csv")
+            }
+
+        run()
+        # The second delta is header-only; the third matches it
+        mtimes = run()
+        time.sleep(0.01)
+        assert run() == mtimes
+        assert not list(tmp_path.glob("*.tmp"))
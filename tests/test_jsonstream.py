@@ -0,0 +1,74 @@
+"""Tests for incremental JSON array parsing."""
+
+from __future__ import annotations
+
+import json
+import tracemalloc
+
+import pytest
+
+from codeplug_csv.jsonstream import iter_array_items
+
+
+async def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+async def _collect(data: bytes, size: int = 7, key: str = "data") -> list:
+    return [item async for item in iter_array_items(_chunks(data, size), key)]
+
+
+class TestIterArrayItems:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("size", [1, 2, 3, 5, 64, 10_000])
+    async def test_matches_json_loads_at_any_chunking(self, sample_api_data, size):
+        body = json.dumps({"data": sample_api_data}).encode()
+        assert await _collect(body, size) == sample_api_data
+
+    @pytest.mark.asyncio
+    async def test_skips_other_keys_before_target(self):
+        body = json.dumps(
+            {"meta": {"data": [9]}, "count": 12345, "data": [{"a": 1}, {"b": [2]}]}
+        ).encode()
+        assert await _collect(body, 1) == [{"a": 1}, {"b": [2]}]
+
+    @pytest.mark.asyncio
+    async def test_multibyte_characters_split_across_chunks(self):
+        body = json.dumps({"data": [{"town": "Ynys Môn ✓"}]}, ensure_ascii=False)
+        assert await _collect(body.encode(), 1) == [{"town": "Ynys Môn ✓"}]
+
+    @pytest.mark.asyncio
+    async def test_numbers_split_across_chunks(self):
+        assert await _collect(b'{"data": [145687500, 430850000]}', 4) == [
+            145687500,
+            430850000,
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "body", [b"{}", b'{"data": []}', b'{"data": null}', b'{"other": [1]}']
+    )
+    async def test_empty_results(self, body):
+        assert await _collect(body) == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("body", [b"[1, 2]", b'{"data": [1 2]}', b'{"data": [{"a": 1}'])
+    async def test_malformed_raises(self, body):
+        with pytest.raises(ValueError):
+            await _collect(body)
+
+    @pytest.mark.asyncio
+    async def test_peak_memory_independent_of_payload_size(self):
+        item = {"repeater": "GB3XX", "modeCodes": ["A", "M:1"], "town": "X" * 200}
+        body = json.dumps({"data": [item] * 20_000}).encode()
+
+        tracemalloc.start()
+        count = 0
+        async for _ in iter_array_items(_chunks(body, 16_384), "data"):
+            count += 1
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert count == 20_000
+        assert peak < len(body) // 20
@@ -0,0 +1,138 @@
+"""Tests for the adaptive concurrency limiter."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from codeplug_csv.limiter import AdaptiveLimiter
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://api.test/")
+    response = httpx.Response(status, request=request)
+    return httpx.HTTPStatusError("boom", request=request, response=response)
+
+
+async def _request(limiter: AdaptiveLimiter, latency: float = 0.001, error=None):
+    async with limiter.slot():
+        await asyncio.sleep(latency)
+        if error is not None:
+            raise error
+
+
+class TestAdaptiveLimiter:
+    @pytest.mark.asyncio
+    async def test_grows_while_latency_is_flat(self):
+        limiter = AdaptiveLimiter(initial=2, max_limit=20, latency_tolerance=10)
+        for _ in range(40):
+            await _request(limiter)
+        assert limiter.limit > 2
+        assert limiter.stats()["peak"] > 2
+        assert limiter.stats()["decreases"] == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status", [429, 503])
+    async def test_halves_on_throttling(self, status):
+        limiter = AdaptiveLimiter(initial=8)
+        with pytest.raises(httpx.HTTPStatusError):
+            await _request(limiter, error=_status_error(status))
+        assert limiter.limit == 4
+        assert limiter.stats()["decreases"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_failures_cut_once(self):
+        limiter = AdaptiveLimiter(initial=8)
+        results = await asyncio.gather(
+            *(_request(limiter, error=_status_error(503)) for _ in range(8)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, httpx.HTTPStatusError) for r in results)
+        assert limiter.limit == 4
+        assert limiter.stats()["decreases"] == 1
+
+        # A request sent after the cut is a new congestion event
+        with pytest.raises(httpx.HTTPStatusError):
+            await _request(limiter, error=_status_error(503))
+        assert limiter.limit == 2
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_shrink(self):
+        limiter = AdaptiveLimiter(initial=8)
+        with pytest.raises(httpx.HTTPStatusError):
+            await _request(limiter, error=_status_error(404))
+        assert limiter.limit == 8
+
+    @pytest.mark.asyncio
+    async def test_shrinks_on_rising_latency(self):
+        limiter = AdaptiveLimiter(initial=8, latency_tolerance=3)
+        await _request(limiter, latency=0.001)
+        await _request(limiter, latency=0.05)
+        assert int(limiter.limit) < 8
+
+    @pytest.mark.asyncio
+    async def test_stays_within_bounds(self):
+        limiter = AdaptiveLimiter(initial=4, min_limit=2, max_limit=5)
+        for _ in range(5):
+            with pytest.raises(httpx.HTTPStatusError):
+                await _request(limiter, error=_status_error(429))
+        assert limiter.limit == 2
+        for _ in range(100):
+            await _request(limiter, latency=0)
+        assert limiter.limit == 5
+
+    @pytest.mark.asyncio
+    async def test_in_flight_never_exceeds_limit(self):
+        limiter = AdaptiveLimiter(initial=3, max_limit=3)
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            async with limiter.slot():
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.005)
+
+        await asyncio.gather(*(request() for _ in range(20)))
+        assert peak == 3
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_converges_below_server_capacity(self):
+        """A server that throttles above 6 concurrent requests pushes the limit down."""
+        limiter = AdaptiveLimiter(initial=2, max_limit=30, latency_tolerance=100)
+        capacity = 6
+        active = 0
+        throttled = 0
+
+        async def request():
+            nonlocal active, throttled
+            async with limiter.slot():
+                active += 1
+                try:
+                    await asyncio.sleep(0.002)
+                    if active > capacity:
+                        throttled += 1
+                        raise _status_error(429)
+                finally:
+                    active -= 1
+
+        await asyncio.gather(*(request() for _ in range(300)), return_exceptions=True)
+
+        stats = limiter.stats()
+        assert stats["peak"] > capacity
+        assert stats["decreases"] > 0
+        assert throttled < 100
+
+    def test_starts_at_initial_above_adaptive_max(self):
+        with patch("codeplug_csv.limiter.ADAPTIVE_MAX_CONCURRENT", 10):
+            limiter = AdaptiveLimiter.from_config(20)
+        assert limiter.limit == limiter.max_limit == 20
+        assert limiter.stats()["initial"] == 20
+
+    def test_fixed_when_adaptation_disabled(self):
+        with patch("codeplug_csv.limiter.ADAPTIVE_CONCURRENCY", False):
+            limiter = AdaptiveLimiter.from_config(5)
+        assert limiter.min_limit == limiter.max_limit == 5
@@ -3,13 +3,34 @@
 from __future__ import annotations
 
 import csv
+import gc
+import time
+import tracemalloc
+from collections.abc import Iterator
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from codeplug_csv.config import CHANNEL_COLUMNS, TALKGROUP_COLUMNS, ZONE_COLUMNS
-from codeplug_csv.load import write_channels, write_talkgroups, write_zones
-from codeplug_csv.models import AnytoneChannel, AnytoneZone, TalkGroup
+from codeplug_csv.config import (
+    CHANNEL_COLUMNS,
+    DIGITAL_CONTACT_COLUMNS,
+    TALKGROUP_COLUMNS,
+    ZONE_COLUMNS,
+)
+from codeplug_csv.load import (
+    _available_cpus,
+    _hz_to_mhz,
+    stream_codeplug,
+    write_channels,
+    write_digital_contacts,
+    write_talkgroups,
+    write_zones,
+)
+from codeplug_csv.models import AnytoneChannel, AnytoneZone, Repeater, TalkGroup
+from codeplug_csv.simplex import get_static_zones
+from codeplug_csv.transform import iter_channels, iter_filtered
+from codeplug_csv.zones import assign_zones
 
 
 @pytest.fixture
@@ -22,8 +43,8 @@ def sample_channels() -> list[AnytoneChannel]:
     return [
         AnytoneChannel(
             name="GB3CD FM",
-            rx_freq="145.68750",
-            tx_freq="145.08750",
+            rx_freq=145_687_500,
+            tx_freq=145_087_500,
             channel_type="A-Analog",
             bandwidth="12.5K",
             ctcss_encode="118.8",
@@ -34,8 +55,8 @@ def sample_channels() -> list[AnytoneChannel]:
         ),
         AnytoneChannel(
             name="GB7AA TS1",
-            rx_freq="439.45000",
-            tx_freq="430.85000",
+            rx_freq=439_450_000,
+            tx_freq=430_850_000,
             channel_type="D-Digital",
             bandwidth="12.5K",
             power="High",
@@ -49,6 +70,18 @@ def sample_channels() -> list[AnytoneChannel]:
     ]
 
 
+class TestHzToMhz:
+    def test_five_decimal_places(self):
+        assert _hz_to_mhz(145687500) == "145.68750"
+        assert _hz_to_mhz(439450000) == "439.45000"
+        assert _hz_to_mhz(446006250) == "446.00625"
+
+    def test_rounds_to_the_nearest_10hz(self):
+        assert _hz_to_mhz(145_000_004) == "145.00000"
+        assert _hz_to_mhz(145_000_005) == "145.00001"
+        assert _hz_to_mhz(1_296_012_500) == "1296.01250"
+
+
 class TestWriteChannels:
     @pytest.mark.asyncio
     async def test_creates_file(self, sample_channels, output_dir):
@@ -107,12 +140,24 @@ class TestWriteChannels:
                 for col in CHANNEL_COLUMNS:
                     assert col in row, f"Missing column: {col}"
 
+    @pytest.mark.asyncio
+    async def test_unchanged_file_is_not_rewritten(self, sample_channels, output_dir):
+        path = await write_channels(sample_channels, output_dir)
+        before = path.stat().st_mtime_ns
+        time.sleep(0.01)
+        await write_channels(sample_channels, output_dir)
+        assert path.stat().st_mtime_ns == before
+
+        await write_channels(sample_channels[:1], output_dir)
+        assert path.stat().st_mtime_ns != before
+        assert sorted(p.name for p in output_dir.iterdir()) == ["Channel.CSV"]
+
     @pytest.mark.asyncio
     async def test_tx_prohibit_on(self, output_dir):
         ch = AnytoneChannel(
             name="PMR 1",
-            rx_freq="446.00625",
-            tx_freq="446.00625",
+            rx_freq=446_006_250,
+            tx_freq=446_006_250,
             channel_type="A-Analog",
             tx_prohibit="On",
         )
@@ -126,8 +171,8 @@ class TestWriteChannels:
     async def test_color_code_written_to_both_columns(self, output_dir):
         ch = AnytoneChannel(
             name="GB7BS TS1",
-            rx_freq="439.45000",
-            tx_freq="430.85000",
+            rx_freq=439_450_000,
+            tx_freq=430_850_000,
             channel_type="D-Digital",
             color_code=3,
             slot=1,
@@ -142,6 +187,70 @@ class TestWriteChannels:
         assert row["TxCc"] == "3"
 
 
+def _repeaters(count: int) -> Iterator[Repeater]:
+    """Operational repeaters, made one at a time so none are held."""
+    locators = ["IO91WM", "IO93FO", "IO83QL", "IO70JL", "IO85AW", "JO01AA"]
+    mode_codes = [["A"], ["M:3"], ["A", "M:7"]]
+    for i in range(count):
+        yield Repeater(
+            f"GB{i % 10}{chr(65 + i % 26)}{chr(65 + i // 26 % 26)}",
+            439_000_000 + i % 400 * 12_500,
+            430_000_000 + i % 400 * 12_500,
+            "70CM",
+            mode_codes[i % len(mode_codes)],
+            status="OPERATIONAL",
+            type=["DV", "DG"][i % 2],
+            locator=locators[i % len(locators)],
+        )
+
+
+class TestStreamCodeplug:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("count", [0, 40, 1500])
+    async def test_matches_list_writers(self, tmp_path, count):
+        # 1500 repeaters put over 250 channels in some groups, splitting zones
+        zones = get_static_zones() + assign_zones(
+            iter_channels(iter_filtered(_repeaters(count)))
+        )
+        (tmp_path / "lists").mkdir()
+        await write_channels(
+            [ch for zone in zones for ch in zone.channels], tmp_path / "lists"
+        )
+        await write_zones(zones, tmp_path / "lists")
+
+        (tmp_path / "stream").mkdir()
+        counts = stream_codeplug(
+            iter_channels(iter_filtered(_repeaters(count))),
+            get_static_zones(),
+            tmp_path / "stream",
+        )
+
+        assert counts == (sum(len(z.channels) for z in zones), len(zones))
+        for name in ("Channel.CSV", "Zone.CSV"):
+            expected = (tmp_path / "lists" / name).read_bytes()
+            assert (tmp_path / "stream" / name).read_bytes() == expected
+
+    def test_peak_memory_does_not_grow_with_input(self, tmp_path):
+        def peak(count: int) -> int:
+            static_zones = get_static_zones()
+            gc.collect()
+            tracemalloc.start()
+            try:
+                stream_codeplug(
+                    iter_channels(iter_filtered(_repeaters(count))),
+                    static_zones,
+                    tmp_path,
+                )
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        small, large = peak(1000), peak(10_000)
+        # Building the same channels as lists more than doubles the peak
+        assert large < small * 1.5
+        assert large < 4 * 2**20
+
+
 class TestWriteZones:
     @pytest.mark.asyncio
     async def test_creates_file(self, sample_channels, output_dir):
@@ -204,3 +313,198 @@ class TestWriteTalkgroups:
         ids = [r["Radio ID"] for r in rows]
         assert "9" in ids
         assert "235" in ids
+
+
+RADIOID_HEADER = "RADIO_ID,CALLSIGN,FIRST_NAME,LAST_NAME,CITY,STATE,COUNTRY,REMARKS\n"
+
+
+def _synthetic_user_csv(path: Path, rows: int) -> Path:
+    countries = ["United Kingdom", "United States", "Germany", "Japan"]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(RADIOID_HEADER)
+        for i in range(rows):
+            f.write(
+                f"{1000000 + i},X{i:06d},First,Last,Town,State,{countries[i % 4]},\n"
+            )
+    return path
+
+
+def _read_contacts(path: Path) -> list[dict[str, str]]:
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+class TestWriteDigitalContacts:
+    @pytest.fixture
+    def user_csv(self, tmp_path: Path) -> Path:
+        path = tmp_path / "user.csv"
+        path.write_text(
+            RADIOID_HEADER
+            + "2345001,M0ABC,Alice,Smith,Leeds,West Yorkshire,United Kingdom,\n"
+            + '2345002,G4XYZ,"Bob, Jr",,"St Ives, Cornwall",,United Kingdom,\n'
+            + "3101234,K1AB,Carol,,Boston,MA,United States,\n"
+            + "2345001,M0ABC,Alice,Smith,Leeds,West Yorkshire,United Kingdom,\n",
+            encoding="utf-8",
+        )
+        return path
+
+    @pytest.mark.asyncio
+    async def test_maps_radioid_columns(self, user_csv, output_dir):
+        path = await write_digital_contacts(user_csv, output_dir)
+        assert path.name == "DigitalContactList.CSV"
+        with open(path, encoding="utf-8", newline="") as f:
+            assert next(csv.reader(f)) == DIGITAL_CONTACT_COLUMNS
+        rows = _read_contacts(path)
+        assert rows[0] == {
+            "No.": "1",
+            "Radio ID": "2345001",
+            "Callsign": "M0ABC",
+            "Name": "Alice Smith",
+            "City": "Leeds",
+            "State": "West Yorkshire",
+            "Country": "United Kingdom",
+            "Remarks": "",
+            "Call Type": "Private Call",
+            "Call Alert": "None",
+        }
+
+    @pytest.mark.asyncio
+    async def test_numbers_rows_and_keeps_quoted_fields(self, user_csv, output_dir):
+        rows = _read_contacts(await write_digital_contacts(user_csv, output_dir))
+        assert [r["No."] for r in rows] == ["1", "2", "3", "4"]
+        assert rows[1]["Name"] == "Bob, Jr"
+        assert rows[1]["City"] == "St Ives, Cornwall"
+        assert rows[2]["Name"] == "Carol"
+
+    @pytest.mark.asyncio
+    async def test_dedup_keeps_first_per_radio_id(self, user_csv, output_dir):
+        path = await write_digital_contacts(user_csv, output_dir, dedup=True)
+        rows = _read_contacts(path)
+        assert [r["Radio ID"] for r in rows] == ["2345001", "2345002", "3101234"]
+        assert [r["No."] for r in rows] == ["1", "2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_missing_optional_columns_are_blank(self, tmp_path, output_dir):
+        src = tmp_path / "user.csv"
+        src.write_text("RADIO_ID,CALLSIGN\n2345001,M0ABC\n", encoding="utf-8")
+        rows = _read_contacts(await write_digital_contacts(src, output_dir))
+        assert rows[0]["Callsign"] == "M0ABC"
+        assert rows[0]["Name"] == rows[0]["Country"] == ""
+
+    @pytest.mark.asyncio
+    async def test_rejects_file_without_radio_id(self, tmp_path, output_dir):
+        src = tmp_path / "user.csv"
+        src.write_text("CALLSIGN\nM0ABC\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="RADIO_ID"):
+            await write_digital_contacts(src, output_dir)
+
+    @pytest.mark.asyncio
+    async def test_small_chunks_match_single_chunk(self, tmp_path, output_dir):
+        src = _synthetic_user_csv(tmp_path / "user.csv", 500)
+        whole = (await write_digital_contacts(src, output_dir)).read_bytes()
+        chunked = await write_digital_contacts(src, tmp_path, chunk_bytes=100)
+        assert chunked.read_bytes() == whole
+        assert len(_read_contacts(chunked)) == 500
+
+    @pytest.mark.asyncio
+    async def test_quoted_line_breaks_across_chunk_boundaries(self, tmp_path):
+        src = tmp_path / "user.csv"
+        src.write_text(
+            RADIOID_HEADER
+            + "2340001,M0AAA,Ann,Smith,Leeds,Yorks,United Kingdom,\n"
+            + '2340002,M0BBB,Bob,Jones,"York\nMinster ""Gate""\r\nEnd",Yorks,UK,\n'
+            + '2340003,M0CCC,Cat,"Lee\n",Hull,"",UK,"a\nb"\n'
+            + "2340004,M0DDD,Dan,Ray,Ely,Cambs,United Kingdom,\n",
+            encoding="utf-8",
+        )
+        whole = (await write_digital_contacts(src, tmp_path)).read_bytes()
+        assert len(_read_contacts(tmp_path / "DigitalContactList.CSV")) == 4
+        # Every chunk size puts a boundary inside a quoted field somewhere
+        for chunk_bytes in range(1, src.stat().st_size):
+            out = tmp_path / str(chunk_bytes)
+            out.mkdir()
+            path = await write_digital_contacts(src, out, chunk_bytes=chunk_bytes)
+            assert path.read_bytes() == whole, chunk_bytes
+
+    @pytest.mark.asyncio
+    async def test_parallel_matches_sequential(self, tmp_path, output_dir):
+        src = _synthetic_user_csv(tmp_path / "user.csv", 2000)
+        sequential = (await write_digital_contacts(src, output_dir)).read_bytes()
+        with patch("codeplug_csv.load._available_cpus", return_value=2):
+            parallel = await write_digital_contacts(
+                src, tmp_path, workers=2, chunk_bytes=4096
+            )
+        assert parallel.read_bytes() == sequential
+
+    @pytest.mark.asyncio
+    async def test_workers_capped_at_cpus(self, tmp_path, output_dir):
+        src = _synthetic_user_csv(tmp_path / "user.csv", 200)
+        with patch("codeplug_csv.load._available_cpus", return_value=1), patch(
+            "codeplug_csv.load.ProcessPoolExecutor"
+        ) as pool:
+            await write_digital_contacts(src, output_dir, workers=4, chunk_bytes=512)
+        pool.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_source_is_not_reconverted(self, user_csv, output_dir):
+        path = await write_digital_contacts(user_csv, output_dir)
+        before = path.stat().st_mtime_ns
+        time.sleep(0.01)
+        with patch(
+            "codeplug_csv.load._convert_contacts_chunk", side_effect=AssertionError
+        ):
+            await write_digital_contacts(user_csv, output_dir)
+        assert path.stat().st_mtime_ns == before
+        assert not list(output_dir.glob("*.tmp"))
+
+        # A rewritten source with the same rows is converted but not rewritten
+        user_csv.write_bytes(user_csv.read_bytes())
+        await write_digital_contacts(user_csv, output_dir)
+        assert path.stat().st_mtime_ns == before
+
+        await write_digital_contacts(user_csv, output_dir, dedup=True)
+        assert path.stat().st_mtime_ns != before
+        assert len(_read_contacts(path)) == 3
+
+    @pytest.mark.asyncio
+    async def test_unicode_line_breaks_inside_fields(self, tmp_path, output_dir):
+        src = tmp_path / "user.csv"
+        src.write_text(
+            RADIOID_HEADER
+            + "2340001,M0AAA,Ann\u2028Marie,Smith,Leeds\x85West,Yorks,"
+            "United Kingdom,\n"
+            + "2340002,M0BBB,Bob,Jones,York\x1cCity,Yorks,United Kingdom,\n",
+            encoding="utf-8",
+        )
+        rows = _read_contacts(await write_digital_contacts(src, output_dir))
+        assert [(r["No."], r["Radio ID"]) for r in rows] == [
+            ("1", "2340001"),
+            ("2", "2340002"),
+        ]
+        assert rows[0]["Name"] == "Ann\u2028Marie Smith"
+        assert rows[0]["City"] == "Leeds\x85West"
+        assert rows[1]["City"] == "York\x1cCity"
+
+
+@pytest.mark.benchmark
+class TestDigitalContactsBenchmark:
+    ROWS = 1_000_000
+
+    @pytest.mark.asyncio
+    async def test_parallel_vs_sequential(self, tmp_path):
+        src = _synthetic_user_csv(tmp_path / "user.csv", self.ROWS)
+        timings = {}
+        outputs = {}
+        # Workers are capped at the available CPUs, so on one CPU both runs
+        # convert in-process
+        for name, workers in (("sequential", 0), ("parallel", 4)):
+            out = tmp_path / name
+            out.mkdir()
+            start = time.perf_counter()
+            outputs[name] = await write_digital_contacts(src, out, workers=workers)
+            timings[name] = time.perf_counter() - start
+        assert outputs["parallel"].read_bytes() == outputs["sequential"].read_bytes()
+        print(
+            f"\n{self.ROWS} rows: sequential {timings['sequential']:.2f}s, "
+            f"parallel {timings['parallel']:.2f}s ({_available_cpus()} CPUs)"
+        )
@@ -0,0 +1,256 @@
+"""Tests for the slotted, frozen data models."""
+
+from __future__ import annotations
+
+import dataclasses
+import gc
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from codeplug_csv import transform
+from codeplug_csv.extract import RSGBClient
+from codeplug_csv.models import (
+    CAP_ANALOG,
+    CAP_DMR,
+    CAP_OTHER,
+    AnytoneChannel,
+    AnytoneZone,
+    Repeater,
+    TalkGroup,
+)
+from codeplug_csv.transform import filter_repeaters, transform_repeaters
+
+from tests.conftest import synthetic_payload
+
+# Builds the benchmark channels in a fresh interpreter and prints its peak RSS
+# (KiB on Linux) before and after.  One slice of repeaters is parsed and repeated
+# so the payload never outweighs the channels; argv[1] picks the model layout.
+_RSS_SCRIPT = """
+import json, resource, sys
+from unittest.mock import patch
+from codeplug_csv.extract import RSGBClient
+from codeplug_csv.models import AnytoneChannel
+from codeplug_csv.transform import filter_repeaters, transform_repeaters
+from tests.conftest import synthetic_payload
+from tests.test_models import _legacy
+
+step = 10_000
+payload = json.loads(json.dumps(synthetic_payload(step)))
+repeaters = filter_repeaters(RSGBClient._parse(item) for item in payload)
+repeaters *= int(sys.argv[2]) // step
+del payload
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+with patch(
+    "codeplug_csv.transform.AnytoneChannel",
+    _legacy(AnytoneChannel) if sys.argv[1] == "dict" else AnytoneChannel,
+):
+    channels = transform_repeaters(repeaters)
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(len(channels), before, after)
+"""
+
+
+class TestModels:
+    def test_models_have_no_instance_dict(self):
+        channel = AnytoneChannel(name="X", rx_freq=1, tx_freq=1, channel_type="A")
+        for obj in (
+            channel,
+            Repeater("GB3AA", 0, 0, "2M"),
+            AnytoneZone(name="Z"),
+            TalkGroup(name="Local", radio_id=9),
+        ):
+            assert not hasattr(obj, "__dict__")
+
+    def test_source_records_are_frozen(self):
+        repeater = Repeater("GB3AA", 0, 0, "2M")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            repeater.status = "OFF AIR"
+        talkgroup = TalkGroup(name="Local", radio_id=9)
+        assert dataclasses.replace(talkgroup, name="UK").name == "UK"
+
+    def test_enum_like_strings_are_shared(self, sample_api_data):
+        # json.loads gives each record its own copy of every string
+        payload = json.loads(json.dumps(sample_api_data))
+        repeaters = [RSGBClient._parse(item) for item in payload]
+        assert len({id(r.status) for r in repeaters if r.status == "OPERATIONAL"}) == 1
+
+        channels = transform_repeaters(filter_repeaters(repeaters))
+        for name in ("band", "bandwidth", "region", "ctcss_decode"):
+            values = [getattr(ch, name) for ch in channels]
+            assert len({id(v) for v in values}) == len(set(values))
+
+
+class TestModeCaps:
+    @pytest.mark.parametrize(
+        "mode_codes, caps, color_code",
+        [
+            (["A"], CAP_ANALOG, 1),
+            (["M"], CAP_DMR, 1),
+            (["A", "M:7"], CAP_ANALOG | CAP_DMR, 7),
+            (["M:x"], CAP_DMR, 1),
+            (["D", "F"], CAP_OTHER, 1),
+            (["A", "F"], CAP_ANALOG | CAP_OTHER, 1),
+            ([], 0, 1),
+        ],
+    )
+    def test_decoded_at_parse_time(self, mode_codes, caps, color_code):
+        repeater = RSGBClient._parse({"repeater": "GB3AA", "modeCodes": mode_codes})
+        assert (repeater.caps, repeater.color_code) == (caps, color_code)
+
+    def test_derived_fields_are_not_constructor_arguments(self):
+        repeater = Repeater("GB7AA", 0, 0, "70CM", mode_codes=["M:3"])
+        row = repeater.to_row()
+        assert "caps" not in row and "color_code" not in row
+        assert Repeater(**row) == repeater
+        assert Repeater(**row).color_code == 3
+
+
+def _legacy(cls: type) -> type:
+    """A plain, unslotted copy of dataclass *cls*, as the models used to be."""
+    return dataclasses.make_dataclass(
+        f"Legacy{cls.__name__}",
+        [
+            (f.name, f.type, dataclasses.field(default=f.default))
+            if f.default is not dataclasses.MISSING
+            else (f.name, f.type)
+            for f in dataclasses.fields(cls)
+        ],
+    )
+
+
+def _footprint(build) -> tuple[object, int, int]:
+    """Result of *build*, with the bytes and memory blocks it still holds."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = snapshot.statistics("filename")
+    return result, sum(s.size for s in stats), sum(s.count for s in stats)
+
+
+@pytest.mark.benchmark
+class TestModelMemoryBenchmark:
+    REPEATERS = 600_000
+
+    def test_slotted_vs_dict_channels(self):
+        # json.loads gives each record its own strings, as a real response does
+        payload = json.loads(json.dumps(synthetic_payload(self.REPEATERS)))
+        repeaters = filter_repeaters(RSGBClient._parse(item) for item in payload)
+        results = {}
+        with patch(
+            "codeplug_csv.transform.AnytoneChannel", _legacy(AnytoneChannel)
+        ):
+            start = time.perf_counter()
+            legacy, size, objects = _footprint(lambda: transform_repeaters(repeaters))
+            results["dict"] = (time.perf_counter() - start, size, objects)
+        start = time.perf_counter()
+        slotted, size, objects = _footprint(lambda: transform_repeaters(repeaters))
+        results["slotted"] = (time.perf_counter() - start, size, objects)
+
+        assert [dataclasses.astuple(ch) for ch in slotted[:100]] == [
+            dataclasses.astuple(ch) for ch in legacy[:100]
+        ]
+        print()
+        for name, (secs, size, objects) in results.items():
+            print(
+                f"{len(slotted)} channels ({name}): {size / 2**20:.1f} MiB traced, "
+                f"{objects} allocations, {secs:.2f}s"
+            )
+        assert results["slotted"][1] < results["dict"][1]
+
+    def test_peak_rss(self):
+        # tracemalloc only sees the Python allocator; ru_maxrss is what the OS
+        # charged, so each layout gets a process of its own
+        pytest.importorskip("resource")
+        peaks = {}
+        for name in ("dict", "slotted"):
+            out = subprocess.run(
+                [sys.executable, "-c", _RSS_SCRIPT, name, str(self.REPEATERS)],
+                cwd=Path(__file__).parents[1],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            channels, before, after = map(int, out.split())
+            peaks[name] = after - before
+            print(
+                f"\n{channels} channels ({name}): peak RSS {after / 1024:.1f} MiB, "
+                f"+{peaks[name] / 1024:.1f} MiB for the channels"
+            )
+        assert peaks["slotted"] < peaks["dict"]
+
+
+def _legacy_filter_and_transform(repeaters: list[Repeater]) -> int:
+    """The per-stage mode code scans caps replaced, reduced to their cost."""
+    kept = []
+    for r in repeaters:
+        if r.status != "OPERATIONAL" or r.type in transform.EXCLUDED_TYPES:
+            continue
+        has_analog = "A" in r.mode_codes
+        has_dmr = any(mc == "M" or mc.startswith("M:") for mc in r.mode_codes)
+        if has_analog or has_dmr:
+            kept.append(r)
+    channels = 0
+    for r in kept:
+        if "A" in r.mode_codes:
+            channels += 1
+        if any(mc == "M" or mc.startswith("M:") for mc in r.mode_codes):
+            for mc in r.mode_codes:
+                if mc.startswith("M:"):
+                    int(mc.split(":")[1])
+                    break
+            channels += 2
+    return channels
+
+
+def _caps_filter_and_transform(repeaters: list[Repeater]) -> int:
+    kept = [
+        r
+        for r in repeaters
+        if r.status == "OPERATIONAL"
+        and r.type not in transform.EXCLUDED_TYPES
+        and r.caps & (CAP_ANALOG | CAP_DMR)
+    ]
+    channels = 0
+    for r in kept:
+        if r.caps & CAP_ANALOG:
+            channels += 1
+        if r.caps & CAP_DMR:
+            r.color_code
+            channels += 2
+    return channels
+
+
+@pytest.mark.benchmark
+class TestModeCapsBenchmark:
+    N = 200_000
+
+    def test_caps_vs_mode_code_scans(self):
+        repeaters = RSGBClient._parse_batch(synthetic_payload(self.N))
+        timings = {}
+        for name, loop in (
+            ("scan", _legacy_filter_and_transform),
+            ("caps", _caps_filter_and_transform),
+        ):
+            start = time.perf_counter()
+            count = loop(repeaters)
+            timings[name] = time.perf_counter() - start
+        assert count == len(transform_repeaters(filter_repeaters(repeaters)))
+
+        start = time.perf_counter()
+        transform_repeaters(filter_repeaters(repeaters))
+        pipeline = time.perf_counter() - start
+        print(
+            f"\n{self.N} repeaters: mode checks {timings['scan'] * 1e3:.0f}ms "
+            f"scanning, {timings['caps'] * 1e3:.0f}ms with caps; "
+            f"full filter+transform {pipeline:.2f}s"
+        )
+        assert timings["caps"] < timings["scan"]
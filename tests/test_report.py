@@ -0,0 +1,60 @@
+"""Tests for the run timing report."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import pytest
+
+from codeplug_csv.report import RunReport
+
+
+class TestRunReport:
+    def test_stage_records_duration(self):
+        report = RunReport()
+        with report.stage("transform"):
+            pass
+        assert report.stages["transform"] >= 0
+
+    def test_stage_recorded_on_error(self):
+        report = RunReport()
+        with pytest.raises(ValueError):
+            with report.stage("write"):
+                raise ValueError
+        assert "write" in report.stages
+
+    @pytest.mark.asyncio
+    async def test_timed_returns_result(self):
+        report = RunReport()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            return 42
+
+        assert await report.timed("fetch", work()) == 42
+        assert report.stages["fetch"] >= 0.01
+
+    def test_mark_and_log(self, caplog):
+        report = RunReport()
+        with report.stage("fetch"):
+            pass
+        report.mark("codeplug written")
+        with caplog.at_level(logging.INFO):
+            report.log()
+        assert "fetch" in caplog.text
+        assert "codeplug written" in caplog.text
+
+    def test_logs_concurrency_limits(self, caplog):
+        report = RunReport()
+        report.limits["RSGB"] = {
+            "initial": 5,
+            "final": 7,
+            "peak": 9,
+            "low": 4,
+            "decreases": 1,
+        }
+        with caplog.at_level(logging.INFO):
+            report.log()
+        assert "RSGB" in caplog.text
+        assert "range 4-9" in caplog.text
@@ -0,0 +1,219 @@
+"""Tests for retry, deadline and hedging behaviour."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from codeplug_csv.extract import BrandMeisterClient, RSGBClient
+from codeplug_csv.retry import (
+    LatencyTracker,
+    RetryPolicy,
+    call_with_retry,
+    is_retryable,
+)
+
+FAST = RetryPolicy(attempts=3, backoff=0, max_backoff=0, deadline=0, hedge_percentile=0)
+
+
+def _faulty_transport(failures: list, payload: dict) -> httpx.MockTransport:
+    """Respond with each queued failure in turn, then with *payload*.
+
+    A failure is either an HTTP status code or an exception class to raise.
+    """
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if failures:
+            failure = failures.pop(0)
+            if isinstance(failure, int):
+                return httpx.Response(failure, request=request)
+            raise failure("injected", request=request)
+        return httpx.Response(200, json=payload, request=request)
+
+    transport = httpx.MockTransport(handler)
+    transport.calls = calls
+    return transport
+
+
+class TestRetryPolicy:
+    def test_delay_is_capped_full_jitter(self):
+        policy = RetryPolicy(backoff=1.0, max_backoff=3.0)
+        for attempt in range(1, 6):
+            for _ in range(50):
+                assert 0 <= policy.delay(attempt) <= min(3.0, 2 ** (attempt - 1))
+
+    @pytest.mark.parametrize("status", [429, 500, 502, 503, 504])
+    def test_server_errors_are_retryable(self, status):
+        request = httpx.Request("GET", "https://api.test/")
+        response = httpx.Response(status, request=request)
+        exc = httpx.HTTPStatusError("boom", request=request, response=response)
+        assert is_retryable(exc)
+
+    @pytest.mark.parametrize("status", [400, 403, 404])
+    def test_client_errors_are_not_retryable(self, status):
+        request = httpx.Request("GET", "https://api.test/")
+        response = httpx.Response(status, request=request)
+        exc = httpx.HTTPStatusError("boom", request=request, response=response)
+        assert not is_retryable(exc)
+
+    def test_transport_errors_and_timeouts_are_retryable(self):
+        assert is_retryable(httpx.ConnectError("down"))
+        assert is_retryable(httpx.ReadTimeout("slow"))
+        assert is_retryable(asyncio.TimeoutError())
+        assert not is_retryable(ValueError("bad json"))
+
+
+class TestCallWithRetry:
+    @pytest.mark.asyncio
+    async def test_retries_until_success(self):
+        outcomes = [httpx.ConnectError("down"), httpx.ReadError("reset"), "ok"]
+
+        async def call():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        assert await call_with_retry(call, FAST) == "ok"
+        assert outcomes == []
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_attempts(self):
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            raise httpx.ConnectError("down")
+
+        with pytest.raises(httpx.ConnectError):
+            await call_with_retry(call, FAST)
+        assert calls == 3
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_is_raised_immediately(self):
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            raise ValueError("bad payload")
+
+        with pytest.raises(ValueError):
+            await call_with_retry(call, FAST)
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_sleeps_jittered_backoff_between_attempts(self):
+        policy = RetryPolicy(attempts=3, backoff=1.0, max_backoff=10.0)
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            if calls < 3:
+                raise httpx.ConnectError("down")
+            return "ok"
+
+        with (
+            patch("codeplug_csv.retry.random.uniform", side_effect=lambda a, b: b),
+            patch("codeplug_csv.retry.asyncio.sleep") as sleep,
+        ):
+            assert await call_with_retry(call, policy) == "ok"
+        assert [c.args[0] for c in sleep.call_args_list] == [1.0, 2.0]
+
+    @pytest.mark.asyncio
+    async def test_deadline_cancels_slow_attempt_and_retries(self):
+        policy = RetryPolicy(attempts=2, backoff=0, deadline=0.05)
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(10)
+            return "ok"
+
+        start = time.perf_counter()
+        assert await call_with_retry(call, policy) == "ok"
+        assert calls == 2
+        assert time.perf_counter() - start < 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_cuts_tail_latency(self):
+        """Every 10th request stalls; a hedged duplicate finishes it quickly."""
+        policy = RetryPolicy(attempts=1, deadline=0, hedge_percentile=90)
+        tracker = LatencyTracker()
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(1.0 if calls % 10 == 0 else 0.01)
+            return calls
+
+        latencies = []
+        for _ in range(30):
+            start = time.perf_counter()
+            await call_with_retry(call, policy, tracker)
+            latencies.append(time.perf_counter() - start)
+
+        assert max(latencies) < 0.5
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_enough_samples(self):
+        policy = RetryPolicy(attempts=1, hedge_percentile=50, hedge_min_samples=5)
+        tracker = LatencyTracker()
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+
+        await call_with_retry(call, policy, tracker)
+        assert calls == 1
+        assert len(tracker) == 1
+
+
+class TestClientRetries:
+    @pytest.mark.asyncio
+    async def test_rsgb_retries_transient_failures(self, sample_api_data):
+        transport = _faulty_transport(
+            [503, httpx.ConnectError], {"data": sample_api_data}
+        )
+        session = httpx.AsyncClient(transport=transport)
+        async with session, RSGBClient(
+            base_url="https://api.test", session=session, retry=FAST
+        ) as client:
+            repeaters = await client.fetch_band("2m")
+        assert len(transport.calls) == 3
+        assert repeaters
+
+    @pytest.mark.asyncio
+    async def test_rsgb_does_not_retry_not_found(self, sample_api_data):
+        transport = _faulty_transport([404], {"data": sample_api_data})
+        session = httpx.AsyncClient(transport=transport)
+        async with session, RSGBClient(
+            base_url="https://api.test", session=session, retry=FAST
+        ) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.fetch_band("2m")
+        assert len(transport.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_brandmeister_retries_rate_limit(self, sample_bm_data):
+        transport = _faulty_transport([429], sample_bm_data)
+        session = httpx.AsyncClient(transport=transport)
+        async with session, BrandMeisterClient(
+            base_url="https://bm.test", session=session, retry=FAST
+        ) as client:
+            talkgroups = await client.fetch_talkgroups()
+        assert len(transport.calls) == 2
+        assert talkgroups
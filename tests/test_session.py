@@ -0,0 +1,48 @@
+"""Tests for the shared HTTP session."""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from codeplug_csv.extract import BrandMeisterClient, RadioIDClient, RSGBClient
+from codeplug_csv.session import create_session, pool_limits
+
+
+class TestPoolLimits:
+    def test_limits_scale_with_max_concurrent(self):
+        limits = pool_limits(4)
+        assert limits.max_connections == 12
+        assert limits.max_keepalive_connections == 12
+
+    def test_limits_never_zero(self):
+        assert pool_limits(0).max_connections >= 1
+
+
+class TestInjectedSession:
+    @pytest.mark.asyncio
+    async def test_clients_share_and_do_not_close_session(self, sample_api_data):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if "/band/" in request.url.path:
+                return httpx.Response(200, json={"data": sample_api_data})
+            return httpx.Response(200, json={"9": "Local"})
+
+        async with create_session(transport=httpx.MockTransport(handler)) as session:
+            async with RSGBClient(base_url="https://rsgb.test", session=session) as rsgb:
+                repeaters = await rsgb.fetch_band("2m")
+            async with BrandMeisterClient(
+                base_url="https://bm.test", session=session
+            ) as bm:
+                talkgroups = await bm.fetch_talkgroups()
+            async with RadioIDClient(session=session) as radioid:
+                assert radioid._client is session
+            assert not session.is_closed
+
+        assert len(repeaters) == len(sample_api_data)
+        assert any(tg.radio_id == 9 for tg in talkgroups)
+
+    @pytest.mark.asyncio
+    async def test_owned_client_closed_on_exit(self):
+        async with RSGBClient() as client:
+            owned = client._client
+        assert owned.is_closed
@@ -28,16 +28,16 @@ class TestHotspot:
         zone = hotspot_zone()
         # First two channels are simplex (RX == TX)
         assert zone.channels[0].rx_freq == zone.channels[0].tx_freq
-        assert zone.channels[0].rx_freq == "434.00000"
+        assert zone.channels[0].rx_freq == 434_000_000
         assert zone.channels[1].rx_freq == zone.channels[1].tx_freq
-        assert zone.channels[1].rx_freq == "438.80000"
+        assert zone.channels[1].rx_freq == 438_800_000
 
     def test_repeater_channels(self):
         zone = hotspot_zone()
         # HS RPT TS1 and HS RPT TS2
         for ch in zone.channels[2:]:
-            assert ch.rx_freq == "434.00000"
-            assert ch.tx_freq == "438.80000"
+            assert ch.rx_freq == 434_000_000
+            assert ch.tx_freq == 438_800_000
 
     def test_ts1_slot(self):
         zone = hotspot_zone()
@@ -88,11 +88,15 @@ class TestVhfFmSimplex:
 
     def test_first_channel_freq(self):
         zone = vhf_fm_simplex_zone()
-        assert zone.channels[0].rx_freq == "145.20000"
+        assert zone.channels[0].rx_freq == 145_200_000
 
     def test_last_channel_freq(self):
         zone = vhf_fm_simplex_zone()
-        assert zone.channels[-1].rx_freq == "145.57500"
+        assert zone.channels[-1].rx_freq == 145_575_000
+
+    def test_exact_12k5_raster(self):
+        freqs = [ch.rx_freq for ch in vhf_fm_simplex_zone().channels]
+        assert {b - a for a, b in zip(freqs, freqs[1:])} == {12_500}
 
     def test_calling_channel_name(self):
         zone = vhf_fm_simplex_zone()
@@ -126,11 +130,11 @@ class TestUhfFmSimplex:
 
     def test_first_channel_freq(self):
         zone = uhf_fm_simplex_zone()
-        assert zone.channels[0].rx_freq == "433.40000"
+        assert zone.channels[0].rx_freq == 433_400_000
 
     def test_last_channel_freq(self):
         zone = uhf_fm_simplex_zone()
-        assert zone.channels[-1].rx_freq == "433.60000"
+        assert zone.channels[-1].rx_freq == 433_600_000
 
     def test_calling_channel_name(self):
         zone = uhf_fm_simplex_zone()
@@ -168,7 +172,7 @@ class TestVhfDvSimplex:
 
     def test_frequency(self):
         zone = vhf_dv_simplex_zone()
-        assert zone.channels[0].rx_freq == "144.61250"
+        assert zone.channels[0].rx_freq == 144_612_500
 
     def test_simplex(self):
         zone = vhf_dv_simplex_zone()
@@ -203,11 +207,11 @@ class TestUhfDvSimplex:
 
     def test_first_channel_freq(self):
         zone = uhf_dv_simplex_zone()
-        assert zone.channels[0].rx_freq == "438.58750"
+        assert zone.channels[0].rx_freq == 438_587_500
 
     def test_last_channel_freq(self):
         zone = uhf_dv_simplex_zone()
-        assert zone.channels[-1].rx_freq == "438.67500"
+        assert zone.channels[-1].rx_freq == 438_675_000
 
     def test_calling_channel_name(self):
         zone = uhf_dv_simplex_zone()
@@ -252,11 +256,11 @@ class TestPmr446:
 
     def test_first_channel_freq(self):
         zone = pmr446_zone()
-        assert zone.channels[0].rx_freq == "446.00625"
+        assert zone.channels[0].rx_freq == 446_006_250
 
     def test_last_channel_freq(self):
         zone = pmr446_zone()
-        assert zone.channels[-1].rx_freq == "446.19375"
+        assert zone.channels[-1].rx_freq == 446_193_750
 
     def test_simplex(self):
         zone = pmr446_zone()
@@ -296,11 +300,11 @@ class TestIss:
     def test_doppler_downlink_frequencies(self):
         zone = iss_zone()
         expected_rx = [
-            "145.80500",
-            "145.80250",
-            "145.80000",
-            "145.79750",
-            "145.79500",
+            145_805_000,
+            145_802_500,
+            145_800_000,
+            145_797_500,
+            145_795_000,
         ]
         for i, expected in enumerate(expected_rx):
             assert zone.channels[i].rx_freq == expected
@@ -308,7 +312,7 @@ class TestIss:
     def test_doppler_uplink(self):
         zone = iss_zone()
         for i in range(5):
-            assert zone.channels[i].tx_freq == "145.20000"
+            assert zone.channels[i].tx_freq == 145_200_000
 
     def test_rpt_up_ctcss(self):
         zone = iss_zone()
@@ -320,14 +324,14 @@ class TestIss:
         zone = iss_zone()
         rpt_up = zone.channels[5]
         assert rpt_up.rx_freq == rpt_up.tx_freq
-        assert rpt_up.rx_freq == "145.99000"
+        assert rpt_up.rx_freq == 145_990_000
 
     def test_rpt_dn_simplex(self):
         zone = iss_zone()
         rpt_dn = zone.channels[6]
         assert rpt_dn.name == "ISS RPT DN"
         assert rpt_dn.rx_freq == rpt_dn.tx_freq
-        assert rpt_dn.rx_freq == "437.80000"
+        assert rpt_dn.rx_freq == 437_800_000
 
     def test_bandwidth(self):
         zone = iss_zone()
@@ -356,11 +360,11 @@ class TestMarineVhf:
 
     def test_first_channel_freq(self):
         zone = marine_vhf_zone()
-        assert zone.channels[0].rx_freq == "156.30000"
+        assert zone.channels[0].rx_freq == 156_300_000
 
     def test_last_channel_freq(self):
         zone = marine_vhf_zone()
-        assert zone.channels[-1].rx_freq == "157.42500"
+        assert zone.channels[-1].rx_freq == 157_425_000
 
     def test_calling_channel_name(self):
         zone = marine_vhf_zone()
@@ -0,0 +1,37 @@
+"""Tests for the columnar repeater table."""
+
+from __future__ import annotations
+
+from codeplug_csv.extract import RSGBClient
+from codeplug_csv.models import CAP_OTHER
+from codeplug_csv.table import MODE_ANALOG, MODE_DMR, RepeaterTable, StringPool
+
+
+class TestRepeaterTable:
+    def test_columns(self, sample_repeaters):
+        table = RepeaterTable.from_repeaters(sample_repeaters)
+        assert len(table) == len(sample_repeaters)
+        for i, r in enumerate(sample_repeaters):
+            assert table.tx[i] == r.tx
+            assert table.statuses[table.status[i]] == r.status
+            assert bool(table.modes[i] & MODE_ANALOG) == ("A" in r.mode_codes)
+        # Each distinct value is stored once
+        assert len(table.statuses) == len({r.status for r in sample_repeaters})
+
+    def test_mode_flags_and_color_code(self):
+        repeaters = RSGBClient._parse_batch(
+            [{"modeCodes": ["A", "M:7"]}, {"modeCodes": ["M"]}, {"modeCodes": ["D"]}]
+        )
+        table = RepeaterTable.from_repeaters(repeaters)
+        assert list(table.modes) == [MODE_ANALOG | MODE_DMR, MODE_DMR, CAP_OTHER]
+        assert list(table.color_code) == [7, 1, 1]
+
+
+class TestStringPool:
+    def test_codes_in_first_seen_order(self):
+        pool = StringPool()
+        assert list(pool.add_all(["b", "a", "b"])) == [0, 1, 0]
+        assert list(pool.add_all(["c", "a"])) == [2, 1]
+        assert pool.values == ["b", "a", "c"]
+        assert pool.code("c") == 2
+        assert pool.code("OPERATIONAL") == -1
@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
-from codeplug_csv.models import Repeater
+from codeplug_csv.contacts import ContactIndex
+from codeplug_csv.models import (
+    Repeater,
+    RepeaterDetail,
+    SlotTalkGroup,
+    TalkGroup,
+    _extract_color_code,
+)
 from codeplug_csv.transform import (
     _bandwidth_str,
     _clean_callsign,
     _ctcss_str,
-    _extract_color_code,
-    _hz_to_mhz,
     filter_repeaters,
+    iter_channels,
+    iter_filtered,
+    iter_linked,
+    link_contacts,
     transform_repeaters,
 )
 
@@ -62,10 +71,6 @@ class TestFilterRepeaters:
 
 
 class TestHelpers:
-    def test_hz_to_mhz(self):
-        assert _hz_to_mhz(145687500) == "145.68750"
-        assert _hz_to_mhz(439450000) == "439.45000"
-
     def test_clean_callsign(self):
         assert _clean_callsign("GB3CD-L") == "GB3CD"
         assert _clean_callsign("GB7AA") == "GB7AA"
@@ -109,8 +114,8 @@ class TestTransformRepeaters:
         channels = transform_repeaters(filtered)
         # GB3CD-L: api tx=145687500, api rx=145087500
         gb3cd = next(ch for ch in channels if "GB3CD" in ch.name)
-        assert gb3cd.rx_freq == "145.68750"
-        assert gb3cd.tx_freq == "145.08750"
+        assert gb3cd.rx_freq == 145_687_500
+        assert gb3cd.tx_freq == 145_087_500
 
     def test_multimode_produces_three_channels(self, sample_repeaters):
         """Repeater with both A and M should produce FM + TS1 + TS2 channels."""
@@ -199,3 +204,106 @@ class TestTransformRepeaters:
         channels = transform_repeaters(filtered)
         gw_ch = next(ch for ch in channels if "GB3GW" in ch.name)
         assert gw_ch.rpt_type == "GW"
+
+
+class TestStreaming:
+    def test_generators_are_lazy(self, sample_repeaters):
+        pulled = []
+
+        def source():
+            for r in sample_repeaters:
+                pulled.append(r)
+                yield r
+
+        first = next(iter_channels(iter_filtered(source())))
+        assert first == transform_repeaters(filter_repeaters(sample_repeaters))[0]
+        assert len(pulled) < len(sample_repeaters)
+
+    def test_iter_linked_collects_new_talkgroups(self, sample_repeaters):
+        details = {
+            "GB7AA": RepeaterDetail(
+                talkgroups=[SlotTalkGroup(radio_id=2355, slot=1, name="Scotland")]
+            )
+        }
+        channels = transform_repeaters(filter_repeaters(sample_repeaters), details=details)
+        extra: list[TalkGroup] = []
+        linked = iter_linked(iter(channels), [], extra)
+        assert extra == []
+        assert list(linked) == link_contacts(channels, [])[0]
+        assert extra == [TalkGroup(name="Scotland", radio_id=2355)]
+
+
+class TestDetailContacts:
+    @staticmethod
+    def _details():
+        return {
+            "GB7AA": RepeaterDetail(
+                callsign="GB7AA",
+                talkgroups=[
+                    SlotTalkGroup(radio_id=235, slot=1, name="UK Wide"),
+                    SlotTalkGroup(radio_id=2350, slot=2, name="UK Chat A"),
+                    SlotTalkGroup(radio_id=2351, slot=2, name="UK Chat B"),
+                ],
+            )
+        }
+
+    def test_single_slot_talkgroup_becomes_contact(self, sample_repeaters):
+        filtered = filter_repeaters(sample_repeaters)
+        channels = transform_repeaters(filtered, details=self._details())
+        ts1 = next(ch for ch in channels if ch.name == "GB7AA TS1")
+        assert (ts1.contact, ts1.contact_id) == ("UK Wide", 235)
+
+    def test_ambiguous_slot_stays_local(self, sample_repeaters):
+        filtered = filter_repeaters(sample_repeaters)
+        channels = transform_repeaters(filtered, details=self._details())
+        ts2 = next(ch for ch in channels if ch.name == "GB7AA TS2")
+        assert (ts2.contact, ts2.contact_id) == ("Local", 0)
+
+    def test_without_details_contacts_are_local(self, sample_repeaters):
+        channels = transform_repeaters(filter_repeaters(sample_repeaters))
+        dmr = [ch for ch in channels if ch.mode == "DMR"]
+        assert {ch.contact for ch in dmr} == {"Local"}
+
+    def test_link_contacts_adds_missing_talkgroups(self, sample_repeaters):
+        filtered = filter_repeaters(sample_repeaters)
+        known = [
+            TalkGroup(name="UK Wide BM", radio_id=235),
+            TalkGroup(name="Other", radio_id=9),
+        ]
+        details = {
+            "GB7AV": RepeaterDetail(
+                talkgroups=[SlotTalkGroup(radio_id=2355, slot=1, name="Scotland")]
+            )
+        }
+        channels = transform_repeaters(filtered, details={**self._details(), **details})
+
+        linked, talkgroups = link_contacts(channels, known)
+
+        ts1 = next(ch for ch in linked if ch.name == "GB7AA TS1")
+        assert ts1.contact == "UK Wide BM"
+        assert talkgroups[:2] == known
+        assert talkgroups[2:] == [TalkGroup(name="Scotland", radio_id=2355)]
+        assert len(linked) == len(channels)
+
+    def test_link_contacts_names_private_calls(self, sample_repeaters, tmp_path):
+        user_csv = tmp_path / "user.csv"
+        user_csv.write_text(
+            "RADIO_ID,CALLSIGN,FIRST_NAME\n2345678,M0ABC,Alice\n", encoding="utf-8"
+        )
+        details = {
+            "GB7AV": RepeaterDetail(
+                talkgroups=[SlotTalkGroup(radio_id=2345678, slot=1)]
+            )
+        }
+        channels = transform_repeaters(
+            filter_repeaters(sample_repeaters), details=details
+        )
+
+        with ContactIndex(user_csv) as contacts:
+            linked, talkgroups = link_contacts(channels, [], contacts)
+
+        ts1 = next(ch for ch in linked if ch.name == "GB7AV TS1")
+        assert (ts1.contact, ts1.contact_call_type) == ("M0ABC", "Private Call")
+        assert talkgroups == [
+            TalkGroup(name="M0ABC", radio_id=2345678, call_type="Private Call")
+        ]
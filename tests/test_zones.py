@@ -15,8 +15,8 @@ def _make_channel(
 ) -> AnytoneChannel:
     return AnytoneChannel(
         name=name,
-        rx_freq="145.00000",
-        tx_freq="145.60000",
+        rx_freq=145_000_000,
+        tx_freq=145_600_000,
         channel_type="A-Analog" if mode == "ANL" else "D-Digital",
         band=band,
         mode=mode,